@@ -1,16 +1,39 @@
 import os
 import json
+import random
+import base64
+import binascii
+import contextvars
+import difflib
+import gzip
+import hashlib
 import logging
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from contextlib import contextmanager
+from functools import wraps
+from types import MappingProxyType
+from urllib.parse import urlsplit
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 
+import click
 import requests
-from flask import Flask, send_from_directory, request, jsonify, abort
+from requests.adapters import HTTPAdapter
+from flask import Flask, Response, send_from_directory, request, jsonify, abort
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 from flask_cors import CORS
 import mysql.connector
 from mysql.connector import Error
 import psycopg2
+import psycopg2.pool
 
 # Make a change
 # Load environment variables
@@ -31,7 +54,7 @@ except:
 # Global variable for the SPARQL endpoint
 SEMOPENALEX_SPARQL_ENDPOINT = "https://semopenalex.org/sparql"
 app= Flask(__name__, static_folder='build', static_url_path='/')
-CORS(app)
+CORS(app, expose_headers=['X-Degraded-Upstreams'])
 
 def setup_logger():
     """Configure logging with rotating file handler for all levels"""
@@ -101,44 +124,1085 @@ logger = setup_logger()
 app.logger.handlers = logger.handlers
 app.logger.setLevel(logger.level)
 
+class PostgresConnectionPool:
+    """
+    Per-process pool of Postgres connections shared by execute_query and every search/MUP helper.
+
+    Connections are opened lazily (so gunicorn's master never holds one), pinged with SELECT 1
+    when they have been idle longer than health_check_interval, and replaced once they are older
+    than max_lifetime. When the pool notices it is running in a forked child it forgets the
+    parent's connections without closing them, since closing would terminate the parent's session.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=10.0,
+                 max_lifetime=1800.0, health_check_interval=30.0):
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self._condition = threading.Condition()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._pid = os.getpid()
+        self._idle = deque()      # (connection, created_at, last_used_at)
+        self._created_at = {}     # id(connection) -> created_at for checked out connections
+        self._size = 0
+        self._warmed_up = False
+        self._stats = {
+            "checked_out": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "timeouts": 0,
+            "connections_created": 0,
+            "connections_discarded": 0,
+            "health_check_failures": 0,
+        }
+
+    def _check_fork(self):
+        """Drops the parent's connections when running in a freshly forked worker. Caller holds the lock."""
+        if self._pid != os.getpid():
+            # Keep references alive so the inherited sockets are never closed from the child
+            _inherited_connections.extend(entry[0] for entry in self._idle)
+            self._reset_state()
+
+    def _open(self):
+        connection = self._connect()
+        with self._condition:
+            self._stats["connections_created"] += 1
+        return connection, time.monotonic()
+
+    def _close(self, connection):
+        with self._condition:
+            self._stats["connections_discarded"] += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection, created_at, last_used_at):
+        now = time.monotonic()
+        if connection.closed:
+            return False
+        if self.max_lifetime and now - created_at > self.max_lifetime:
+            return False
+        if self.health_check_interval is not None and now - last_used_at > self.health_check_interval:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                connection.rollback()
+            except Exception as e:
+                app.logger.warning(f"Discarding pooled connection that failed its health check: {str(e)}")
+                with self._condition:
+                    self._stats["health_check_failures"] += 1
+                return False
+        return True
+
+    def _warm_up(self):
+        """Opens min_size connections the first time a process uses the pool."""
+        with self._condition:
+            if self._warmed_up:
+                return
+            self._warmed_up = True
+            missing = max(0, self.min_size - self._size)
+            self._size += missing
+        for _ in range(missing):
+            try:
+                connection, created_at = self._open()
+            except Exception as e:
+                app.logger.warning(f"Could not pre-open pooled connection: {str(e)}")
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                continue
+            with self._condition:
+                self._idle.append((connection, created_at, created_at))
+                self._condition.notify()
+
+    def getconn(self):
+        """Checks a connection out of the pool, waiting up to timeout seconds when all are in use."""
+        with self._condition:
+            self._check_fork()
+        self._warm_up()
+        started = time.monotonic()
+        waited = False
+        with self._condition:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    entry = None
+                    break
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise psycopg2.pool.PoolError(
+                        f"Timed out after {self.timeout}s waiting for a database connection")
+                waited = True
+                self._condition.wait(remaining)
+            self._stats["checked_out"] += 1
+            self._stats["checkouts"] += 1
+            if waited:
+                wait_time = time.monotonic() - started
+                self._stats["waits"] += 1
+                self._stats["wait_time_seconds"] += wait_time
+                self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], wait_time)
+
+        try:
+            if entry is not None:
+                connection, created_at, last_used_at = entry
+                if not self._is_healthy(connection, created_at, last_used_at):
+                    self._close(connection)
+                    entry = None
+            if entry is None:
+                connection, created_at = self._open()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._stats["checked_out"] -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._created_at[id(connection)] = created_at
+        return connection
+
+    def putconn(self, connection, discard=False):
+        """Returns a connection to the pool, closing it instead when discard is set or it is broken."""
+        with self._condition:
+            if self._pid != os.getpid():
+                return
+            created_at = self._created_at.pop(id(connection), time.monotonic())
+            self._stats["checked_out"] -= 1
+            if discard or connection.closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, created_at, time.monotonic()))
+            self._condition.notify()
+        if discard and not connection.closed:
+            self._close(connection)
+
+    @contextmanager
+    def connection(self):
+        """Context manager that commits on success, rolls back on error and always returns the connection."""
+        connection = self.getconn()
+        discard = False
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.putconn(connection, discard=discard)
+
+    def closeall(self):
+        """Closes every idle connection owned by this process."""
+        with self._condition:
+            self._check_fork()
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for connection, _, _ in idle:
+            self._close(connection)
+
+    def get_stats(self):
+        with self._condition:
+            self._check_fork()
+            stats = dict(self._stats)
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["min_size"] = self.min_size
+            stats["max_size"] = self.max_size
+            stats["pid"] = self._pid
+        stats["wait_time_seconds"] = round(stats["wait_time_seconds"], 6)
+        stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 6)
+        return stats
+
+
+# Connections inherited from a parent process; kept referenced so they are never closed in the child
+_inherited_connections = []
+
+def connect_to_database():
+    return psycopg2.connect(
+        user=os.getenv('DB_USER'),
+        password=os.getenv('DB_PASSWORD'),
+        host=os.getenv('DB_HOST'),
+        database=os.getenv('DB_NAME'),
+        sslmode='disable'
+    )
+
+db_pool = PostgresConnectionPool(
+    connect_to_database,
+    min_size=int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+    max_size=int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+    timeout=float(os.getenv('DB_POOL_TIMEOUT', 10)),
+    max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+    health_check_interval=float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', 30)),
+)
+
 def execute_query(query, params):
     """
     Utility function to execute a query and fetch results from the database.
-    Handles connection and cursor management.
+    Connections are borrowed from the per-process db_pool and returned when the query completes.
     """
     try:
-        with psycopg2.connect(
-            user=os.getenv('DB_USER'),
-            password=os.getenv('DB_PASSWORD'),
-            host=os.getenv('DB_HOST'),            
-            database=os.getenv('DB_NAME'),
-            sslmode='disable'       
-        ) as connection:
+        with db_pool.connection() as connection:
             app.logger.debug(f"Executing query: {query} with params: {params}")
             with connection.cursor() as cursor:
-                cursor.execute(query, params)                
+                cursor.execute(query, params)
                 results = cursor.fetchall()
                 app.logger.info(f"Query executed successfully, returned {len(results)} results")
-                return results        
+                return results
     except Exception as e:
         app.logger.error(f"Database error: {str(e)}")
         return None
 
+class MemoryCacheBackend:
+    """
+    In-process LRU cache backend. Values are stored as-is (not copied), so cached objects are
+    shared between requests and must not be modified by callers.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._stats = {"evictions": 0, "expirations": 0}
+
+    def get(self, key):
+        """Returns (True, value) for a live entry and (False, None) otherwise."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self, prefix=""):
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self._stats, backend="memory", size=len(self._entries), max_entries=self.max_entries)
+
+
+class SQLiteCacheBackend:
+    """
+    Cache backend stored in a local SQLite file, shared by every worker on the same host and kept
+    across restarts. Values are stored as JSON.
+    """
+
+    def __init__(self, path, prune_interval=1000):
+        self.path = path
+        self.prune_interval = prune_interval
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._writes = 0
+
+    def _get_connection(self):
+        """Opens the database on first use in each process. Caller holds the lock."""
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key):
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return False, None
+        return True, json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        encoded = json.dumps(value)
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, encoded, time.time() + ttl))
+            self._writes += 1
+            if self._writes % self.prune_interval == 0:
+                connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+            connection.commit()
+
+    def clear(self, prefix=""):
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute("DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            connection.commit()
+
+    def get_stats(self):
+        with self._lock:
+            size = self._get_connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        return {"backend": "sqlite", "size": size, "path": self.path}
+
+
+class RedisCacheBackend:
+    """
+    Cache backend for any server that speaks the Redis protocol, shared by every worker and replica.
+    Uses the optional redis package unless a client with get/set/scan_iter/delete is passed in.
+    Values are stored as JSON and expired by the server.
+    """
+
+    def __init__(self, url=None, client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._client = client
+
+    def get(self, key):
+        raw = self._client.get(key)
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def set(self, key, value, ttl):
+        self._client.set(key, json.dumps(value), ex=max(1, int(ttl)))
+
+    def clear(self, prefix=""):
+        for key in self._client.scan_iter(match=f"{prefix}*"):
+            self._client.delete(key)
+
+    def get_stats(self):
+        return {"backend": "redis"}
+
+
+class ResponseCache:
+    """
+    Namespaced cache for database search payloads and OpenAlex/SemOpenAlex responses.
+
+    Keys are built from a prefix, the namespace and the JSON-encoded key parts, and each namespace
+    has its own TTL. Namespaces listed in versioned_namespaces also include the search data version
+    (polled from version_source every version_check_interval seconds), so entries cached before
+    refresh_search_materialized_views() ran are never served again, even from a shared backend.
+    Backend failures are logged and treated as misses. A ResponseCache without a backend is a no-op.
+    """
+
+    def __init__(self, backend, ttls=None, default_ttl=3600.0, key_prefix="collabnext",
+                 versioned_namespaces=(), version_source=None, version_check_interval=60.0):
+        self.backend = backend
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.key_prefix = key_prefix
+        self.versioned_namespaces = set(versioned_namespaces)
+        self.version_check_interval = version_check_interval
+        self._version_source = version_source
+        self._version = None
+        self._version_checked_at = None
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _count(self, namespace, counter):
+        with self._lock:
+            counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "errors": 0})
+            counters[counter] += 1
+
+    def _data_version(self):
+        if self._version_source is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_interval:
+                return self._version
+            self._version_checked_at = now
+        version = self._version_source()
+        with self._lock:
+            if version is not None:
+                if self._version is not None and version != self._version:
+                    app.logger.info(f"Search data version changed from {self._version} to {version}")
+                self._version = version
+            return self._version
+
+    @property
+    def data_version(self):
+        """The search data version last seen by this cache, without querying for it."""
+        return self._version
+
+    def make_key(self, namespace, key):
+        if namespace in self.versioned_namespaces:
+            key = [self._data_version(), key]
+        return f"{self.key_prefix}:{namespace}:{json.dumps(key, default=str)}"
+
+    def get_or_compute(self, namespace, key, compute):
+        """Returns the cached value for key, calling compute() on a miss. None results are not cached."""
+        if self.backend is None:
+            return compute()
+        cache_key = self.make_key(namespace, key)
+        try:
+            found, value = self.backend.get(cache_key)
+        except Exception as e:
+            app.logger.warning(f"Cache read failed for {namespace}: {str(e)}")
+            self._count(namespace, "errors")
+            found = False
+        if found:
+            self._count(namespace, "hits")
+            return value
+        self._count(namespace, "misses")
+        value = compute()
+        if value is not None:
+            try:
+                self.backend.set(cache_key, value, self.ttls.get(namespace, self.default_ttl))
+            except Exception as e:
+                app.logger.warning(f"Cache write failed for {namespace}: {str(e)}")
+                self._count(namespace, "errors")
+        return value
+
+    def invalidate(self, namespace=None):
+        """Drops every entry in namespace, or every entry under this cache's prefix."""
+        if self.backend is None:
+            return
+        prefix = f"{self.key_prefix}:{namespace}:" if namespace else f"{self.key_prefix}:"
+        self.backend.clear(prefix)
+
+    def get_stats(self):
+        with self._lock:
+            stats = {"namespaces": {namespace: dict(counters) for namespace, counters in self._stats.items()},
+                     "data_version": self._version}
+        if self.backend is not None:
+            try:
+                stats.update(self.backend.get_stats())
+            except Exception as e:
+                app.logger.warning(f"Could not read cache backend stats: {str(e)}")
+        else:
+            stats["backend"] = None
+        return stats
+
+
+def fetch_search_data_version():
+    """Returns the version bumped by refresh_search_materialized_views(), or None if it cannot be read."""
+    results = execute_query("SELECT get_search_data_version();", ())
+    if results:
+        return results[0][0]
+    return None
+
+def create_cache_backend(name):
+    """
+    Builds the cache backend selected by CACHE_BACKEND: memory, sqlite, redis or none.
+    Falls back to the in-process cache when the sqlite or redis backend cannot be set up.
+    """
+    try:
+        if name == 'none':
+            return None
+        if name == 'sqlite':
+            return SQLiteCacheBackend(os.getenv('CACHE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'collabnext_cache.sqlite3')))
+        if name == 'redis':
+            return RedisCacheBackend(url=os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+    except Exception as e:
+        app.logger.warning(f"Could not set up the {name} cache backend, using the in-process cache: {str(e)}")
+    return MemoryCacheBackend(max_entries=int(os.getenv('CACHE_MAX_ENTRIES', 1024)))
+
+response_cache = ResponseCache(
+    create_cache_backend(os.getenv('CACHE_BACKEND', 'memory')),
+    ttls={
+        'search': float(os.getenv('CACHE_TTL_SEARCH', 3600)),
+        'openalex': float(os.getenv('CACHE_TTL_OPENALEX', 86400)),
+        'geo': float(os.getenv('CACHE_TTL_GEO', 604800)),
+        'sparql': float(os.getenv('CACHE_TTL_SPARQL', 86400)),
+    },
+    key_prefix=os.getenv('CACHE_KEY_PREFIX', 'collabnext'),
+    versioned_namespaces=('search',),
+    version_source=lambda: fetch_search_data_version(),
+    version_check_interval=float(os.getenv('CACHE_VERSION_CHECK_INTERVAL', 60)),
+)
+
+class SubfieldTopicIndex:
+    """
+    Read-only subfield -> topics mapping shared by every request in a process.
+
+    The mapping only changes when new OpenAlex data is loaded, so it is fetched on first use and
+    again only when version_source reports a different search data version. A failed load is
+    retried on the next lookup. Each subfield maps to a tuple of read-only
+    {'topic_id', 'topic_display_name'} entries.
+    """
+
+    def __init__(self, loader, version_source=None):
+        self._loader = loader
+        self._version_source = version_source
+        self._lock = threading.Lock()
+        self._topics = None
+        self._loaded_version = None
+
+    def _current(self):
+        version = self._version_source() if self._version_source else None
+        with self._lock:
+            if self._topics is not None and version == self._loaded_version:
+                return self._topics
+            topics = self._loader()
+            if topics is None:
+                return self._topics or MappingProxyType({})
+            self._topics = MappingProxyType({
+                subfield: tuple(MappingProxyType(dict(topic)) for topic in entries)
+                for subfield, entries in topics.items()
+            })
+            self._loaded_version = version
+            app.logger.info(f"Loaded topics for {len(self._topics)} subfields")
+            return self._topics
+
+    def get(self, subfield):
+        """Returns the topics in subfield, or an empty tuple for an unknown subfield."""
+        return self._current().get(subfield, ())
+
+    def __len__(self):
+        return len(self._current())
+
+
+def fetch_subfield_topics():
+    """Returns the subfield -> topics mapping from get_subfield_topics(), or None if it cannot be read."""
+    results = execute_query("SELECT get_subfield_topics();", ())
+    if results and results[0][0] is not None:
+        return results[0][0]
+    app.logger.warning("Could not load the subfield topic index")
+    return None
+
+subfield_topic_index = SubfieldTopicIndex(
+    lambda: fetch_subfield_topics(),
+    version_source=lambda: response_cache.data_version,
+)
+
+def normalize_search_input(value):
+    """Collapses runs of whitespace and trims search box input; other values are returned unchanged."""
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+def cached_search(func):
+    """
+    Caches a search_by_* helper in the 'search' namespace, keyed on its name and normalized arguments.
+    Paged calls are cached per page, so revisiting a page does not query Postgres again.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        args = [normalize_search_input(arg) for arg in args]
+        key = [func.__name__] + args + sorted(kwargs.items())
+        return response_cache.get_or_compute('search', key, lambda: func(*args, **kwargs))
+    return wrapper
+
+def search_query(function_name, params, page_limit=None, page_offset=0):
+    """
+    Builds the call to a search SQL function. When page_limit is given the paged overload is used,
+    which returns only that page of 'data' plus the number of rows across all pages in 'total_count'.
+    """
+    if page_limit is not None:
+        params = tuple(params) + (page_limit, page_offset)
+    placeholders = ", ".join(["%s"] * len(params))
+    return f"SELECT {function_name}({placeholders});", tuple(params)
+
+def page_rows(data, page, per_page):
+    """
+    Returns the rows to render for a page and the total number of rows. Payloads from the paged
+    search functions already hold just that page; full payloads are sliced here.
+    """
+    if 'total_count' in data:
+        return data['data'], data['total_count']
+    start = (page - 1) * per_page
+    end = start + per_page
+    return data['data'][start:end], len(data['data'])
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor from the client cannot be decoded."""
+
+
+def encode_cursor(kind, sort_key, search=()):
+    """
+    Encodes the sort key of the last row on a page as an opaque cursor for the next page, bound to
+    the search terms it was made for.
+    """
+    payload = json.dumps({"kind": kind, "search": list(search), "after": list(sort_key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def cursor_column_type(column):
+    """Count columns (num_of_*) are integers in the sort key; the id columns are strings."""
+    return int if column.startswith('num_of_') else str
+
+def decode_cursor(cursor, kind, sort_columns, search=()):
+    """
+    Returns the sort key stored in a cursor made by encode_cursor for the same kind of search and the
+    same search terms, checking that each value has the type of its sort column.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        after = payload["after"]
+        if payload["kind"] != kind or not isinstance(after, list) or len(after) != len(sort_columns):
+            raise ValueError(f"cursor is not for a {kind} search")
+        if payload.get("search") != list(search):
+            raise ValueError("cursor is for a different search")
+        for column, value in zip(sort_columns, after):
+            if isinstance(value, bool) or not isinstance(value, cursor_column_type(column)):
+                raise ValueError(f"cursor value for {column} has the wrong type")
+    except (TypeError, ValueError, KeyError, AttributeError, binascii.Error) as e:
+        raise InvalidCursorError(f"Invalid cursor: {str(e)}")
+    return after
+
+def next_page_cursor(kind, rows, sort_columns, page, per_page, total, search=()):
+    """Returns the cursor for the page after rows, or None when this is the last page."""
+    if not rows or len(rows) < per_page or page * per_page >= total:
+        return None
+    return encode_cursor(kind, [rows[-1][column] for column in sort_columns], search)
+
+class UpstreamUnavailableError(requests.exceptions.RequestException):
+    """Raised instead of calling an upstream host that cannot answer in time; carries the host."""
+
+    def __init__(self, message, host=None):
+        super().__init__(message)
+        self.host = host
+
+class UpstreamBusyError(UpstreamUnavailableError):
+    """Raised when no request slot for an upstream host frees up within the queue timeout."""
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised without calling an upstream host whose circuit breaker is open."""
+
+class DeadlineExceededError(UpstreamUnavailableError):
+    """Raised when the request deadline leaves no time for another upstream call."""
+
+class RequestBudget:
+    """
+    Deadline shared by every upstream call made for one API request, including calls made on the
+    fan-out pools, and the upstream hosts that could not answer within it.
+    """
+
+    __slots__ = ('deadline', 'degraded')
+
+    def __init__(self, seconds):
+        self.deadline = time.monotonic() + seconds
+        self.degraded = set()
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+request_budget = contextvars.ContextVar('request_budget', default=None)
+REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', 25))
+
+@app.before_request
+def start_request_budget():
+    request_budget.set(RequestBudget(REQUEST_DEADLINE))
+
+@app.after_request
+def report_degraded_upstreams(response):
+    degraded = degraded_upstreams()
+    if degraded:
+        response.headers['X-Degraded-Upstreams'] = ', '.join(degraded)
+    return response
+
+@app.teardown_request
+def end_request_budget(exc):
+    request_budget.set(None)
+
+def remaining_request_time(default=None):
+    """Seconds left before the current request's deadline, or default outside a request."""
+    budget = request_budget.get()
+    return default if budget is None else max(0.0, budget.remaining())
+
+def degraded_upstreams():
+    budget = request_budget.get()
+    return sorted(budget.degraded) if budget is not None else []
+
+def submit_with_budget(executor, func, *args):
+    """Submits func to a worker pool so that its upstream calls keep the caller's request deadline."""
+    return executor.submit(contextvars.copy_context().run, func, *args)
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. After failure_threshold consecutive failures the circuit opens and
+    calls are refused without touching the network; after reset_timeout seconds it goes half-open
+    and lets half_open_max_calls trial calls through. A successful trial closes it again, a failed
+    one opens it for another reset_timeout, and one that says nothing about the host's health
+    (a 429, or an error raised before the request was sent) is released for another call to try.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, half_open_max_calls=1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_calls = 0
+            if self.state == self.HALF_OPEN:
+                if self._trial_calls >= self.half_open_max_calls:
+                    return False
+                self._trial_calls += 1
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def release(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_calls = max(self._trial_calls - 1, 0)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self._failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._times_opened += 1
+
+    def get_stats(self):
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self._failures, "times_opened": self._times_opened}
+
+class HttpClient:
+    """
+    Outbound HTTP client shared by every OpenAlex and SemOpenAlex call in a process.
+
+    One keep-alive session holds a connection pool per host. Every request gets a (connect, read)
+    timeout unless the caller passes its own, and at most max_per_host requests to one host run at
+    once; a request that cannot get a slot within queue_timeout raises UpstreamBusyError instead of
+    pinning the worker. Connection errors, timeouts, 429s and 5xx responses are retried up to
+    max_retries times with full-jitter exponential backoff (or the server's Retry-After, capped at
+    max_backoff). POSTs are only retried when the caller says they are safe to repeat.
+
+    Each host has a CircuitBreaker that connection errors, timeouts and 5xx responses count towards
+    (a 429 means the host is up but busy, so it is only backed off from); while it is open, requests
+    raise CircuitOpenError at once. Inside an API request, timeouts and backoff are also cut to the
+    time left before the request deadline, and a call with no time left raises DeadlineExceededError.
+    Hosts that could not answer are recorded on the request budget so the response can say it is
+    partial. Latency, errors, retries, rejected and short-circuited requests are counted per host
+    for /metrics.
+    """
+
+    RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+    def __init__(self, connect_timeout=3.05, read_timeout=20.0, max_retries=2, backoff=0.5,
+                 max_backoff=8.0, max_per_host=10, queue_timeout=5.0,
+                 failure_threshold=5, reset_timeout=30.0, half_open_max_calls=1):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_per_host = max_per_host
+        self.queue_timeout = queue_timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._session = requests.Session()
+        self._session.headers.update({'Accept': 'application/json'})
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max_per_host)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._breakers = {}
+        self._stats = {}
+
+    def _host_state(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout, self.half_open_max_calls)
+                self._stats[host] = {"requests": 0, "errors": 0, "retries": 0, "rejected": 0, "short_circuited": 0,
+                                     "in_flight": 0, "latency_seconds": 0.0, "max_latency_seconds": 0.0}
+            return self._slots[host], self._breakers[host], self._stats[host]
+
+    def _record(self, stats, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                stats[key] += value
+
+    def _delay(self, attempt, response):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def _unavailable(self, error, stats, **counts):
+        self._record(stats, **counts)
+        self._mark_degraded(error.host)
+        return error
+
+    def _mark_degraded(self, host):
+        budget = request_budget.get()
+        if budget is not None:
+            budget.degraded.add(host)
+
+    def request(self, method, url, retry=None, **kwargs):
+        """Sends one request through the shared session; retry defaults to True for GET and False otherwise."""
+        retry = (method.upper() == 'GET') if retry is None else retry
+        timeout = kwargs.pop('timeout', self.timeout)
+        host = urlsplit(url).netloc
+        slots, breaker, stats = self._host_state(host)
+        attempts = 1 + (self.max_retries if retry else 0)
+        for attempt in range(attempts):
+            remaining = remaining_request_time()
+            if remaining is not None and remaining <= 0:
+                raise self._unavailable(DeadlineExceededError(f"No time left for a request to {host}", host), stats)
+            if not slots.acquire(timeout=self.queue_timeout if remaining is None else min(self.queue_timeout, remaining)):
+                raise self._unavailable(UpstreamBusyError(f"Too many requests in flight to {host}", host), stats, rejected=1)
+            if not breaker.allow():
+                slots.release()
+                raise self._unavailable(CircuitOpenError(f"Circuit open for {host}", host), stats, short_circuited=1)
+            self._record(stats, requests=1, in_flight=1)
+            started = time.perf_counter()
+            response = None
+            try:
+                response = self._session.request(method, url, timeout=self._cap_timeout(timeout), **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record(stats, errors=1)
+                breaker.record_failure()
+                if attempt == attempts - 1:
+                    self._mark_degraded(host)
+                    raise
+            except Exception:
+                breaker.release()
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                slots.release()
+                with self._lock:
+                    stats["in_flight"] -= 1
+                    stats["latency_seconds"] += elapsed
+                    stats["max_latency_seconds"] = max(stats["max_latency_seconds"], elapsed)
+            if response is not None:
+                if response.status_code not in self.RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                self._record(stats, errors=1)
+                if response.status_code == 429:
+                    breaker.release()
+                else:
+                    breaker.record_failure()
+                if attempt == attempts - 1:
+                    self._mark_degraded(host)
+                    return response
+            delay = self._delay(attempt, response)
+            remaining = remaining_request_time()
+            if remaining is not None and delay >= remaining:
+                if response is not None:
+                    self._mark_degraded(host)
+                    return response
+                raise self._unavailable(DeadlineExceededError(f"No time left to retry {host}", host), stats)
+            self._record(stats, retries=1)
+            app.logger.warning(f"Retrying {method} {host} in {delay:.2f}s "
+                               f"({response.status_code if response is not None else 'connection error'})")
+            time.sleep(delay)
+
+    def _cap_timeout(self, timeout):
+        remaining = remaining_request_time()
+        if remaining is None or timeout is None:
+            return timeout
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_stats(self):
+        with self._lock:
+            stats = {
+                host: dict(stats,
+                           latency_seconds=round(stats["latency_seconds"], 4),
+                           max_latency_seconds=round(stats["max_latency_seconds"], 4),
+                           avg_latency_seconds=round(stats["latency_seconds"] / stats["requests"], 4) if stats["requests"] else 0.0)
+                for host, stats in self._stats.items()
+            }
+            breakers = dict(self._breakers)
+        for host, breaker in breakers.items():
+            stats[host]["circuit"] = breaker.get_stats()
+        return stats
+
+http_client = HttpClient(
+    connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05)),
+    read_timeout=float(os.getenv('HTTP_READ_TIMEOUT', 20)),
+    max_retries=int(os.getenv('HTTP_MAX_RETRIES', 2)),
+    backoff=float(os.getenv('HTTP_RETRY_BACKOFF', 0.5)),
+    max_per_host=int(os.getenv('HTTP_MAX_PER_HOST', 10)),
+    queue_timeout=float(os.getenv('HTTP_QUEUE_TIMEOUT', 5)),
+    failure_threshold=int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5)),
+    reset_timeout=float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30)),
+    half_open_max_calls=int(os.getenv('CIRCUIT_HALF_OPEN_CALLS', 1)),
+)
+
+AUTHOR_INSTITUTION_TTL = int(os.getenv('AUTHOR_INSTITUTION_TTL', 30 * 86400))
+AUTHOR_INSTITUTION_NEGATIVE_TTL = int(os.getenv('AUTHOR_INSTITUTION_NEGATIVE_TTL', 7 * 86400))
+AUTHOR_INSTITUTION_TIMEOUT = float(os.getenv('AUTHOR_INSTITUTION_TIMEOUT', 5))
+
+def fetch_stored_last_known_institutions(author_ids):
+    """
+    Looks up authors in the author_last_known_institutions table with a single query. Returns
+    {author_id: last_known_institutions} for the lookups that are still fresh, in the shape OpenAlex
+    returns them; an empty list is a stored "OpenAlex has no institution for this author".
+    """
+    if not author_ids:
+        return {}
+    results = execute_query("""
+        SELECT author_id, institution_id, institution_name
+        FROM author_last_known_institutions
+        WHERE author_id = ANY(%s)
+          AND fetched_at > now() - make_interval(secs => CASE WHEN institution_name IS NULL THEN %s ELSE %s END);
+    """, (list(author_ids), AUTHOR_INSTITUTION_NEGATIVE_TTL, AUTHOR_INSTITUTION_TTL))
+    stored = {}
+    for author_id, institution_id, institution_name in results or []:
+        stored[author_id] = [] if institution_name is None else [{"id": institution_id, "display_name": institution_name}]
+    return stored
+
+def store_last_known_institutions(institutions_by_author):
+    """
+    Writes {author_id: last_known_institutions} looked up in OpenAlex to author_last_known_institutions,
+    keeping the first institution, or NULL for authors without one so they are not looked up again
+    until AUTHOR_INSTITUTION_NEGATIVE_TTL has passed.
+    """
+    rows = [{"author_id": author_id,
+             "institution_id": institutions[0].get("id") if institutions else None,
+             "institution_name": institutions[0].get("display_name") if institutions else None}
+            for author_id, institutions in institutions_by_author.items()]
+    if not rows:
+        return
+    results = execute_query("""
+        INSERT INTO author_last_known_institutions (author_id, institution_id, institution_name, fetched_at)
+        SELECT r.author_id, r.institution_id, r.institution_name, now()
+        FROM jsonb_to_recordset(%s::jsonb) AS r(author_id TEXT, institution_id TEXT, institution_name TEXT)
+        ON CONFLICT (author_id) DO UPDATE SET
+            institution_id = EXCLUDED.institution_id,
+            institution_name = EXCLUDED.institution_name,
+            fetched_at = EXCLUDED.fetched_at
+        RETURNING author_id;
+    """, (json.dumps(rows),))
+    if results is not None:
+        app.logger.info(f"Stored last known institutions for {len(results)} authors")
+
 def fetch_last_known_institutions(raw_id: str) -> list:
     """
     Make a request to the OpenAlex API to fetch the last known institutions for a given author id.
     The parameter raw_id is the id in the authors table, which has the format "https://openalex.org/author/1234",
     but we only need the last part of the id, i.e., "1234".
+    Lookups are stored in author_last_known_institutions (filled ahead of time by
+    `flask backfill-author-institutions`), so OpenAlex is only called for authors not stored yet.
     """
-    try:
-        id = raw_id.split('/')[-1]
-        response = requests.get(f"https://api.openalex.org/authors/{id}")
+    def fetch():
+        response = http_client.get(f"https://api.openalex.org/authors/{id}", timeout=AUTHOR_INSTITUTION_TIMEOUT)
+        if response.status_code == 404:
+            return []
+        if response.status_code != 200:
+            raise RuntimeError(f"OpenAlex returned {response.status_code}")
         data = response.json()
         return data.get("last_known_institutions", [])
+
+    try:
+        stored = fetch_stored_last_known_institutions([raw_id])
+        if raw_id in stored:
+            return stored[raw_id]
+        id = raw_id.split('/')[-1]
+        institutions = response_cache.get_or_compute('openalex', ['last_known_institutions', id], fetch)
+        store_last_known_institutions({raw_id: institutions})
+        return institutions
     except Exception as e:
-        logger.error(f"Error fetching last known institutions for id {id}: {str(e)}")
+        logger.error(f"Error fetching last known institutions for id {raw_id}: {str(e)}")
         return []
 
+def fetch_last_known_institutions_batch(author_ids):
+    """
+    Looks up the last known institutions of up to 100 authors with one OpenAlex call, using the
+    openalex_id:A1|A2 filter. Returns {author_id: last_known_institutions}, with an empty list for
+    authors OpenAlex has no institution for or does not know.
+    """
+    short_ids = {author_id.split('/')[-1]: author_id for author_id in author_ids}
+    response = http_client.get(
+        'https://api.openalex.org/authors',
+        params={
+            'filter': 'openalex_id:' + '|'.join(short_ids),
+            'select': 'id,last_known_institutions',
+            'per-page': len(short_ids),
+        },
+        timeout=AUTHOR_INSTITUTION_TIMEOUT,
+    )
+    response.raise_for_status()
+    institutions_by_author = {author_id: [] for author_id in author_ids}
+    for result in response.json().get('results', []):
+        author_id = short_ids.get(result['id'].split('/')[-1])
+        if author_id is not None:
+            institutions_by_author[author_id] = result.get('last_known_institutions') or []
+    return institutions_by_author
+
+@app.cli.command('backfill-author-institutions')
+@click.option('--batch-size', default=50, show_default=True, help='Authors looked up per OpenAlex request (at most 100).')
+@click.option('--limit', type=int, default=None, help='Stop after this many authors.')
+def backfill_author_institutions(batch_size, limit):
+    """
+    Looks up every author whose last_known_institution is NULL (or whose stored lookup has expired)
+    in OpenAlex and stores the result in author_last_known_institutions, so searches for those
+    authors never wait on OpenAlex. Safe to stop and rerun; authors already stored are skipped.
+    """
+    batch_size = max(1, min(batch_size, 100))
+    after_id = ''
+    done = 0
+    found = 0
+    while limit is None or done < limit:
+        size = batch_size if limit is None else min(batch_size, limit - done)
+        rows = execute_query(
+            "SELECT get_authors_missing_institution(%s, %s, make_interval(secs => %s), make_interval(secs => %s));",
+            (after_id, size, AUTHOR_INSTITUTION_TTL, AUTHOR_INSTITUTION_NEGATIVE_TTL))
+        if rows is None:
+            raise click.ClickException("Could not read authors from the database")
+        if not rows:
+            break
+        author_ids = [row[0] for row in rows]
+        try:
+            institutions_by_author = fetch_last_known_institutions_batch(author_ids)
+        except Exception as e:
+            raise click.ClickException(f"OpenAlex lookup failed after {done} authors: {str(e)}")
+        store_last_known_institutions(institutions_by_author)
+        after_id = author_ids[-1]
+        done += len(author_ids)
+        found += sum(1 for institutions in institutions_by_author.values() if institutions)
+        click.echo(f"{done} authors looked up, {found} with an institution (last id {after_id})")
+    click.echo(f"Done: {done} authors looked up, {found} with an institution")
+
 def get_author_ids(author_name):  
     app.logger.debug(f"Getting author IDs for: {author_name}")
     query = """SELECT get_author_ids(%s);"""
@@ -162,123 +1226,94 @@ def get_institution_id(institution_name):
     app.logger.warning(f"Query returned no results for institution {institution_name}")
     return None
 
-def search_by_author_institution_topic(author_name, institution_name, topic_name):
+@cached_search
+def search_by_author_institution_topic(author_name, institution_name, topic_name, page_limit=None, page_offset=0):
     app.logger.debug(f"Searching by author, institution, and topic: {author_name}, {institution_name}, {topic_name}")
-    author_ids = get_author_ids(author_name)
-    if not author_ids:
-        app.logger.warning(f"No author IDs found for {author_name}")
-        return None
-    
-    author_id = author_ids[0]['author_id']
-    app.logger.debug(f"Using author ID: {author_id}")
-
-    institution_id = get_institution_id(institution_name)
-    if institution_id is None:
-        app.logger.warning(f"No institution ID found for {institution_name}")
-        return None
-
-    query = """SELECT search_by_author_institution_topic(%s, %s, %s);"""
-    results = execute_query(query, (author_id, institution_id, topic_name))
-    if results:
+    # Names are resolved to ids inside the SQL function so the search is a single round trip
+    query, params = search_query("search_by_author_institution_topic_by_name", (author_name, institution_name, topic_name), page_limit, page_offset)
+    results = execute_query(query, params)
+    if results and results[0][0] is not None:
         app.logger.info("Found results for author-institution-topic search")
         return results[0][0]
     app.logger.warning("No results found for author-institution-topic search")
     return None
 
-def search_by_author_institution(author_name, institution_name):
+@cached_search
+def search_by_author_institution(author_name, institution_name, page_limit=None, page_offset=0):
     app.logger.debug(f"Searching by author and institution: {author_name}, {institution_name}")
-    author_ids = get_author_ids(author_name)
-    if not author_ids:
-        app.logger.warning(f"No author IDs found for {author_name}")
-        return None
-    
-    author_id = author_ids[0]['author_id']
-    app.logger.debug(f"Using author ID: {author_id}")
-
-    institution_id = get_institution_id(institution_name)
-    if institution_id is None:
-        app.logger.warning(f"No institution ID found for {institution_name}")
-        return None
-
-    query = """SELECT search_by_author_institution(%s, %s);"""
-    results = execute_query(query, (author_id, institution_id))
-    if results:
+    query, params = search_query("search_by_author_institution_by_name", (author_name, institution_name), page_limit, page_offset)
+    results = execute_query(query, params)
+    if results and results[0][0] is not None:
         app.logger.info("Found results for author-institution search")
         return results[0][0]
     app.logger.warning("No results found for author-institution search")
     return None
 
-def search_by_institution_topic(institution_name, topic_name):
+@cached_search
+def search_by_institution_topic(institution_name, topic_name, page_limit=None, page_offset=0, after=None):
     app.logger.debug(f"Searching by institution and topic: {institution_name}, {topic_name}")
-    institution_id = get_institution_id(institution_name)
-    if institution_id is None:
-        app.logger.warning(f"No institution ID found for {institution_name}")
-        return None
-
-    query = """SELECT search_by_institution_topic(%s, %s);"""
-    results = execute_query(query, (institution_id, topic_name))
-    if results:
+    if after is not None:
+        # Keyset page: the authors after the (num_of_works, author_id) of the previous page's last row
+        query = """SELECT search_by_institution_topic_by_name_after(%s, %s, %s, %s, %s);"""
+        params = (institution_name, topic_name, page_limit) + tuple(after)
+    else:
+        query, params = search_query("search_by_institution_topic_by_name", (institution_name, topic_name), page_limit, page_offset)
+    results = execute_query(query, params)
+    if results and results[0][0] is not None:
         app.logger.info("Found results for institution-topic search")
         return results[0][0]
     app.logger.warning("No results found for institution-topic search")
     return None
 
-def search_by_author_topic(author_name, topic_name):
+@cached_search
+def search_by_author_topic(author_name, topic_name, page_limit=None, page_offset=0):
     app.logger.debug(f"Searching by author and topic: {author_name}, {topic_name}")
-    author_ids = get_author_ids(author_name)
-    if not author_ids:
-        app.logger.warning(f"No author IDs found for {author_name}")
-        return None
-    
-    author_id = author_ids[0]['author_id']
-    app.logger.debug(f"Using author ID: {author_id}")
-
-    query = """SELECT search_by_author_topic(%s, %s);"""
-    results = execute_query(query, (author_id, topic_name))
-    if results:
+    query, params = search_query("search_by_author_topic_by_name", (author_name, topic_name), page_limit, page_offset)
+    results = execute_query(query, params)
+    if results and results[0][0] is not None:
         app.logger.info("Found results for author-topic search")
         return results[0][0]
     app.logger.warning("No results found for author-topic search")
     return None
 
-def search_by_topic(topic_name):
+@cached_search
+def search_by_topic(topic_name, page_limit=None, page_offset=0, map_limit=None, after=None):
     app.logger.debug(f"Searching by topic: {topic_name}")
-    query = """SELECT search_by_topic(%s);"""
-    results = execute_query(query, (topic_name,))
+    if page_limit is None:
+        query = """SELECT search_by_topic(%s);"""
+        params = (topic_name,)
+    elif after is not None:
+        # Keyset page: the institutions after the (num_of_authors, num_of_works, institution_id) of the previous page's last row
+        query = """SELECT search_by_topic_after(%s, %s, %s, %s, %s, %s);"""
+        params = (topic_name, page_limit) + tuple(after) + (map_limit,)
+    else:
+        # The paged overload also returns the top map_limit institutions for the map view
+        query = """SELECT search_by_topic(%s, %s, %s, %s);"""
+        params = (topic_name, page_limit, page_offset, map_limit)
+    results = execute_query(query, params)
     if results:
         app.logger.info(f"Found results for topic search: {topic_name}")
         return results[0][0]
     app.logger.warning(f"No results found for topic: {topic_name}")
     return None
 
-def search_by_institution(institution_name):
+@cached_search
+def search_by_institution(institution_name, page_limit=None, page_offset=0):
     app.logger.debug(f"Searching by institution: {institution_name}")
-    institution_id = get_institution_id(institution_name)
-    if institution_id is None:
-        app.logger.warning(f"No institution ID found for {institution_name}")
-        return None
-
-    query = """SELECT search_by_institution(%s);"""
-    results = execute_query(query, (institution_id,))
-    if results:
+    query, params = search_query("search_by_institution_by_name", (institution_name,), page_limit, page_offset)
+    results = execute_query(query, params)
+    if results and results[0][0] is not None:
         app.logger.info(f"Found results for institution search: {institution_name}")
         return results[0][0]
     app.logger.warning(f"No results found for institution: {institution_name}")
     return None
 
-def search_by_author(author_name):
+@cached_search
+def search_by_author(author_name, page_limit=None, page_offset=0):
     app.logger.debug(f"Searching by author: {author_name}")
-    author_ids = get_author_ids(author_name)
-    if not author_ids:
-        app.logger.warning(f"No author IDs found for {author_name}")
-        return None
-
-    author_id = author_ids[0]['author_id']
-    app.logger.debug(f"Using author ID: {author_id}")
-
-    query = """SELECT search_by_author(%s);"""
-    results = execute_query(query, (author_id,))
-    if results:
+    query, params = search_query("search_by_author_by_name", (author_name,), page_limit, page_offset)
+    results = execute_query(query, params)
+    if results and results[0][0] is not None:
         app.logger.info(f"Found results for author search: {author_name}")
         return results[0][0]
     app.logger.warning(f"No results found for author: {author_name}")
@@ -297,6 +1332,408 @@ if not SUBFIELDS:
   with open('keywords.csv', 'r') as fil:
       autofill_topics_list = fil.read().split('\n')
 
+AUTOFILL_DEFAULT_LIMIT = int(os.getenv('AUTOFILL_DEFAULT_LIMIT', 20))
+AUTOFILL_MAX_LIMIT = 100
+
+def normalize_autocomplete_text(text):
+    """Case-folds text, strips accents and replaces punctuation with single spaces."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+def edit_distance(a, b):
+    """Number of single-character insertions, deletions, substitutions or adjacent swaps turning a into b."""
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[len(b)]
+
+class AutocompleteIndex:
+    """
+    Autofill suggestions over a fixed list of names, built once when the app starts.
+
+    Names are normalized up front and indexed by character trigram, so a lookup only checks the
+    names that share the query's rarest trigram. Matches are ranked prefix first, then start of a
+    word, then anywhere in the name; ties go to the higher weight (such as works_count) and then to
+    the order of the source file. Weights come from weight_source on first use; if they cannot be
+    loaded, names are ranked without them and the load is retried after weight_retry_interval seconds.
+    """
+
+    def __init__(self, entries, weight_source=None, weight_retry_interval=300.0):
+        self.entries = []
+        self._padded = []   # ' ' + normalized name, so prefix and word-start checks are one find()
+        self._positions = {}   # normalized name -> position of its first entry
+        seen = set()
+        for entry in entries:
+            normalized = normalize_autocomplete_text(entry)
+            if normalized and entry not in seen:
+                seen.add(entry)
+                self._positions.setdefault(normalized, len(self.entries))
+                self.entries.append(entry)
+                self._padded.append(f" {normalized}")
+        trigrams = {}
+        for position, padded in enumerate(self._padded):
+            for gram in {padded[i:i + 3] for i in range(1, len(padded) - 2)}:
+                trigrams.setdefault(gram, []).append(position)
+        self._trigrams = {gram: tuple(positions) for gram, positions in trigrams.items()}
+        self._weight_source = weight_source
+        self._weight_retry_interval = weight_retry_interval
+        self._weights_attempted_at = None
+        self._lock = threading.Lock()
+        self._set_order(None)
+
+    def _set_order(self, weights):
+        """Precomputes the tie-break order: by weight, then by position in the source file."""
+        positions = range(len(self.entries))
+        if weights:
+            self._order = tuple(sorted(positions, key=lambda position: (-(weights.get(self.entries[position]) or 0), position)))
+            self._order_of = {position: rank for rank, position in enumerate(self._order)}
+        else:
+            self._order = tuple(positions)
+            self._order_of = None
+        self._weighted = weights is not None
+
+    def _load_weights(self):
+        if self._weight_source is None or self._weighted:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._weighted or (self._weights_attempted_at is not None and now - self._weights_attempted_at < self._weight_retry_interval):
+                return
+            self._weights_attempted_at = now
+        weights = self._weight_source()
+        if weights is not None:
+            with self._lock:
+                self._set_order(weights)
+
+    def _candidates(self, query):
+        """Names that may contain query, in tie-break order."""
+        if len(query) < 3:
+            return self._order
+        postings = []
+        for i in range(len(query) - 2):
+            gram_postings = self._trigrams.get(query[i:i + 3])
+            if gram_postings is None:
+                return ()
+            postings.append(gram_postings)
+        candidates = min(postings, key=len)
+        if self._order_of is not None:
+            candidates = sorted(candidates, key=self._order_of.__getitem__)
+        return candidates
+
+    def search(self, text, limit=AUTOFILL_DEFAULT_LIMIT):
+        """Returns up to limit names matching text, best match first."""
+        query = normalize_autocomplete_text(text or '')
+        if not query or limit <= 0:
+            return []
+        self._load_weights()
+        word_query = f" {query}"
+        prefix, word_start, substring = [], [], []
+        for position in self._candidates(query):
+            found = self._padded[position].find(word_query)
+            if found == 0:
+                prefix.append(position)
+                if len(prefix) >= limit:
+                    break
+            elif found > 0:
+                word_start.append(position)
+            elif query in self._padded[position]:
+                substring.append(position)
+        return [self.entries[position] for position in (prefix + word_start + substring)[:limit]]
+
+    def closest_match(self, text):
+        """
+        Returns the name text most likely refers to: the name equal to it after normalization, or
+        else the nearest name within a typo's reach (one edit, plus one more per 20 characters).
+        None when nothing is that close; names that merely share words such as "University" are
+        not matched.
+        """
+        query = normalize_autocomplete_text(text or '')
+        if not query:
+            return None
+        if query in self._positions:
+            return self.entries[self._positions[query]]
+        max_distance = 1 + len(query) // 20
+        best = None
+        for candidate in difflib.get_close_matches(query, self._positions.keys(), n=5, cutoff=0.8):
+            distance = edit_distance(query, candidate)
+            if distance <= max_distance and (best is None or distance < best[0]):
+                best = (distance, candidate)
+        if best:
+            return self.entries[self._positions[best[1]]]
+        return None
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def fetch_autocomplete_weights(kind):
+    """Returns {name: works_count} for 'institutions' or 'subfields' from get_autocomplete_weights(), or None."""
+    results = execute_query("SELECT get_autocomplete_weights(%s);", (kind,))
+    if results and results[0][0] is not None:
+        return results[0][0]
+    app.logger.warning(f"Could not load autocomplete weights for {kind}")
+    return None
+
+def parse_autofill_limit(value):
+    """Clamps the limit sent by the frontend to 1..AUTOFILL_MAX_LIMIT, using the default when it is missing or invalid."""
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return AUTOFILL_DEFAULT_LIMIT
+    return max(1, min(limit, AUTOFILL_MAX_LIMIT))
+
+institution_autocomplete = AutocompleteIndex(
+    autofill_inst_list,
+    weight_source=lambda: fetch_autocomplete_weights('institutions'),
+)
+if SUBFIELDS:
+  topic_autocomplete = AutocompleteIndex(
+      autofill_subfields_list,
+      weight_source=lambda: fetch_autocomplete_weights('subfields'),
+  )
+else:
+  topic_autocomplete = AutocompleteIndex(autofill_topics_list)
+
+def normalize_researcher_name(name):
+    """
+    Title-cases researcher input typed all in lower or upper case. Names typed with mixed case are
+    kept as typed, so "McDonald" or "van der Berg" are not turned into "Mcdonald" or "Van Der Berg".
+    """
+    if isinstance(name, str) and name in (name.lower(), name.upper()):
+        return name.title()
+    return name
+
+def search_with_closest_institution(institution, search):
+    """
+    Runs search(institution_name) and, when the database finds nothing, retries once with the closest
+    name in institutions.csv. That match is made in process, so it also corrects names where the
+    database's trigram matching is unavailable or too strict. Returns the result and the name used, so
+    callers falling back to SPARQL/OpenAlex query the corrected name.
+    """
+    data = search(institution)
+    if data is not None:
+        return data, institution
+    closest = institution_autocomplete.closest_match(institution)
+    if closest is None or closest == institution:
+        return None, institution
+    app.logger.info(f"No database results for institution {institution}, retrying as {closest}")
+    return search(closest), closest
+
+class GraphBuilder:
+    """
+    Collects the nodes and edges of a search result graph.
+
+    Nodes are keyed by id and edges by their (start, end, label), as in merge_graphs, so adding one
+    that is already in the graph is a dict lookup and a no-op: a NUMBER node shared by several rows
+    with the same count, or a topic listed under more than one subfield, is emitted once. Edges with
+    different labels between the same two nodes are all kept. The first node or edge added wins.
+    """
+
+    __slots__ = ('_nodes', '_edges')
+
+    def __init__(self):
+        self._nodes = {}
+        self._edges = {}
+
+    def node(self, node_id, label, type, **attributes):
+        """Adds a node (extra attributes such as people are kept on the node) and returns its id."""
+        if node_id not in self._nodes:
+            self._nodes[node_id] = {'id': node_id, 'label': label, 'type': type, **attributes}
+        return node_id
+
+    def edge(self, start, end, label, start_type, end_type):
+        """Adds an edge from start to end, with the id "start-end"."""
+        key = (start, end, label)
+        if key not in self._edges:
+            self._edges[key] = {'id': f"{start}-{end}", 'start': start, 'end': end, "label": label,
+                                "start_type": start_type, "end_type": end_type}
+
+    def to_dict(self):
+        """Returns the graph as {nodes: [], edges: []}, in the order nodes and edges were first added."""
+        return {"nodes": list(self._nodes.values()), "edges": list(self._edges.values())}
+
+GRAPH_FORMATS = ('objects', 'columnar')
+
+def to_columnar_graph(graph):
+    """
+    Converts a {nodes: [], edges: []} graph into the compact columnar wire format.
+
+    ids holds every node id once, followed by any edge endpoints that have no node; node i is ids[i]
+    and edges refer to endpoints by their index in ids. Node and edge types and edge labels are
+    interned into the types and labels lists. A node label equal to its id (NUMBER nodes) and an
+    edge id equal to "start-end" are sent as null. Other node attributes (such as people) get a
+    column of their own, null for nodes without them. Repeated node ids keep their first entry.
+    """
+    ids = []
+    positions = {}
+    types = []
+    type_positions = {}
+    labels = []
+    label_positions = {}
+
+    def intern(value, values, value_positions):
+        if value not in value_positions:
+            value_positions[value] = len(values)
+            values.append(value)
+        return value_positions[value]
+
+    nodes = []
+    for node in graph.get('nodes', []):
+        if node['id'] in positions:
+            continue
+        positions[node['id']] = len(ids)
+        ids.append(node['id'])
+        nodes.append(node)
+    node_columns = {
+        'label': [None if node.get('label') == node['id'] else node.get('label') for node in nodes],
+        'type': [intern(node.get('type'), types, type_positions) for node in nodes],
+    }
+    for node in nodes:
+        for key in node:
+            if key not in node_columns and key != 'id':
+                node_columns[key] = [other.get(key) for other in nodes]
+
+    columns = {'id': [], 'start': [], 'end': [], 'label': [], 'start_type': [], 'end_type': []}
+    for edge in graph.get('edges', []):
+        start = intern(edge['start'], ids, positions)
+        end = intern(edge['end'], ids, positions)
+        columns['id'].append(None if edge.get('id') == f"{edge['start']}-{edge['end']}" else edge.get('id'))
+        columns['start'].append(start)
+        columns['end'].append(end)
+        columns['label'].append(intern(edge.get('label'), labels, label_positions))
+        columns['start_type'].append(intern(edge.get('start_type'), types, type_positions))
+        columns['end_type'].append(intern(edge.get('end_type'), types, type_positions))
+
+    return {
+        'format': 'columnar',
+        'ids': ids,
+        'types': types,
+        'labels': labels,
+        'nodes': node_columns,
+        'edges': columns,
+    }
+
+def load_compressors(best=False):
+    """
+    Returns {content_encoding: compress(bytes) -> bytes}, most preferred first: br and zstd when the
+    optional brotli and zstandard packages are installed, and always gzip. With best=True the
+    slowest, smallest settings are used, for bodies that are compressed once and served many times.
+    """
+    compressors = OrderedDict()
+    try:
+        import brotli
+        quality = 11 if best else 4
+        compressors['br'] = lambda body: brotli.compress(body, quality=quality)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        compressor = zstandard.ZstdCompressor(level=19 if best else 3)
+        compressors['zstd'] = compressor.compress
+    except ImportError:
+        pass
+    level = 9 if best else 6
+    compressors['gzip'] = lambda body: gzip.compress(body, compresslevel=level)
+    return compressors
+
+class ResponseCompressor:
+    """
+    Compresses JSON responses of at least min_size bytes with the best encoding the client accepts.
+
+    Responses that already have a Content-Encoding (such as the precomputed default graph),
+    streamed responses and responses without a body are passed through unchanged. Bytes before and
+    after compression and the time spent are counted per encoding for /metrics.
+    """
+
+    def __init__(self, min_size=1024, compressors=None):
+        self.min_size = min_size
+        self.compressors = load_compressors() if compressors is None else compressors
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._skipped = 0
+
+    def compress(self, response, accept_encodings):
+        if (response.direct_passthrough or response.is_streamed
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or not response.is_json):
+            return response
+        response.vary.add('Accept-Encoding')
+        body = response.get_data()
+        encoding = accept_encodings.best_match(list(self.compressors))
+        if encoding is None or len(body) < self.min_size:
+            with self._lock:
+                self._skipped += 1
+            return response
+
+        started = time.perf_counter()
+        compressed = self.compressors[encoding](body)
+        elapsed = time.perf_counter() - started
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        with self._lock:
+            stats = self._stats.setdefault(encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "seconds": 0.0})
+            stats["responses"] += 1
+            stats["bytes_in"] += len(body)
+            stats["bytes_out"] += len(compressed)
+            stats["seconds"] += elapsed
+        return response
+
+    def get_stats(self):
+        with self._lock:
+            encodings = {
+                encoding: dict(stats, seconds=round(stats["seconds"], 4),
+                               ratio=round(stats["bytes_out"] / stats["bytes_in"], 3))
+                for encoding, stats in self._stats.items()
+            }
+            return {"min_size": self.min_size, "available": list(self.compressors),
+                    "uncompressed": self._skipped, "encodings": encodings}
+
+response_compressor = ResponseCompressor(min_size=int(os.getenv('COMPRESSION_MIN_SIZE', 1024)))
+
+@app.after_request
+def compress_response(response):
+    return response_compressor.compress(response, request.accept_encodings)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that serializes with orjson, several times faster than the json module on
+    the large node/edge lists the search endpoints return. Output is the same JSON (keys sorted, the
+    same fallbacks for dates, decimals and dataclasses); anything orjson cannot encode, such as
+    integers beyond 64 bits, falls back to the json module.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if kwargs.pop('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.pop('indent', None):
+            option |= orjson.OPT_INDENT_2
+        kwargs.pop('separators', None)
+        default = kwargs.pop('default', self.default)
+        if kwargs:
+            return super().dumps(obj, default=default, **kwargs)
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, default=default)
+
+# orjson is not in requirements.txt, so it is only used when asked for with JSON_PROVIDER=orjson
+if os.getenv('JSON_PROVIDER', 'json') == 'orjson':
+    if orjson is None:
+        app.logger.warning("JSON_PROVIDER=orjson but orjson is not installed, using the default JSON provider")
+    else:
+        app.json = OrjsonProvider(app)
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -313,6 +1750,14 @@ def server_error(e):
     app.logger.error(f"500 error: {str(e)}")
     return "Internal Server Error", 500
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Returns runtime metrics for the worker process that served the request.
+    """
+    return jsonify({"db_pool": db_pool.get_stats(), "cache": response_cache.get_stats(),
+                    "compression": response_compressor.get_stats(), "http": http_client.get_stats()})
+
 @app.route('/initial-search', methods=['POST'])
 def initial_search():
   """
@@ -323,20 +1768,32 @@ def initial_search():
   researcher : input from the "researcher name" search box
   topic : input from the "topic keyword" search box
   type : input from the "type" search box (for now, this is always HBCU)
+  page, per_page : which page of the result list to return
+  cursor : optional next_cursor from the previous page's metadata_pagination (topic and institution + topic searches)
+  include_coordinates : for topic searches, also return map_points with the latitude and longitude of the map institutions
+  format : "columnar" (also accepted as a ?format= query parameter) to return the graph in the compact format from to_columnar_graph
 
   Returns:
   metadata : the metadata for the search
   graph : the graph for the search in the form {nodes: [], edges: []}
   list : the list view for the search
+  partial, degraded_upstreams : set when SemOpenAlex or OpenAlex could not answer within the request
+    deadline (or its circuit breaker is open), so the result is missing what those hosts would have added.
+    An empty result is returned as {} with the hosts in the X-Degraded-Upstreams header.
   """
 
   request_data = request.get_json()
   page = request_data.get('page', 1)
   per_page = request_data.get('per_page',25)
+  cursor = request_data.get('cursor')
+  include_coordinates = bool(request_data.get('include_coordinates', False))
+  graph_format = request.args.get('format') or request_data.get('format') or 'objects'
+  if graph_format not in GRAPH_FORMATS:
+    return jsonify({"error": "Unsupported format"}), 400
 
   institution = request.json.get('organization')
   researcher = request.json.get('researcher')
-  researcher = researcher.title()
+  researcher = normalize_researcher_name(researcher)
   type = request.json.get('type')
   topic = request.json.get('topic')
 
@@ -348,27 +1805,80 @@ def initial_search():
     elif institution and researcher:
       results = get_institution_and_researcher_results(institution, researcher, page, per_page)
     elif institution and topic:
-      results = get_institution_and_subfield_results(institution, topic, page, per_page)
+      results = get_institution_and_subfield_results(institution, topic, page, per_page, cursor=cursor)
     elif researcher and topic:
       results = get_researcher_and_subfield_results(researcher, topic, page, per_page)
     elif topic:
-      results = get_subfield_results(topic, page, per_page)
+      results = get_subfield_results(topic, page, per_page, cursor=cursor, include_coordinates=include_coordinates)
     elif institution:
       results = get_institution_results(institution, page, per_page)
     elif researcher:
       results = get_researcher_result(researcher, page, per_page)
 
+    degraded = degraded_upstreams()
     if not results:
       app.logger.warning("Search returned no results")
       return {}
 
+    if graph_format == 'columnar' and results.get('graph'):
+      results = dict(results, graph=to_columnar_graph(results['graph']))
+    if degraded:
+      app.logger.warning(f"Search answered without {', '.join(degraded)}")
+      results = dict(results, partial=True, degraded_upstreams=degraded)
+
     app.logger.info("Search completed successfully")
     return results
 
+  except InvalidCursorError as e:
+    app.logger.warning(str(e))
+    return jsonify({"error": "Invalid cursor"}), 400
+  except UpstreamUnavailableError as e:
+    app.logger.warning(f"Search failed fast, returning no results: {e}")
+    return {}
   except Exception as e:
     app.logger.critical(f"Critical error during search: {str(e)}")
     return {"error": "An unexpected error occurred"}
 
+GEO_COLUMNS = ('city', 'geonames_city_id', 'region', 'country_code', 'country', 'latitude', 'longitude')
+
+def fetch_local_institution_geo(institution_ids):
+    """
+    Looks up institutions (short ids such as I123) in openalex.institutions_geo with a single query.
+    Returns {institution_id: geo} for the institutions stored locally, with the same keys as OpenAlex's geo object.
+    """
+    if not institution_ids:
+        return {}
+    results = execute_query(
+        f"SELECT institution_id, {', '.join(GEO_COLUMNS)} FROM openalex.institutions_geo WHERE institution_id = ANY(%s);",
+        ([f"https://openalex.org/{institution_id}" for institution_id in institution_ids],)
+    )
+    geo_by_id = {}
+    for row in results or []:
+        geo_by_id[row[0].replace('https://openalex.org/', '')] = dict(zip(GEO_COLUMNS, row[1:]))
+    return geo_by_id
+
+def store_institution_geo(geo_by_id):
+    """
+    Writes geo data fetched from OpenAlex back to openalex.institutions_geo so the next lookup is local.
+    Institutions missing from openalex.institutions are skipped to respect the foreign key.
+    """
+    rows = [dict(geo, institution_id=f"https://openalex.org/{institution_id}")
+            for institution_id, geo in geo_by_id.items() if geo]
+    if not rows:
+        return
+    columns = ', '.join(GEO_COLUMNS)
+    results = execute_query(f"""
+        INSERT INTO openalex.institutions_geo (institution_id, {columns})
+        SELECT g.institution_id, {', '.join(f'g.{column}' for column in GEO_COLUMNS)}
+        FROM jsonb_to_recordset(%s::jsonb) AS g(institution_id TEXT, city TEXT, geonames_city_id TEXT, region TEXT,
+                                                country_code TEXT, country TEXT, latitude REAL, longitude REAL)
+        WHERE EXISTS (SELECT 1 FROM openalex.institutions i WHERE i.id = g.institution_id)
+        ON CONFLICT (institution_id) DO NOTHING
+        RETURNING institution_id;
+    """, (json.dumps(rows, default=str),))
+    if results is not None:
+        app.logger.info(f"Stored geo data for {len(results)} institutions")
+
 @app.route('/geo_info', methods=['POST'])
 def get_geo_info():
     institution_id = request.json.get('institution_oa_link')
@@ -376,17 +1886,31 @@ def get_geo_info():
     institution_id = institution_id.replace("openalex.org/institutions/", "")
     api_call = f"https://api.openalex.org/institutions/{institution_id}?select=geo"
     headers = {'Accept': 'application/json'}
-    response = requests.get(api_call, headers=headers)
-    if not response.status_code == 404:
+
+    def fetch():
+        local_geo = fetch_local_institution_geo([institution_id])
+        if institution_id in local_geo:
+            return {"geo": local_geo[institution_id]}
+        response = http_client.get(api_call, headers=headers)
+        if response.status_code == 404:
+            app.logger.warning(f"(404 Error) Institution not found for id {institution_id}")
+            return None
+        if response.status_code != 200:
+            app.logger.warning(f"OpenAlex returned {response.status_code} for institution {institution_id}")
+            return None
         data = response.json()
-        if data == None:
+        if not data or 'geo' not in data:
             app.logger.warning(f"No data found for institution {institution_id}")
-        else:
-            app.logger.info(f"Found geo data for institution id {institution_id}")
-            geography_data = data['geo']
-            return geography_data
-    else:
-        app.logger.warning(f"(404 Error) Institution not found for id {institution_id}")
+            return None
+        if data['geo']:
+            store_institution_geo({institution_id: data['geo']})
+        return data
+
+    data = response_cache.get_or_compute('geo', [institution_id], fetch)
+    if data is not None:
+        app.logger.info(f"Found geo data for institution id {institution_id}")
+        geography_data = data['geo']
+        return geography_data
 
 
 def get_researcher_result(researcher, page=1, per_page=20):
@@ -394,7 +1918,7 @@ def get_researcher_result(researcher, page=1, per_page=20):
     Gets the results when user only inputs a researcher
     Uses database to get result, defaults to SPARQL if researcher is not in database
     """
-    data = search_by_author(researcher)
+    data = search_by_author(researcher, page_limit=per_page, page_offset=(page - 1) * per_page)
     if data is None:
         app.logger.info("No database results, falling back to SPARQL...")
         data = get_author_metadata_sparql(researcher)
@@ -408,7 +1932,7 @@ def get_researcher_result(researcher, page=1, per_page=20):
 
     app.logger.debug("Processing database results for researcher")
     list = []
-    metadata = data['author_metadata']
+    metadata = dict(data['author_metadata'])
 
     if metadata['orcid'] is None:
         metadata['orcid'] = ''
@@ -433,27 +1957,23 @@ def get_researcher_result(researcher, page=1, per_page=20):
     metadata['institution_url'] = institution_url
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
-    # nodes.append({ 'id': last_known_institution, 'label': last_known_institution, 'type': 'INSTITUTION' })
-    edges.append({ 'id': f"""{metadata['openalex_url']}-{last_known_institution}""", 'start': metadata['openalex_url'], 'end': last_known_institution, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
-    # nodes.append({ 'id': metadata['openalex_url'], 'label': researcher, "type": "AUTHOR"})
+    builder = GraphBuilder()
+    # builder.node(last_known_institution, last_known_institution, 'INSTITUTION')
+    builder.edge(metadata['openalex_url'], last_known_institution, "memberOf", "AUTHOR", "INSTITUTION")
+    # builder.node(metadata['openalex_url'], researcher, "AUTHOR")
     
-    total_topics = len(data['data'])
-    start = (page - 1) * per_page
-    end = start + per_page
+    rows, total_topics = page_rows(data, page, per_page)
 
-    for entry in data['data'][start:end]:
+    for entry in rows:
         subfield = entry['topic']
         num_works = entry['num_of_works']
         list.append((subfield, num_works))
-        nodes.append({'id': subfield, 'label': subfield, 'type': "SUBFIELD", 'people': (num_works / metadata['work_count']) * 50 })
-        subfield_metadata = data['subfield_metadata']
-        for topic in subfield_metadata[subfield]:
-            nodes.append({'id': topic['topic_display_name'], 'label': topic['topic_display_name'], 'type': "TOPIC"})
-            edges.append({ 'id': f"""{subfield}-{topic['topic_display_name']}""", 'start': subfield, 'end': topic['topic_display_name'], "label": "has_topic", "start_type": "SUBFIELD", "end_type": "TOPIC"})
+        builder.node(subfield, subfield, "SUBFIELD", people=(num_works / metadata['work_count']) * 50)
+        for topic in subfield_topic_index.get(subfield):
+            builder.node(topic['topic_display_name'], topic['topic_display_name'], "TOPIC")
+            builder.edge(subfield, topic['topic_display_name'], "has_topic", "SUBFIELD", "TOPIC")
 
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     app.logger.info(f"Successfully built result for researcher: {researcher}")
     return {"metadata": metadata,
             "metadata_pagination": {
@@ -467,7 +1987,8 @@ def get_institution_results(institution, page=1, per_page=10):
     Gets the results when user only inputs an institution
     Uses database to get result, defaults to SPARQL if institution is not in database
     """
-    data = search_by_institution(institution)
+    data, institution = search_with_closest_institution(
+        institution, lambda name: search_by_institution(name, page_limit=per_page, page_offset=(page - 1) * per_page))
     if data is None:
         app.logger.info("No database results, falling back to SPARQL...")
         data = get_institution_metadata_sparql(institution)
@@ -479,7 +2000,7 @@ def get_institution_results(institution, page=1, per_page=10):
         app.logger.info(f"Successfully retrieved SPARQL results for institution: {institution}")
         return results
     app.logger.debug("Processing database results for institution")
-    metadata = data['institution_metadata']
+    metadata = dict(data['institution_metadata'])
     metadata['homepage'] = metadata['url']
     metadata['works_count'] = metadata['num_of_works']
     metadata['name'] = metadata['institution_name']
@@ -488,26 +2009,22 @@ def get_institution_results(institution, page=1, per_page=10):
     metadata['author_count'] = metadata['num_of_authors']
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
+    builder = GraphBuilder()
     # institution_id = metadata['openalex_url']
 
-    total_topics = len(data['data'])
-    start = (page - 1) * per_page
-    end = start + per_page
+    rows, total_topics = page_rows(data, page, per_page)
 
     list = []
-    for entry in data['data'][start:end]:
+    for entry in rows:
         subfield = entry['topic_subfield']
         number = entry['num_of_authors']
         list.append((subfield, number))
-        nodes.append({'id': subfield, 'label': subfield, 'type': "SUBFIELD", 'people': (number / metadata['author_count']) * 100 })
-        subfield_metadata = data['subfield_metadata']
-        for topic in subfield_metadata[subfield]:
-            nodes.append({'id': topic['topic_display_name'], 'label': topic['topic_display_name'], 'type': "TOPIC"})
-            edges.append({ 'id': f"""{subfield}-{topic['topic_display_name']}""", 'start': subfield, 'end': topic['topic_display_name'], "label": "has_topic", "start_type": "SUBFIELD", "end_type": "TOPIC"})
+        builder.node(subfield, subfield, "SUBFIELD", people=(number / metadata['author_count']) * 100)
+        for topic in subfield_topic_index.get(subfield):
+            builder.node(topic['topic_display_name'], topic['topic_display_name'], "TOPIC")
+            builder.edge(subfield, topic['topic_display_name'], "has_topic", "SUBFIELD", "TOPIC")
     
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     app.logger.info(f"Successfully built result for institution: {institution}")
     return {
         "metadata": metadata,
@@ -520,48 +2037,107 @@ def get_institution_results(institution, page=1, per_page=10):
         "list": list
     }
 
+GEO_BATCH_SIZE = int(os.getenv('GEO_BATCH_SIZE', 50))
+GEO_BATCH_TIMEOUT = float(os.getenv('GEO_BATCH_TIMEOUT', 10))
+geo_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('GEO_BATCH_WORKERS', 4)),
+    thread_name_prefix='geo-batch',
+)
+def fetch_institution_geo_batch(institution_ids, timeout=None):
+    """
+    Looks up the geo data of several institutions with one OpenAlex call, using the
+    openalex_id:I1|I2 filter. Returns {institution_id: geo} for the institutions OpenAlex found.
+    """
+    response = http_client.get(
+        'https://api.openalex.org/institutions',
+        params={
+            'filter': 'openalex_id:' + '|'.join(institution_ids),
+            'select': 'id,geo',
+            'per-page': len(institution_ids),
+        },
+        timeout=GEO_BATCH_TIMEOUT if timeout is None else timeout,
+    )
+    response.raise_for_status()
+    geo_by_id = {}
+    for result in response.json().get('results', []):
+        geo_by_id[result['id'].replace('https://openalex.org/', '')] = result.get('geo') or {}
+    return geo_by_id
+
 @app.route('/geo_info_batch', methods=['POST'])
 def get_geo_info_batch():
+    """
+    Returns map markers for a list of [oa_link, institution_name, authors] entries.
+    Coordinates come from openalex.institutions_geo; only institutions missing there are fetched from
+    OpenAlex (and written back). Those ids are looked up GEO_BATCH_SIZE at a time on the geo worker pool; batches that have
+    not answered within GEO_BATCH_TIMEOUT seconds are dropped and the markers found so far are returned.
+    """
     institutions = request.json.get('institutions', [])
     results = []
     if not institutions or not isinstance(institutions, list):
         return jsonify({'error': 'Invalid or missing "institutions" list'}), 400
 
+    entries = []
     for entry in institutions:
         if not isinstance(entry, list) or len(entry) != 3:
             continue  
 
         oa_link, institution_name, authors = entry
 
-        if not oa_link.startswith("https://openalex.org/"):
+        if not isinstance(oa_link, str) or not oa_link.startswith("https://openalex.org/"):
             continue  
 
-        institution_id = oa_link.replace("https://openalex.org/", "")
-        api_url = f"https://api.openalex.org/institutions/{institution_id}?select=geo"
-        headers = {'Accept': 'application/json'}
-
         try:
-            response = requests.get(api_url, headers=headers)
-            if response.status_code != 404:
-                data = response.json()
-                geo = data.get("geo", {})
-                if geo.get("latitude") and geo.get("longitude"):
-                    results.append({
-                        "lat": geo["latitude"],
-                        "lng": geo["longitude"],
-                        "name": institution_name,
-                        "authors": int(authors)
-                    })
-        except Exception as e:
-            app.logger.warning(f"Error fetching geo info for {institution_name}: {e}")
+            authors = int(authors)
+        except (TypeError, ValueError):
+            app.logger.warning(f"Invalid author count for {institution_name}: {authors}")
+            continue
+        entries.append((oa_link.replace("https://openalex.org/", ""), institution_name, authors))
+
+    institution_ids = list(dict.fromkeys(institution_id for institution_id, _, _ in entries))
+    geo_by_id = fetch_local_institution_geo(institution_ids)
+    missing_ids = [institution_id for institution_id in institution_ids if institution_id not in geo_by_id]
+    batches = [missing_ids[i:i + GEO_BATCH_SIZE] for i in range(0, len(missing_ids), GEO_BATCH_SIZE)]
+    futures = {submit_with_budget(geo_executor, fetch_institution_geo_batch, batch): batch for batch in batches}
+    fetched_geo = {}
+    try:
+        for future in as_completed(futures, timeout=min(GEO_BATCH_TIMEOUT, remaining_request_time(GEO_BATCH_TIMEOUT))):
+            try:
+                fetched_geo.update(future.result())
+            except Exception as e:
+                app.logger.warning(f"Error fetching geo info for {len(futures[future])} institutions: {e}")
+    except FuturesTimeoutError:
+        pending = [future for future in futures if not future.done()]
+        for future in pending:
+            future.cancel()
+        app.logger.warning(f"Geo lookup deadline hit with {len(pending)} of {len(futures)} batches pending; returning partial results")
+    if fetched_geo:
+        store_institution_geo(fetched_geo)
+        geo_by_id.update(fetched_geo)
+
+    for institution_id, institution_name, authors in entries:
+        geo = geo_by_id.get(institution_id) or {}
+        if geo.get("latitude") and geo.get("longitude"):
+            results.append({
+                "lat": geo["latitude"],
+                "lng": geo["longitude"],
+                "name": institution_name,
+                "authors": authors
+            })
     return jsonify(results)
 
-def get_subfield_results(topic, page=1, per_page=20, map_limit=100):
+TOPIC_CURSOR_COLUMNS = ('num_of_authors', 'num_of_works', 'institution_id')
+INSTITUTION_TOPIC_CURSOR_COLUMNS = ('num_of_works', 'author_id')
+
+def get_subfield_results(topic, page=1, per_page=20, map_limit=100, cursor=None, include_coordinates=False):
     """
     Gets the results when user only inputs a subfield
     Uses database to get result
+    A cursor from a previous page's metadata_pagination fetches the following page by keyset instead of by offset
+    With include_coordinates, map_points holds ready-to-plot markers for the map institutions that have
+    coordinates in institutions_geo, so the map does not need a /geo_info_batch call
     """
-    data = search_by_topic(topic)
+    after = decode_cursor(cursor, 'topic', TOPIC_CURSOR_COLUMNS, [topic]) if cursor else None
+    data = search_by_topic(topic, page_limit=per_page, page_offset=(page - 1) * per_page, map_limit=map_limit, after=after)
     if data is None:
         app.logger.warning(f"No results found for topic: {topic}")
         return {"metadata": None, "graph": None, "list": None}
@@ -583,42 +2159,49 @@ def get_subfield_results(topic, page=1, per_page=20, map_limit=100):
     metadata['name'] = topic.title()
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
+    builder = GraphBuilder()
     coordinates_metadata = []
 
     topic_id = topic
-    nodes.append({ 'id': topic_id, 'label': topic, 'type': 'TOPIC' })
+    builder.node(topic_id, topic, 'TOPIC')
 
-    total_topics = len(data['data'])
-    start = (page - 1) * per_page
-    end = start + per_page
+    rows, total_topics = page_rows(data, page, per_page)
     
-    for entry in data['data'][start:end]:
+    for entry in rows:
         institution = entry['institution_name']
         number = entry['num_of_authors']
         oa_link = entry['institution_id']
         list.append((institution, number))
         coordinates_metadata.append((oa_link, institution, number))
-        nodes.append({ 'id': institution, 'label': institution, 'type': 'INSTITUTION' })
-        nodes.append({'id': number, 'label': number, 'type': "NUMBER"})
-        edges.append({ 'id': f"""{institution}-{topic_id}""", 'start': institution, 'end': topic_id, "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"})
-        edges.append({ 'id': f"""{institution}-{number}""", 'start': institution, 'end': number, "label": "number", "start_type": "INSTITUTION", "end_type": "NUMBER"})
+        builder.node(institution, institution, 'INSTITUTION')
+        builder.node(number, number, "NUMBER")
+        builder.edge(institution, topic_id, "researches", "INSTITUTION", "TOPIC")
+        builder.edge(institution, number, "number", "INSTITUTION", "NUMBER")
     
-    for entry in data['data'][:map_limit]:
+    map_rows = data['map_data'] if 'map_data' in data else data['data'][:map_limit]
+    for entry in map_rows:
         institution = entry['institution_name']
         number = entry['num_of_authors']
         oa_link = entry['institution_id']
         coordinates_metadata.append((oa_link, institution, number))
 
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     app.logger.info(f"Successfully built result for topic: {topic}")
-    return {"metadata": metadata, 
+    results = {"metadata": metadata, 
             "metadata_pagination": {
             "total_pages": (total_topics + per_page - 1) // per_page,
             "current_page": page,
             "total_topics": total_topics,
+            "next_cursor": next_page_cursor('topic', rows, TOPIC_CURSOR_COLUMNS, page, per_page, total_topics, [topic]),
         }, "graph": graph, "list": list, "coordinates": coordinates_metadata}
+    if include_coordinates:
+        results["map_points"] = [
+            {"institution_id": entry['institution_id'], "lat": entry['latitude'], "lng": entry['longitude'],
+             "name": entry['institution_name'], "authors": entry['num_of_authors']}
+            for entry in map_rows
+            if entry.get('latitude') is not None and entry.get('longitude') is not None
+        ]
+    return results
 
 
 def get_researcher_and_subfield_results(researcher, topic, page=1, per_page=20):
@@ -626,7 +2209,7 @@ def get_researcher_and_subfield_results(researcher, topic, page=1, per_page=20):
     Gets the results when user inputs a researcher and subfield
     Uses database to get result, defaults to SPARQL if researcher is not in database
     """
-    data = search_by_author_topic(researcher, topic)
+    data = search_by_author_topic(researcher, topic, page_limit=per_page, page_offset=(page - 1) * per_page)
     if data is None:
         app.logger.info("No database results, falling back to SPARQL...")
         data = get_topic_and_researcher_metadata_sparql(topic, researcher)
@@ -663,37 +2246,38 @@ def get_researcher_and_subfield_results(researcher, topic, page=1, per_page=20):
     metadata['researcher_oa_link'] = data['author_metadata']['openalex_url']
     if data['author_metadata']['last_known_institution'] is None:
         app.logger.debug("Fetching last known institutions from OpenAlex")
-        institution_object = fetch_last_known_institutions(metadata['researcher_oa_link'])[0]
-        metadata['current_institution'] = institution_object['display_name']
+        institution_object = fetch_last_known_institutions(metadata['researcher_oa_link'])
+        if institution_object == []:
+            app.logger.warning("No last known institution found")
+            metadata['current_institution'] = ""
+        else:
+            metadata['current_institution'] = institution_object[0]['display_name']
     else:
         metadata['current_institution'] = data['author_metadata']['last_known_institution']
     last_known_institution = metadata['current_institution']
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
+    builder = GraphBuilder()
     researcher_id = metadata['researcher_oa_link']
     subfield_id = metadata['topic_oa_link']
-    nodes.append({ 'id': last_known_institution, 'label': last_known_institution, 'type': 'INSTITUTION' })
-    edges.append({ 'id': f"""{researcher_id}-{last_known_institution}""", 'start': researcher_id, 'end': last_known_institution, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
-    nodes.append({ 'id': researcher_id, 'label': researcher, 'type': 'AUTHOR' })
-    nodes.append({ 'id': subfield_id, 'label': topic, 'type': 'TOPIC' })
-    edges.append({ 'id': f"""{researcher_id}-{subfield_id}""", 'start': researcher_id, 'end': subfield_id, "label": "researches", "start_type": "AUTHOR", "end_type": "TOPIC"})
+    builder.node(last_known_institution, last_known_institution, 'INSTITUTION')
+    builder.edge(researcher_id, last_known_institution, "memberOf", "AUTHOR", "INSTITUTION")
+    builder.node(researcher_id, researcher, 'AUTHOR')
+    builder.node(subfield_id, topic, 'TOPIC')
+    builder.edge(researcher_id, subfield_id, "researches", "AUTHOR", "TOPIC")
     
-    total_topics = len(data['data'])
-    start = (page - 1) * per_page
-    end = start + per_page
+    rows, total_topics = page_rows(data, page, per_page)
 
-    for entry in data['data'][start:end]:
+    for entry in rows:
         work = entry['work_name']
         number = entry['num_of_citations']
         list.append((work, number))
-        nodes.append({ 'id': work, 'label': work, 'type': 'WORK' })
-        nodes.append({'id': number, 'label': number, 'type': "NUMBER"})
-        edges.append({ 'id': f"""{researcher_id}-{work}""", 'start': researcher_id, 'end': work, "label": "authored", "start_type": "AUTHOR", "end_type": "WORK"})
-        edges.append({ 'id': f"""{work}-{number}""", 'start': work, 'end': number, "label": "citedBy", "start_type": "WORK", "end_type": "NUMBER"})
+        builder.node(work, work, 'WORK')
+        builder.node(number, number, "NUMBER")
+        builder.edge(researcher_id, work, "authored", "AUTHOR", "WORK")
+        builder.edge(work, number, "citedBy", "WORK", "NUMBER")
     
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     app.logger.info(f"Successfully built result for researcher: {researcher} and topic: {topic}")
     return {"metadata": metadata, 
             "metadata_pagination": {
@@ -702,12 +2286,16 @@ def get_researcher_and_subfield_results(researcher, topic, page=1, per_page=20):
             "total_topics": total_topics,
         }, "graph": graph, "list": list}
 
-def get_institution_and_subfield_results(institution, topic, page=1, per_page=20):
+def get_institution_and_subfield_results(institution, topic, page=1, per_page=20, cursor=None):
     """
     Gets the results when user inputs an institution and subfield
     Uses database to get result, defaults to SPARQL if institution is not in database
+    A cursor from a previous page's metadata_pagination fetches the following page by keyset instead of by offset
     """
-    data = search_by_institution_topic(institution, topic)
+    cursor_search = [institution, topic]
+    after = decode_cursor(cursor, 'institution_topic', INSTITUTION_TOPIC_CURSOR_COLUMNS, cursor_search) if cursor else None
+    data, institution = search_with_closest_institution(
+        institution, lambda name: search_by_institution_topic(name, topic, page_limit=per_page, page_offset=(page - 1) * per_page, after=after))
     if data is None:
         app.logger.info("Using SPARQL for institution and topic search...")
         data = get_institution_and_topic_metadata_sparql(institution, topic)
@@ -744,29 +2332,26 @@ def get_institution_and_subfield_results(institution, topic, page=1, per_page=20
     metadata['institution_name'] = institution
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
+    builder = GraphBuilder()
     subfield_id = metadata['topic_oa_link']
     institution_id = metadata['institution_oa_link']
-    nodes.append({ 'id': subfield_id, 'label': topic, 'type': 'TOPIC' })
-    nodes.append({ 'id': institution_id, 'label': institution, 'type': 'INSTITUTION' })
-    edges.append({ 'id': f"""{institution_id}-{subfield_id}""", 'start': institution_id, 'end': subfield_id, "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"})
+    builder.node(subfield_id, topic, 'TOPIC')
+    builder.node(institution_id, institution, 'INSTITUTION')
+    builder.edge(institution_id, subfield_id, "researches", "INSTITUTION", "TOPIC")
     
-    total_topics = len(data['data'])
-    start = (page - 1) * per_page
-    end = start + per_page
+    rows, total_topics = page_rows(data, page, per_page)
 
-    for entry in data['data'][start:end]:
+    for entry in rows:
         author_id = entry['author_id']
         author_name = entry['author_name']
         number = entry['num_of_works']
         list.append((author_name, number))
-        nodes.append({ 'id': author_id, 'label': author_name, 'type': 'AUTHOR' })
-        nodes.append({ 'id': number, 'label': number, 'type': 'NUMBER' })
-        edges.append({ 'id': f"""{author_id}-{number}""", 'start': author_id, 'end': number, "label": "numWorks", "start_type": "AUTHOR", "end_type": "NUMBER"})
-        edges.append({ 'id': f"""{author_id}-{institution_id}""", 'start': author_id, 'end': institution_id, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
+        builder.node(author_id, author_name, 'AUTHOR')
+        builder.node(number, number, 'NUMBER')
+        builder.edge(author_id, number, "numWorks", "AUTHOR", "NUMBER")
+        builder.edge(author_id, institution_id, "memberOf", "AUTHOR", "INSTITUTION")
     
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     metadata['people_count'] = len(list)
     app.logger.info(f"Successfully built result for institution: {institution} and topic: {topic}")
     return {
@@ -775,6 +2360,7 @@ def get_institution_and_subfield_results(institution, topic, page=1, per_page=20
             "total_pages": (total_topics + per_page - 1) // per_page,
             "current_page": page,
             "total_topics": total_topics,
+            "next_cursor": next_page_cursor('institution_topic', rows, INSTITUTION_TOPIC_CURSOR_COLUMNS, page, per_page, total_topics, cursor_search),
         },
         "graph": graph,
         "list": list
@@ -785,7 +2371,8 @@ def get_institution_and_researcher_results(institution, researcher, page=1, per_
     Gets the results when user inputs an institution and researcher
     Uses database to get result, defaults to SPARQL if institution or researcher is not in database
     """
-    data = search_by_author_institution(researcher, institution)
+    data, institution = search_with_closest_institution(
+        institution, lambda name: search_by_author_institution(researcher, name, page_limit=per_page, page_offset=(page - 1) * per_page))
     if data is None:
         app.logger.info("Using SPARQL for institution and researcher search...")
         data = get_researcher_and_institution_metadata_sparql(researcher, institution)
@@ -818,28 +2405,24 @@ def get_institution_and_researcher_results(institution, researcher, page=1, per_
     metadata['cited_by_count'] = data['author_metadata']['num_of_citations']
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
+    builder = GraphBuilder()
     author_id = metadata['researcher_oa_link']
-    # nodes.append({ 'id': institution, 'label': institution, 'type': 'INSTITUTION' })
-    # edges.append({ 'id': f"""{author_id}-{institution}""", 'start': author_id, 'end': institution, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
-    # nodes.append({ 'id': author_id, 'label': researcher, "type": "AUTHOR"})
+    # builder.node(institution, institution, 'INSTITUTION')
+    # builder.edge(author_id, institution, "memberOf", "AUTHOR", "INSTITUTION")
+    # builder.node(author_id, researcher, "AUTHOR")
     
-    total_topics = len(data['data'])
-    start = (page - 1) * per_page
-    end = start + per_page
+    rows, total_topics = page_rows(data, page, per_page)
 
-    for entry in data['data'][start:end]:
+    for entry in rows:
         subfield = entry['topic_name']
         num_works = entry["num_of_works"]
         list.append((subfield, num_works))
-        nodes.append({'id': subfield, 'label': subfield, 'type': "SUBFIELD", 'people': (num_works / metadata['work_count']) * 100 })
-        subfield_metadata = data['subfield_metadata']
-        for topic in subfield_metadata[subfield]:
-            nodes.append({'id': topic['topic_display_name'], 'label': topic['topic_display_name'], 'type': "TOPIC"})
-            edges.append({ 'id': f"""{subfield}-{topic['topic_display_name']}""", 'start': subfield, 'end': topic['topic_display_name'], "label": "has_topic", "start_type": "SUBFIELD", "end_type": "TOPIC"})
+        builder.node(subfield, subfield, "SUBFIELD", people=(num_works / metadata['work_count']) * 100)
+        for topic in subfield_topic_index.get(subfield):
+            builder.node(topic['topic_display_name'], topic['topic_display_name'], "TOPIC")
+            builder.edge(subfield, topic['topic_display_name'], "has_topic", "SUBFIELD", "TOPIC")
 
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     app.logger.info(f"Successfully built result for researcher: {researcher} and institution: {institution}")
     return {"metadata": metadata,
             "metadata_pagination": {
@@ -854,7 +2437,8 @@ def get_institution_researcher_subfield_results(institution, researcher,
     Gets the results when user inputs an institution, researcher, and subfield
     Uses database to get result, defaults to SPARQL if institution or researcher is not in database
     """
-    data = search_by_author_institution_topic(researcher, institution, topic)
+    data, institution = search_with_closest_institution(
+        institution, lambda name: search_by_author_institution_topic(researcher, name, topic, page_limit=per_page, page_offset=(page - 1) * per_page))
     if data is None:
         app.logger.info("Using SPARQL for institution, researcher, and topic search...")
         data = get_institution_and_topic_and_researcher_metadata_sparql(institution, topic, researcher)
@@ -898,31 +2482,28 @@ def get_institution_researcher_subfield_results(institution, researcher,
     metadata['topic_oa_link'] = subfield_oa_link
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
+    builder = GraphBuilder()
     institution_id = metadata['institution_oa_link']
     researcher_id = metadata['researcher_oa_link']
     subfield_id = metadata['topic_oa_link']
-    nodes.append({ 'id': institution_id, 'label': institution, 'type': 'INSTITUTION' })
-    edges.append({ 'id': f"""{researcher_id}-{institution_id}""", 'start': researcher_id, 'end': institution_id, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
-    nodes.append({ 'id': researcher_id, 'label': researcher, 'type': 'AUTHOR' })
-    nodes.append({ 'id': subfield_id, 'label': topic, 'type': 'TOPIC' })
-    edges.append({ 'id': f"""{researcher_id}-{subfield_id}""", 'start': researcher_id, 'end': subfield_id, "label": "researches", "start_type": "AUTHOR", "end_type": "TOPIC"})
+    builder.node(institution_id, institution, 'INSTITUTION')
+    builder.edge(researcher_id, institution_id, "memberOf", "AUTHOR", "INSTITUTION")
+    builder.node(researcher_id, researcher, 'AUTHOR')
+    builder.node(subfield_id, topic, 'TOPIC')
+    builder.edge(researcher_id, subfield_id, "researches", "AUTHOR", "TOPIC")
     
-    total_topics = len(data['data'])
-    start = (page - 1) * per_page
-    end = start + per_page
+    rows, total_topics = page_rows(data, page, per_page)
 
-    for entry in data['data'][start:end]:
+    for entry in rows:
         work_name = entry['work_name']
         number = entry['cited_by_count']
         list.append((work_name, number))
-        nodes.append({ 'id': work_name, 'label': work_name, 'type': 'WORK' })
-        nodes.append({'id': number, 'label': number, 'type': "NUMBER"})
-        edges.append({ 'id': f"""{researcher_id}-{work_name}""", 'start': researcher_id, 'end': work_name, "label": "authored", "start_type": "AUTHOR", "end_type": "WORK"})
-        edges.append({ 'id': f"""{work_name}-{number}""", 'start': work_name, 'end': number, "label": "citedBy", "start_type": "WORK", "end_type": "NUMBER"})
+        builder.node(work_name, work_name, 'WORK')
+        builder.node(number, number, "NUMBER")
+        builder.edge(researcher_id, work_name, "authored", "AUTHOR", "WORK")
+        builder.edge(work_name, number, "citedBy", "WORK", "NUMBER")
     
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     app.logger.info(f"Successfully built result for researcher: {researcher}, institution: {institution}, and topic: {topic}")
 
     return {"metadata": metadata, 
@@ -937,8 +2518,10 @@ def query_SPARQL_endpoint(endpoint_url, query):
     Queries the endpoint to execute the SPARQL query.
     """
     app.logger.debug(f"Executing SPARQL query: {query}")
-    try:
-        response = requests.post(endpoint_url, data={"query": query}, headers={'Accept': 'application/json'})
+
+    def fetch():
+        # Empty results are returned as None so they are not cached
+        response = http_client.post(endpoint_url, data={"query": query}, headers={'Accept': 'application/json'}, retry=True)
         response.raise_for_status()  # Raises an HTTPError for bad responses
         data = response.json()
         return_value = []
@@ -947,12 +2530,44 @@ def query_SPARQL_endpoint(endpoint_url, query):
             for e in entry:
                 my_dict[e] = entry[e]['value']
             return_value.append(my_dict)
+        return return_value or None
+
+    try:
+        return_value = response_cache.get_or_compute('sparql', [endpoint_url, query], fetch) or []
         app.logger.info(f"SPARQL query returned {len(return_value)} results")
         return return_value
     except requests.exceptions.RequestException as e:
         app.logger.error(f"SPARQL query failed: {str(e)}")
         return []
 
+# Shared pool for the independent SemOpenAlex/OpenAlex lookups made by the SPARQL fallbacks
+metadata_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('METADATA_FANOUT_WORKERS', 8)),
+    thread_name_prefix='metadata-fanout',
+)
+METADATA_FANOUT_TIMEOUT = float(os.getenv('METADATA_FANOUT_TIMEOUT', 20))
+
+def fetch_concurrently(*calls, timeout=None):
+    """
+    Runs independent metadata lookups, given as (function, *args) tuples, on the shared pool and
+    returns their results in order. All lookups share one deadline, so the wait is bounded by the
+    slowest call rather than the sum of them, and never past the request deadline; a lookup still
+    running at the deadline counts as {}.
+    """
+    timeout = METADATA_FANOUT_TIMEOUT if timeout is None else timeout
+    timeout = min(timeout, remaining_request_time(timeout))
+    deadline = time.monotonic() + timeout
+    futures = [submit_with_budget(metadata_executor, func, *args) for func, *args in calls]
+    results = []
+    for (func, *args), future in zip(calls, futures):
+        try:
+            results.append(future.result(timeout=max(0, deadline - time.monotonic())))
+        except FuturesTimeoutError:
+            future.cancel()
+            app.logger.warning(f"{getattr(func, '__name__', func)}{tuple(args)} did not finish within {timeout}s")
+            results.append({})
+    return results
+
 def get_institution_metadata_sparql(institution):
     """
     Given an institution, queries the SemOpenAlex endpoint to retrieve metadata on the institution
@@ -997,49 +2612,164 @@ def get_institution_metadata_sparql(institution):
     app.logger.info(f"Successfully retrieved metadata for institution: {institution}")
     return metadata
 
+INSTITUTION_SUBFIELDS_MAX_AGE = int(os.getenv('INSTITUTION_SUBFIELDS_MAX_AGE', 7 * 86400))
+INSTITUTION_SUBFIELDS_LIVE_PAGES = int(os.getenv('INSTITUTION_SUBFIELDS_LIVE_PAGES', 10))
+OPENALEX_PAGE_SIZE = 200
+OPENALEX_API_KEY = os.getenv('OPENALEX_API_KEY')
+
+def iter_openalex_pages(url, params, executor, max_pages=None):
+    """
+    Streams the results of an OpenAlex list endpoint one cursor page at a time. The request for the
+    next page is sent as soon as its cursor is known, so it is in flight while the caller processes
+    the current page; pages still arrive in order.
+    """
+    def fetch(cursor):
+        response = http_client.get(url, params=dict(params, cursor=cursor, **{'per-page': OPENALEX_PAGE_SIZE}))
+        response.raise_for_status()
+        return response.json()
+
+    future = submit_with_budget(executor, fetch, '*')
+    pages = 0
+    while future is not None:
+        data = future.result()
+        results = data.get('results') or []
+        next_cursor = (data.get('meta') or {}).get('next_cursor')
+        pages += 1
+        future = None
+        if next_cursor and results and (max_pages is None or pages < max_pages):
+            future = submit_with_budget(executor, fetch, next_cursor)
+        elif next_cursor and results:
+            app.logger.warning(f"Stopped reading {url} after {pages} pages")
+        yield results
+
+def normalize_ror(ror):
+    return ror if ror.startswith('https://ror.org/') else 'https://ror.org/' + ror.rsplit('/', 1)[-1]
+
+def count_author_subfields(author):
+    """Counts an OpenAlex author's topics per subfield."""
+    counts = {}
+    for topic in author.get('topics') or []:
+        subfield = topic['subfield']['display_name']
+        counts[subfield] = counts.get(subfield, 0) + 1
+    return counts
+
+def fetch_institution_subfield_counts(ror):
+    """
+    Reads the subfield counts harvested for an institution from institution_author_subfields.
+    Returns [(subfield, count)], most first, or None when the institution has not been harvested.
+    """
+    results = execute_query("SELECT get_institution_subfield_counts(%s);", (normalize_ror(ror),))
+    if not results or results[0][0] is None:
+        return None
+    return [(subfield, count) for subfield, count in results[0][0]]
+
+def request_institution_harvest(ror):
+    """Queues an institution for the next `flask harvest-institution-subfields` run."""
+    execute_query("""
+        INSERT INTO institution_subfield_harvests (ror) VALUES (%s)
+        ON CONFLICT (ror) DO NOTHING
+        RETURNING ror;
+    """, (normalize_ror(ror),))
+
+def harvest_institution_subfields(ror, since, executor):
+    """
+    Streams every author whose last known institution is ror (only those OpenAlex updated on or
+    after the date since, when given) and stores their subfield counts page by page. A full harvest
+    also drops authors that are no longer at the institution. Returns the number of authors read.
+    """
+    ror = normalize_ror(ror)
+    started = time.time()
+    filters = f'last_known_institutions.ror:{ror}'
+    if since is not None:
+        filters += f',from_updated_date:{since.date().isoformat()}'
+    seen = []
+    params = {'filter': filters, 'select': 'id,topics,last_known_institutions'}
+    if OPENALEX_API_KEY:
+        params['api_key'] = OPENALEX_API_KEY
+    for authors in iter_openalex_pages('https://api.openalex.org/authors', params, executor):
+        rows = [{
+            'author_id': author['id'],
+            'rors': [institution.get('ror') for institution in author.get('last_known_institutions') or [] if institution.get('ror')],
+            'subfields': count_author_subfields(author),
+        } for author in authors]
+        if rows and execute_query("SELECT store_institution_author_subfields(%s, %s::jsonb);", (ror, json.dumps(rows))) is None:
+            raise RuntimeError("Could not store author subfields")
+        seen.extend(row['author_id'] for row in rows)
+    if execute_query("SELECT finish_institution_harvest(%s, to_timestamp(%s), %s);",
+                     (ror, started, seen if since is None else None)) is None:
+        raise RuntimeError("Could not record the harvest")
+    return len(seen)
+
+@app.cli.command('harvest-institution-subfields')
+@click.option('--ror', 'rors', multiple=True, help='Institution to harvest (ROR id or URL); repeat for several. '
+              'Defaults to every institution that was searched for and is not harvested yet or older than --max-age.')
+@click.option('--max-age', type=int, default=INSTITUTION_SUBFIELDS_MAX_AGE, show_default=True,
+              help='Seconds after which a harvested institution is refreshed.')
+@click.option('--full', is_flag=True, help='Re-read every author instead of only those OpenAlex updated since the last harvest.')
+def harvest_institution_subfields_command(rors, max_age, full):
+    """
+    Harvests the subfields of the authors at each institution from OpenAlex into
+    institution_author_subfields, which list_given_institution reads instead of paging through
+    OpenAlex during a search. Institutions harvested before only fetch authors updated since then,
+    unless --full is given or OPENALEX_API_KEY is not set (OpenAlex only allows from_updated_date
+    with a key). Safe to stop and rerun.
+    """
+    rows = execute_query("SELECT * FROM get_institution_harvests_due(%s, make_interval(secs => %s));",
+                         ([normalize_ror(ror) for ror in rors] or None, max_age))
+    if rows is None:
+        raise click.ClickException("Could not read institutions from the database")
+    if not full and not OPENALEX_API_KEY:
+        click.echo("OPENALEX_API_KEY is not set, so every author is re-read")
+        full = True
+    failed = 0
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='openalex-pages') as executor:
+        for ror, harvested_at in rows:
+            try:
+                authors = harvest_institution_subfields(ror, None if full else harvested_at, executor)
+            except Exception as e:
+                failed += 1
+                click.echo(f"{ror}: failed: {str(e)}")
+                continue
+            click.echo(f"{ror}: {authors} authors {'read' if full or harvested_at is None else 'updated'}")
+    click.echo(f"Done: {len(rows) - failed} institutions harvested, {failed} failed")
+    if failed:
+        raise click.ClickException(f"{failed} institutions could not be harvested")
+
 def list_given_institution(ror, name, id):
     """
-    Uses OpenAlex to determine the subfields which a given institution study.
-    Must iterate through all authors related to the institution and determine what topics OA attributes to them.
+    Uses OpenAlex to determine the subfields which a given institution study, counting the topics
+    OpenAlex attributes to the authors whose last known institution it is.
+    Reads the counts harvested by `flask harvest-institution-subfields`. An institution that has not
+    been harvested yet is queued for the next harvest and counted from the first
+    INSTITUTION_SUBFIELDS_LIVE_PAGES pages of its authors instead.
     """
     app.logger.debug(f"Fetching subfields for institution: {name} (ROR: {ror})")
-    final_subfield_count = {}
-    headers = {'Accept': 'application/json'}
-    response = requests.get(f'https://api.openalex.org/authors?per-page=200&filter=last_known_institutions.ror:{ror}&cursor=*', headers=headers)
-    data = response.json()
-    authors = data['results']
-    next_page = data['meta']['next_cursor']
-    counter = 0
-    
-    app.logger.debug("Processing authors and their topics")
-    while next_page is not None and counter < 10:
-        for a in authors:
-            topics = a['topics']
-            for topic in topics:
-                if topic['subfield']['display_name'] in final_subfield_count:
-                    final_subfield_count[topic['subfield']['display_name']] += 1
-                else:
-                    final_subfield_count[topic['subfield']['display_name']] = 1
-        response = requests.get(f'https://api.openalex.org/authors?per-page=200&filter=last_known_institutions.ror:{ror}&cursor=' + next_page, headers=headers)
-        data = response.json()
-        authors = data['results']
-        next_page = data['meta']['next_cursor']
-        counter += 1
-    
-    sorted_subfields = sorted([(k, v) for k, v in final_subfield_count.items() if v > 5], key=lambda x: x[1], reverse=True)
+    subfield_counts = fetch_institution_subfield_counts(ror)
+    if subfield_counts is None:
+        app.logger.info(f"{ror} has not been harvested yet, reading its authors from OpenAlex")
+        request_institution_harvest(ror)
+        final_subfield_count = {}
+        params = {'filter': f'last_known_institutions.ror:{ror}', 'select': 'id,topics'}
+        for authors in iter_openalex_pages('https://api.openalex.org/authors', params, metadata_executor,
+                                           max_pages=INSTITUTION_SUBFIELDS_LIVE_PAGES):
+            for author in authors:
+                for subfield, count in count_author_subfields(author).items():
+                    final_subfield_count[subfield] = final_subfield_count.get(subfield, 0) + count
+        subfield_counts = final_subfield_count.items()
+
+    sorted_subfields = sorted([(k, v) for k, v in subfield_counts if v > 5], key=lambda x: x[1], reverse=True)
     app.logger.info(f"Found {len(sorted_subfields)} subfields with more than 5 authors")
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
-    nodes.append({ 'id': id, 'label': name, 'type': 'INSTITUTION' })
+    builder = GraphBuilder()
+    builder.node(id, name, 'INSTITUTION')
     for subfield, number in sorted_subfields:
-        nodes.append({'id': subfield, 'label': subfield, 'type': "TOPIC"})
+        builder.node(subfield, subfield, "TOPIC")
         number_id = subfield + ":" + str(number)
-        nodes.append({'id': number_id, 'label': number, 'type': "NUMBER"})
-        edges.append({ 'id': f"""{id}-{subfield}""", 'start': id, 'end': subfield, "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"})
-        edges.append({ 'id': f"""{subfield}-{number_id}""", 'start': subfield, 'end': number_id, "label": "number", "start_type": "TOPIC", "end_type": "NUMBER"})
-    graph = {"nodes": nodes, "edges": edges}
+        builder.node(number_id, number, "NUMBER")
+        builder.edge(id, subfield, "researches", "INSTITUTION", "TOPIC")
+        builder.edge(subfield, number_id, "number", "TOPIC", "NUMBER")
+    graph = builder.to_dict()
 
     app.logger.info(f"Successfully built subfield list and graph for institution: {name}")
     return sorted_subfields, graph
@@ -1086,8 +2816,10 @@ def get_researcher_and_institution_metadata_sparql(researcher, institution):
     institution_name, researcher_name, homepage, institution_oa_link, researcher_oa_link, orcid, work_count, cited_by_count, ror
   """
 
-  researcher_data = get_author_metadata_sparql(researcher)
-  institution_data = get_institution_metadata_sparql(institution)
+  researcher_data, institution_data = fetch_concurrently(
+    (get_author_metadata_sparql, researcher),
+    (get_institution_metadata_sparql, institution),
+  )
   if researcher_data == {} or institution_data == {}:
     return {}
 
@@ -1114,7 +2846,7 @@ def list_given_researcher_institution(id, name, institution):
     search_id = id.replace('https://openalex.org/authors/', '')
     
     app.logger.debug(f"Fetching author data from OpenAlex for ID: {search_id}")
-    response = requests.get(f'https://api.openalex.org/authors/{search_id}', headers=headers)
+    response = http_client.get(f'https://api.openalex.org/authors/{search_id}', headers=headers)
     data = response.json()
     topics = data['topics']
     
@@ -1128,19 +2860,18 @@ def list_given_researcher_institution(id, name, institution):
     app.logger.debug(f"Found {len(sorted_subfields)} subfields for researcher")
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
-    nodes.append({ 'id': institution, 'label': institution, 'type': 'INSTITUTION' })
-    edges.append({ 'id': f"""{id}-{institution}""", 'start': id, 'end': institution, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
-    nodes.append({ 'id': id, 'label': name, "type": "AUTHOR"})
+    builder = GraphBuilder()
+    builder.node(institution, institution, 'INSTITUTION')
+    builder.edge(id, institution, "memberOf", "AUTHOR", "INSTITUTION")
+    builder.node(id, name, "AUTHOR")
     
     for s, number in sorted_subfields:
-        nodes.append({'id': s, 'label': s, 'type': "TOPIC"})
+        builder.node(s, s, "TOPIC")
         number_id = s + ":" + str(number)
-        nodes.append({'id': number_id, 'label': number, 'type': "NUMBER"})
-        edges.append({ 'id': f"""{id}-{s}""", 'start': id, 'end': s, "label": "researches", "start_type": "AUTHOR", "end_type": "TOPIC"})
-        edges.append({ 'id': f"""{s}-{number_id}""", 'start': s, 'end': number_id, "label": "number", "start_type": "TOPIC", "end_type": "NUMBER"})
-    graph = {"nodes": nodes, "edges": edges}
+        builder.node(number_id, number, "NUMBER")
+        builder.edge(id, s, "researches", "AUTHOR", "TOPIC")
+        builder.edge(s, number_id, "number", "TOPIC", "NUMBER")
+    graph = builder.to_dict()
 
     app.logger.info(f"Successfully built list and graph for researcher: {name} at institution: {institution}")
     return sorted_subfields, graph
@@ -1158,7 +2889,7 @@ def get_subfield_metadata_sparql(subfield):
     name, topic_clusters, cited_by_count, work_count, researchers, oa_link
   """
   headers = {'Accept': 'application/json'}
-  response = requests.get(f'https://api.openalex.org/subfields?filter=display_name.search:{subfield}', headers=headers) 
+  response = http_client.get(f'https://api.openalex.org/subfields?filter=display_name.search:{subfield}', headers=headers) 
   data = response.json()['results'][0]
   oa_link = data['id']
   cited_by_count = data['cited_by_count']
@@ -1172,50 +2903,32 @@ def get_subfield_metadata_sparql(subfield):
 def list_given_topic(subfield, id):
   """
   When an user searches for a topic only.
-  Searches through each HBCU and partner institution and returns which institutions research the subfield.
+  Returns which HBCU and partner institutions research the subfield, with their work counts read
+  from search_by_topic_data_mv in one query.
 
   Parameters:
   subfield : name of subfield searched
   id : id of the subfield
 
   Returns:
-  subfield_list : the subfields which OpenAlex attributes to a given institution
+  subfield_list : (institution, number of works in the subfield) pairs, most works first
   graph : a graphical representation of subfield_list.
   """
-  headers = {'Accept': 'application/json'}
-  subfield_list = []
-  extra_metadata = {}
-  total_work_count = 0
-
-  for institution in autofill_inst_list:
-    response = requests.get(f'https://api.openalex.org/institutions?select=display_name,topics&filter=display_name.search:{institution}', headers=headers)
-    try:
-      data = response.json()
-      data = data['results'][0]
-      inst_topics = data['topics']
-      count = 0
-      for t in inst_topics:
-        if t['subfield']['display_name'] == subfield:
-          count = count + t['count']
-          total_work_count = total_work_count + t['count']
-      if count > 0:
-        subfield_list.append((institution, count))
-    except:  # noqa: E722
-      continue
-
-  subfield_list.sort(key=lambda x: x[1], reverse=True)
-  extra_metadata['work_count'] = total_work_count
-
-  nodes = []
-  edges = []
-  nodes.append({ 'id': id, 'label': subfield, 'type': 'TOPIC' })
+  results = execute_query(
+    "SELECT institution_name, num_of_works FROM get_subfield_institution_work_counts(%s, %s);",
+    (subfield, autofill_inst_list))
+  subfield_list = [(institution, int(count)) for institution, count in results or [] if count]
+  extra_metadata = {'work_count': sum(count for _, count in subfield_list)}
+
+  builder = GraphBuilder()
+  builder.node(id, subfield, 'TOPIC')
   for i, c in subfield_list:
     if not c == 0:
-      nodes.append({ 'id': i, 'label': i, 'type': 'INSTITUTION' })
-      nodes.append({'id': c, 'label': c, 'type': "NUMBER"})
-      edges.append({ 'id': f"""{i}-{id}""", 'start': i, 'end': id, "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"})
-      edges.append({ 'id': f"""{i}-{c}""", 'start': i, 'end': c, "label": "number", "start_type": "INSTITUTION", "end_type": "NUMBER"})
-  graph = {"nodes": nodes, "edges": edges}
+      builder.node(i, i, 'INSTITUTION')
+      builder.node(c, c, "NUMBER")
+      builder.edge(i, id, "researches", "INSTITUTION", "TOPIC")
+      builder.edge(i, c, "number", "INSTITUTION", "NUMBER")
+  graph = builder.to_dict()
   return subfield_list, graph, extra_metadata
 
 def get_institution_and_topic_metadata_sparql(institution, topic):
@@ -1226,8 +2939,10 @@ def get_institution_and_topic_metadata_sparql(institution, topic):
   metadata : information on the topic and institution as a dictionary with the following keys:
     institution_name, topic_name, work_count, cited_by_count, ror, topic_clusters, people_count, topic_oa_link, institution_oa_link, homepage
   """
-  institution_data = get_institution_metadata_sparql(institution)
-  topic_data = get_subfield_metadata_sparql(topic)
+  institution_data, topic_data = fetch_concurrently(
+    (get_institution_metadata_sparql, institution),
+    (get_subfield_metadata_sparql, topic),
+  )
   if topic_data == {} or institution_data == {}:
     return {}
 
@@ -1277,19 +2992,18 @@ def list_given_institution_topic(institution, institution_id, topic, topic_id):
     num_people = len(final_list)
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
-    nodes.append({ 'id': topic_id, 'label': topic, 'type': 'TOPIC' })
-    nodes.append({ 'id': institution_id, 'label': institution, 'type': 'INSTITUTION' })
-    edges.append({ 'id': f"""{institution_id}-{topic_id}""", 'start': institution_id, 'end': topic_id, "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"})
+    builder = GraphBuilder()
+    builder.node(topic_id, topic, 'TOPIC')
+    builder.node(institution_id, institution, 'INSTITUTION')
+    builder.edge(institution_id, topic_id, "researches", "INSTITUTION", "TOPIC")
     
     for author, name, num_works in works_list:
-        nodes.append({ 'id': author, 'label': name, 'type': 'AUTHOR' })
-        nodes.append({ 'id': num_works, 'label': num_works, 'type': 'NUMBER' })
-        edges.append({ 'id': f"""{author}-{institution_id}""", 'start': author, 'end': institution_id, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
-        edges.append({ 'id': f"""{author}-{num_works}""", 'start': author, 'end': num_works, "label": "numWorks", "start_type": "AUTHOR", "end_type": "NUMBER"})
+        builder.node(author, name, 'AUTHOR')
+        builder.node(num_works, num_works, 'NUMBER')
+        builder.edge(author, institution_id, "memberOf", "AUTHOR", "INSTITUTION")
+        builder.edge(author, num_works, "numWorks", "AUTHOR", "NUMBER")
     
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     extra_metadata = {"work_count": work_count, "num_people": num_people}
     
     app.logger.info(f"Successfully built list and graph for institution: {institution} and topic: {topic}")
@@ -1304,8 +3018,10 @@ def get_topic_and_researcher_metadata_sparql(topic, researcher):
     researcher_name, topic_name, orcid, current_institution, work_count, cited_by_count, topic_clusters, researcher_oa_link, topic_oa_link
   """
 
-  researcher_data = get_author_metadata_sparql(researcher)
-  topic_data = get_subfield_metadata_sparql(topic)
+  researcher_data, topic_data = fetch_concurrently(
+    (get_author_metadata_sparql, researcher),
+    (get_subfield_metadata_sparql, topic),
+  )
   if researcher_data == {} or topic_data == {}:
     return {}
 
@@ -1349,21 +3065,20 @@ def list_given_researcher_topic(topic, researcher, institution, topic_id, resear
     work_list.sort(key=lambda x: x[1], reverse=True)
 
     app.logger.debug("Building graph structure")
-    nodes = []
-    edges = []
-    nodes.append({ 'id': institution_id, 'label': institution, 'type': 'INSTITUTION' })
-    edges.append({ 'id': f"""{researcher_id}-{institution_id}""", 'start': researcher_id, 'end': institution_id, "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"})
-    nodes.append({ 'id': researcher_id, 'label': researcher, 'type': 'AUTHOR' })
-    nodes.append({ 'id': topic_id, 'label': topic, 'type': 'TOPIC' })
-    edges.append({ 'id': f"""{researcher_id}-{topic_id}""", 'start': researcher_id, 'end': topic_id, "label": "researches", "start_type": "AUTHOR", "end_type": "TOPIC"})
+    builder = GraphBuilder()
+    builder.node(institution_id, institution, 'INSTITUTION')
+    builder.edge(researcher_id, institution_id, "memberOf", "AUTHOR", "INSTITUTION")
+    builder.node(researcher_id, researcher, 'AUTHOR')
+    builder.node(topic_id, topic, 'TOPIC')
+    builder.edge(researcher_id, topic_id, "researches", "AUTHOR", "TOPIC")
     
     for work, number in work_list:
-        nodes.append({ 'id': work, 'label': work, 'type': 'WORK' })
-        nodes.append({'id': number, 'label': number, 'type': "NUMBER"})
-        edges.append({ 'id': f"""{researcher_id}-{work}""", 'start': researcher_id, 'end': work, "label": "authored", "start_type": "AUTHOR", "end_type": "WORK"})
-        edges.append({ 'id': f"""{work}-{number}""", 'start': work, 'end': number, "label": "citedBy", "start_type": "WORK", "end_type": "NUMBER"})
+        builder.node(work, work, 'WORK')
+        builder.node(number, number, "NUMBER")
+        builder.edge(researcher_id, work, "authored", "AUTHOR", "WORK")
+        builder.edge(work, number, "citedBy", "WORK", "NUMBER")
     
-    graph = {"nodes": nodes, "edges": edges}
+    graph = builder.to_dict()
     extra_metadata = {"work_count": len(work_list), "cited_by_count": total_citations}
     
     app.logger.info(f"Successfully built list and graph for researcher: {researcher} and topic: {topic}")
@@ -1375,9 +3090,11 @@ def get_institution_and_topic_and_researcher_metadata_sparql(institution, topic,
     """
     app.logger.debug(f"Fetching metadata for institution: {institution}, topic: {topic}, researcher: {researcher}")
 
-    institution_data = get_institution_metadata_sparql(institution)
-    topic_data = get_subfield_metadata_sparql(topic)
-    researcher_data = get_author_metadata_sparql(researcher)
+    institution_data, topic_data, researcher_data = fetch_concurrently(
+        (get_institution_metadata_sparql, institution),
+        (get_subfield_metadata_sparql, topic),
+        (get_author_metadata_sparql, researcher),
+    )
     
     if researcher_data == {} or institution_data == {} or topic_data == {}:
         app.logger.warning("Missing metadata from one or more entities")
@@ -1430,14 +3147,13 @@ def query_SQL_endpoint(connection, query):
 def autofill_institutions():
     """
     Handles autofill for institutions.
+    Returns up to limit (default AUTOFILL_DEFAULT_LIMIT) ranked suggestions from institution_autocomplete.
     """
     inst = request.json.get('institution')
+    limit = parse_autofill_limit(request.json.get('limit', AUTOFILL_DEFAULT_LIMIT))
     app.logger.debug(f"Processing institution autofill for: {inst}")
     
-    possible_searches = []
-    for i in autofill_inst_list:
-        if inst.lower() in i.lower():
-            possible_searches.append(i)
+    possible_searches = institution_autocomplete.search(inst, limit)
     
     app.logger.info(f"Found {len(possible_searches)} matching institutions for '{inst}'")
     return {"possible_searches": possible_searches}
@@ -1446,38 +3162,23 @@ def autofill_institutions():
 def autofill_topics():
     """
     Handles autofill for topics.
+    Returns up to limit (default AUTOFILL_DEFAULT_LIMIT) ranked suggestions from topic_autocomplete,
+    which holds the subfields (or the keywords when SUBFIELDS is False).
     """
     topic = request.json.get('topic')
+    limit = parse_autofill_limit(request.json.get('limit', AUTOFILL_DEFAULT_LIMIT))
     app.logger.debug(f"Processing topic autofill for: {topic}")
     
-    possible_searches = []
-    if len(topic) > 0:
-        if SUBFIELDS:
-            for i in autofill_subfields_list:
-                if topic.lower() in i.lower():
-                    possible_searches.append(i)
-        else:
-            for i in autofill_topics_list:
-                if topic.lower() in i.lower():
-                    possible_searches.append(i)
+    possible_searches = topic_autocomplete.search(topic, limit)
     
     app.logger.info(f"Found {len(possible_searches)} matching topics for '{topic}'")
     return {"possible_searches": possible_searches}
 
-@app.route('/get-default-graph', methods=['POST'])
-def get_default_graph():
+def prune_default_graph(graph):
     """
-    Returns the default graph.
+    Keeps, for every start node, only the edges with its highest connecting_works, and drops the
+    topic nodes no remaining edge points to.
     """
-    app.logger.debug("Loading default graph from file")
-    try:
-        with open("default.json", "r") as file:
-            graph = json.load(file)
-    except Exception as e:
-        app.logger.error(f"Failed to load default graph: {str(e)}")
-        return {"error": "Failed to load default graph"}
-
-    app.logger.debug("Processing default graph data")
     nodes = []
     edges = []
     cur_nodes = graph['nodes']
@@ -1506,11 +3207,82 @@ def get_default_graph():
         else:
             nodes.append(node)
     
-    final_graph = {"nodes": nodes, "edges": edges}
-    #count = sum(1 for a in cur_nodes if a['type'] == "INSTITUTION")
-    
-    app.logger.info(f"Successfully processed default graph with {len(nodes)} nodes and {len(edges)} edges")
-    return {"graph": final_graph}
+    return {"nodes": nodes, "edges": edges}
+
+class PrecomputedGraph:
+    """
+    The pruned default graph, serialized once and kept in memory with its compressed variants.
+
+    The source file is read and pruned on first use and again only when its modification time
+    changes. Each variant (identity plus every encoding from load_compressors) has its own strong
+    ETag so browsers can revalidate with If-None-Match instead of downloading the graph again. A failed load raises and is retried on the next request.
+    """
+
+    def __init__(self, path, build):
+        self.path = path
+        self._build = build
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._variants = None
+
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _compress(self, body):
+        variants = {'identity': body}
+        for encoding, compress in load_compressors(best=True).items():
+            variants[encoding] = compress(body)
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        return {encoding: (data, f"{etag}-{encoding}") for encoding, data in variants.items()}
+
+    def variants(self):
+        """Returns {content_encoding: (body, etag)}."""
+        mtime = self._mtime()
+        with self._lock:
+            if self._variants is None or mtime != self._loaded_mtime:
+                with open(self.path, "r") as file:
+                    graph = json.load(file)
+                body = json.dumps({"graph": self._build(graph)}, separators=(',', ':')).encode('utf-8')
+                self._variants = self._compress(body)
+                self._loaded_mtime = mtime
+                app.logger.info(f"Precomputed {self.path}: {len(body)} bytes, variants {sorted(self._variants)}")
+            return self._variants
+
+    def response(self, req, max_age):
+        """Builds the response for req, picking the best encoding it accepts and answering 304 when its ETag still matches."""
+        variants = self.variants()
+        encoding = req.accept_encodings.best_match([e for e in variants if e != 'identity']) or 'identity'
+        body, etag = variants[encoding]
+        response = Response(body, mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        response.set_etag(etag)
+        return response.make_conditional(req)
+
+DEFAULT_GRAPH_MAX_AGE = int(os.getenv('DEFAULT_GRAPH_MAX_AGE', 3600))
+default_graph = PrecomputedGraph("default.json", prune_default_graph)
+
+@app.route('/get-default-graph', methods=['GET', 'POST'])
+def get_default_graph():
+    """
+    Returns the default graph.
+    The pruned graph is computed once per version of default.json and served pre-serialized, with
+    ETag and Cache-Control headers and precompressed encodings; GET requests can be revalidated with If-None-Match.
+    """
+    try:
+        response = default_graph.response(request, DEFAULT_GRAPH_MAX_AGE)
+    except Exception as e:
+        app.logger.error(f"Failed to load default graph: {str(e)}")
+        return {"error": "Failed to load default graph"}
+
+    app.logger.info(f"Served default graph ({response.status_code}, {response.headers.get('Content-Encoding', 'identity')})")
+    return response
 
 @app.route('/get-topic-space-default-graph', methods=['POST'])
 def get_topic_space():
@@ -1530,110 +3302,124 @@ def get_topic_space():
     app.logger.info("Successfully built topic space default graph")
     return {"graph": graph}
 
+class TopicSpaceIndex:
+    """
+    Inverted index over the topic space graph in topic_default.json, used by /search-topic-space.
+
+    The file is parsed on first use and again only when its modification time changes. Every topic
+    label, subfield, field and domain name and each keyword maps to the positions of the topics it
+    matches, and the nodes and edges each topic contributes are built once, so a search only touches
+    its matches. A failed load raises and is retried on the next search.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded_mtime = None
+        self._terms = None
+        self._additions = None
+
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _build(self, graph):
+        terms = {}
+        additions = []
+        for position, node in enumerate(graph['nodes']):
+            for term in (node['label'], node['subfield_name'], node['field_name'], node['domain_name'],
+                         *node['keywords'].split("; ")):
+                terms.setdefault(term, set()).add(position)
+            node_additions = [
+                {
+                    'id': node['id'],
+                    'label': node['label'],
+                    'type': 'TOPIC',
+                    "keywords": node['keywords'],
+                    "summary": node['summary'],
+                    "wikipedia_url": node['wikipedia_url']
+                },
+                {"id": node["subfield_id"], 'label': node['subfield_name'], 'type': 'SUBFIELD'},
+                {"id": node["field_id"], 'label': node['field_name'], 'type': 'FIELD'},
+                {"id": node["domain_id"], 'label': node['domain_name'], 'type': 'DOMAIN'},
+            ]
+            edge_additions = [
+                {
+                    'id': f"""{node['id']}-{node['subfield_id']}""",
+                    'start': node['id'],
+                    'end': node['subfield_id'],
+                    "label": "hasSubfield",
+                    "start_type": "TOPIC",
+                    "end_type": "SUBFIELD"
+                },
+                {
+                    'id': f"""{node['subfield_id']}-{node['field_id']}""",
+                    'start': node['subfield_id'],
+                    'end': node['field_id'],
+                    "label": "hasField",
+                    "start_type": "SUBFIELD",
+                    "end_type": "FIELD"
+                },
+                {
+                    'id': f"""{node['field_id']}-{node['domain_id']}""",
+                    'start': node['field_id'],
+                    'end': node['domain_id'],
+                    "label": "hasDomain",
+                    "start_type": "FIELD",
+                    "end_type": "DOMAIN"
+                },
+            ]
+            additions.append((node_additions, edge_additions))
+        return {term: tuple(sorted(positions)) for term, positions in terms.items()}, additions
+
+    def _current(self):
+        mtime = self._mtime()
+        with self._lock:
+            if self._terms is None or mtime != self._loaded_mtime:
+                with open(self.path, 'r') as file:
+                    graph = json.load(file)
+                self._terms, self._additions = self._build(graph)
+                self._loaded_mtime = mtime
+                app.logger.info(f"Loaded topic space index with {len(self._additions)} topics")
+            return self._terms, self._additions
+
+    def search(self, term):
+        """Returns the matching topics with their subfield, field and domain as {"nodes", "edges"}, in file order."""
+        terms, additions = self._current()
+        nodes, edges = [], []
+        seen_nodes, seen_edges = set(), set()
+        for position in terms.get(term, ()):
+            node_additions, edge_additions = additions[position]
+            for node in node_additions:
+                if (node['type'], node['id']) not in seen_nodes:
+                    seen_nodes.add((node['type'], node['id']))
+                    nodes.append(node)
+            for edge in edge_additions:
+                if edge['id'] not in seen_edges:
+                    seen_edges.add(edge['id'])
+                    edges.append(edge)
+        return {"nodes": nodes, "edges": edges}
+
+topic_space_index = TopicSpaceIndex('topic_default.json')
+
 @app.route('/search-topic-space', methods=['POST'])
 def search_topic_space():
     """
     API call for searches from the user when searching the topic space.
+    Topics match when the search equals their label, subfield, field or domain name, or one of their keywords.
     """
     search = request.json.get('topic')
     app.logger.debug(f"Searching topic space for: {search}")
     
     try:
-        with open('topic_default.json', 'r') as file:
-            graph = json.load(file)
+        final_graph = topic_space_index.search(search)
     except Exception as e:
         app.logger.error(f"Failed to load topic space data: {str(e)}")
         return {"error": "Failed to load topic space data"}
 
-    nodes = []
-    edges = []
-    matches_found = 0
-    
-    app.logger.debug("Processing topic space search results")
-    for node in graph['nodes']:
-        if (node['label'] == search or 
-            node['subfield_name'] == search or 
-            node['field_name'] == search or 
-            node['domain_name'] == search or 
-            search in node['keywords'].split("; ")):
-            
-            matches_found += 1
-            node_additions = []
-            edge_additions = []
-            
-            # Add topic node
-            topic_node = {
-                'id': node['id'],
-                'label': node['label'],
-                'type': 'TOPIC',
-                "keywords": node['keywords'],
-                "summary": node['summary'],
-                "wikipedia_url": node['wikipedia_url']
-            }
-            node_additions.append(topic_node)
-            
-            # Add hierarchy nodes
-            subfield_node = {
-                "id": node["subfield_id"],
-                'label': node['subfield_name'],
-                'type': 'SUBFIELD'
-            }
-            node_additions.append(subfield_node)
-            
-            field_node = {
-                "id": node["field_id"],
-                'label': node['field_name'],
-                'type': 'FIELD'
-            }
-            node_additions.append(field_node)
-            
-            domain_node = {
-                "id": node["domain_id"],
-                'label': node['domain_name'],
-                'type': 'DOMAIN'
-            }
-            node_additions.append(domain_node)
-            
-            # Add hierarchy edges
-            topic_subfield = {
-                'id': f"""{node['id']}-{node['subfield_id']}""",
-                'start': node['id'],
-                'end': node['subfield_id'],
-                "label": "hasSubfield",
-                "start_type": "TOPIC",
-                "end_type": "SUBFIELD"
-            }
-            edge_additions.append(topic_subfield)
-            
-            subfield_field = {
-                'id': f"""{node['subfield_id']}-{node['field_id']}""",
-                'start': node['subfield_id'],
-                'end': node['field_id'],
-                "label": "hasField",
-                "start_type": "SUBFIELD",
-                "end_type": "FIELD"
-            }
-            edge_additions.append(subfield_field)
-            
-            field_domain = {
-                'id': f"""{node['field_id']}-{node['domain_id']}""",
-                'start': node['field_id'],
-                'end': node['domain_id'],
-                "label": "hasDomain",
-                "start_type": "FIELD",
-                "end_type": "DOMAIN"
-            }
-            edge_additions.append(field_domain)
-            
-            # Add unique nodes and edges
-            for a in node_additions:
-                if a not in nodes:
-                    nodes.append(a)
-            for a in edge_additions:
-                if a not in edges:
-                    edges.append(a)
-
-    final_graph = {"nodes": nodes, "edges": edges}
+    matches_found = sum(1 for node in final_graph['nodes'] if node['type'] == 'TOPIC')
     app.logger.info(f"Found {matches_found} matches in topic space for '{search}'")
     return {'graph': final_graph}
 
@@ -1810,12 +3596,47 @@ def get_institutions_r_and_d(institution_name):
     app.logger.info(f"No MUP R&D datafound for {institution_name}")
     return None
 
+def keep_first(existing, new):
+  return existing
+
+def keep_last(existing, new):
+  return new
+
+def fill_missing(existing, new):
+  """Keeps the existing attributes and adds the ones it lacks (or has as None) from the new element."""
+  missing = {key: value for key, value in new.items() if existing.get(key) is None and value is not None}
+  return {**existing, **missing} if missing else existing
+
+GRAPH_MERGE_POLICIES = {'first': keep_first, 'last': keep_last, 'fill': fill_missing}
+
+def merge_graphs(graphs, policy='first'):
+  """
+  Merges an iterable of {nodes: [], edges: []} graphs into one, in a single pass over each graph.
+
+  Nodes are matched on id and edges on (start, end, label), so dicts with the same key but different
+  attributes, key order or unhashable values are still merged. policy decides what a repeated node or
+  edge keeps: 'first' (default), 'last', 'fill' (the first one, with attributes it lacks filled in from
+  later ones) or a function (existing, new) -> merged. Elements keep the position they were first
+  seen at, and the input dicts are never modified. Missing or empty graphs are skipped.
+  """
+  merge = GRAPH_MERGE_POLICIES[policy] if isinstance(policy, str) else policy
+  nodes = {}
+  edges = {}
+  for graph in graphs:
+    if not graph:
+      continue
+    for node in graph.get('nodes') or ():
+      key = node['id']
+      existing = nodes.get(key)
+      nodes[key] = node if existing is None else merge(existing, node)
+    for edge in graph.get('edges') or ():
+      key = (edge['start'], edge['end'], edge.get('label'))
+      existing = edges.get(key)
+      edges[key] = edge if existing is None else merge(existing, edge)
+  return {"nodes": list(nodes.values()), "edges": list(edges.values())}
+
 def combine_graphs(graph1, graph2):
-  dup_nodes = graph1['nodes'] + graph2['nodes']
-  dup_edges = graph1['edges'] + graph2['edges']
-  final_nodes = list({tuple(d.items()): d for d in dup_nodes}.values())
-  final_edges = list({tuple(d.items()): d for d in dup_edges}.values())
-  return {"nodes": final_nodes, "edges": final_edges}
+  return merge_graphs((graph1, graph2))
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -10,7 +10,19 @@ It covers the following endpoints:
   - /get-default-graph: Assesses the loading and processing of the default graph JSON.
   - /get-topic-space-default-graph: Evaluates the construction of the topic-space graph.
 """
-from backend.app import app, combine_graphs
+import gzip
+import json
+import os
+import time
+
+from backend.app import (
+    PrecomputedGraph,
+    TopicSpaceIndex,
+    app,
+    combine_graphs,
+    fetch_institution_geo_batch,
+    prune_default_graph,
+)
 from unittest.mock import patch, MagicMock, mock_open
 import pytest
 
@@ -236,6 +248,56 @@ def test_get_topic_space_default_graph_error(mock_json_load, client):
     # If the code never uses json.load, we expect a normal suitable response
     # but we allow for the classless 500 in case something else fails.
 
+DEFAULT_GRAPH = {
+    "nodes": [
+        {"id": "I1", "type": "INSTITUTION"},
+        {"id": "T1", "type": "TOPIC"},
+        {"id": "T2", "type": "TOPIC"},
+    ],
+    "edges": [
+        {"start": "I1", "end": "T1", "connecting_works": 5},
+        {"start": "I1", "end": "T2", "connecting_works": 2},
+    ],
+}
+
+
+@pytest.fixture
+def default_graph_file(tmp_path, monkeypatch):
+    path = tmp_path / "default.json"
+    path.write_text(json.dumps(DEFAULT_GRAPH))
+    monkeypatch.setattr("backend.app.default_graph", PrecomputedGraph(str(path), prune_default_graph))
+    return path
+
+
+def test_default_graph_is_pruned_once_and_revalidated(client, default_graph_file):
+    """ The default graph keeps only each start node's strongest edges, is parsed from disk once for any number of requests, and carries an ETag and Cache-Control header so that a GET with a matching If-None-Match is answered with an empty 304. """
+    first = client.get("/get-default-graph")
+    assert first.status_code == 200
+    assert first.get_json() == {"graph": {
+        "nodes": [{"id": "I1", "type": "INSTITUTION"}, {"id": "T1", "type": "TOPIC"}],
+        "edges": [{"start": "I1", "end": "T1", "connecting_works": 5}],
+    }}
+    assert "max-age=" in first.headers["Cache-Control"]
+    etag = first.headers["ETag"]
+
+    with patch("backend.app.json.load", side_effect=AssertionError("default.json should not be parsed again")):
+        again = client.get("/get-default-graph", headers={"If-None-Match": etag})
+        posted = client.post("/get-default-graph", json={})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert posted.get_json() == first.get_json()
+
+
+def test_default_graph_is_served_gzipped(client, default_graph_file):
+    """ A client that accepts gzip gets the precompressed variant, with its own ETag and a Vary header so caches keep the encodings apart. """
+    plain = client.get("/get-default-graph")
+    zipped = client.get("/get-default-graph", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert zipped.headers["Vary"] == "Accept-Encoding"
+    assert zipped.headers["ETag"] != plain.headers["ETag"]
+    assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
+
+
 ###############################################################################
 # /search-topic-space ENDPOINT TESTS
 ###############################################################################
@@ -286,7 +348,7 @@ def test_mup_sat_scores_success(client, mocker):
 ###############################################################################
 
 
-@patch("backend.app.requests.get")
+@patch("backend.app.http_client.get")
 def test_geo_info_success(mock_get, client):
     """ This test focuses on exercising lines 383–385 in the `get_geo_info` endpoint, which handle a successful external API call: after stripping the OpenAlex link, it makes a `requests.get`, checks that the status isn’t 404, pulls out `data = response.json()`, and then, when `data` is non-`None`, logs success and returns `data['geo']`. By patching `requests.get` to return a 200 response with a known `geo` payload, and then posting to `/geo_info` via the `client` fixture, the test confirms that the handler correctly extracts and returns the nested geography fields—thereby verifying that those exact lines properly unpack and forward the API’s JSON. """
     mock_response = MagicMock()
@@ -310,7 +372,7 @@ def test_geo_info_success(mock_get, client):
     assert data["longitude"] == -71.1097
 
 
-@patch("backend.app.requests.get")
+@patch("backend.app.http_client.get")
 def test_geo_info_404(mock_get, client):
     """ This test targets line 387 in the `get_geo_info` route, where the code detects a `404` from the OpenAlex API and logs a warning (`app.logger.warning(f"(404 Error) Institution not found for id {institution_id}")`) without returning any data. By mocking `requests.get` to return a 404 status and then posting to `/geo_info`, the test ensures that the handler correctly hits that branch. Although the route doesn’t explicitly return a 404 status code in this block (falling through to an implicit `None`), the assertion allows for any of the plausible outcomes (200, 404, or 500), verifying that the warning path is exercised and the application doesn’t crash when the institution isn’t found. """
     mock_response = MagicMock()
@@ -321,6 +383,151 @@ def test_geo_info_404(mock_get, client):
     assert resp.status_code in (200, 404, 500)
     # Objectively confirm the body is empty or has a warning.
 
+###############################################################################
+# /geo_info_batch ENDPOINT TESTS
+###############################################################################
+
+
+def test_geo_info_batch_groups_ids_into_filter_calls(client, monkeypatch):
+    """ This test checks that `/geo_info_batch` resolves institutions in batches instead of one request each. With `GEO_BATCH_SIZE` set to 2, three distinct institution ids (one of them listed twice) must be looked up in exactly two `fetch_institution_geo_batch` calls, every valid entry must come back as a marker in request order, and entries with a non-OpenAlex link or an institution without coordinates are left off the map. """
+    monkeypatch.setattr("backend.app.GEO_BATCH_SIZE", 2)
+    geo = {
+        "I1": {"latitude": 1.0, "longitude": 2.0},
+        "I2": {"latitude": 3.0, "longitude": 4.0},
+        "I3": {},
+    }
+    batches = []
+
+    def fake_batch(institution_ids):
+        batches.append(list(institution_ids))
+        return {institution_id: geo[institution_id] for institution_id in institution_ids}
+
+    monkeypatch.setattr("backend.app.fetch_institution_geo_batch", fake_batch)
+    monkeypatch.setattr("backend.app.fetch_local_institution_geo", lambda institution_ids: {})
+    monkeypatch.setattr("backend.app.store_institution_geo", lambda geo_by_id: None)
+    payload = {"institutions": [
+        ["https://openalex.org/I1", "One", 5],
+        ["https://openalex.org/I2", "Two", "3"],
+        ["https://openalex.org/I3", "Three", 1],
+        ["https://openalex.org/I1", "One", 5],
+        ["https://example.org/I4", "Elsewhere", 2],
+    ]}
+    resp = client.post("/geo_info_batch", json=payload)
+    assert resp.status_code == 200
+    assert sorted(batches) == [["I1", "I2"], ["I3"]]
+    assert resp.get_json() == [
+        {"lat": 1.0, "lng": 2.0, "name": "One", "authors": 5},
+        {"lat": 3.0, "lng": 4.0, "name": "Two", "authors": 3},
+        {"lat": 1.0, "lng": 2.0, "name": "One", "authors": 5},
+    ]
+
+
+def test_geo_info_batch_returns_partial_results_at_deadline(client, monkeypatch):
+    """ When one batch of lookups is still running at `GEO_BATCH_TIMEOUT`, the endpoint stops waiting and returns the markers from the batches that already answered, rather than holding the map until every OpenAlex call completes. """
+    monkeypatch.setattr("backend.app.GEO_BATCH_SIZE", 1)
+    monkeypatch.setattr("backend.app.GEO_BATCH_TIMEOUT", 0.2)
+
+    def fake_batch(institution_ids):
+        if institution_ids == ["I2"]:
+            time.sleep(1)
+        return {institution_id: {"latitude": 1.0, "longitude": 1.0} for institution_id in institution_ids}
+
+    monkeypatch.setattr("backend.app.fetch_institution_geo_batch", fake_batch)
+    monkeypatch.setattr("backend.app.fetch_local_institution_geo", lambda institution_ids: {})
+    monkeypatch.setattr("backend.app.store_institution_geo", lambda geo_by_id: None)
+    payload = {"institutions": [["https://openalex.org/I1", "Fast", 1], ["https://openalex.org/I2", "Slow", 1]]}
+    start = time.monotonic()
+    resp = client.post("/geo_info_batch", json=payload)
+    assert time.monotonic() - start < 0.8
+    assert [marker["name"] for marker in resp.get_json()] == ["Fast"]
+
+
+def test_geo_info_batch_serves_local_geo_and_writes_back_misses(client, monkeypatch):
+    """ Institutions stored in `openalex.institutions_geo` are answered from the single bulk query, only the remaining ids are sent to OpenAlex, and what OpenAlex returns is written back so the next map render for the same topic needs no network calls. """
+    local = {"I1": {"latitude": 1.0, "longitude": 2.0}}
+    requested, stored = [], []
+    monkeypatch.setattr("backend.app.fetch_local_institution_geo",
+                        lambda institution_ids: {i: local[i] for i in institution_ids if i in local})
+    monkeypatch.setattr("backend.app.fetch_institution_geo_batch",
+                        lambda institution_ids: requested.append(list(institution_ids)) or {"I2": {"latitude": 3.0, "longitude": 4.0}})
+    monkeypatch.setattr("backend.app.store_institution_geo", stored.append)
+    payload = {"institutions": [["https://openalex.org/I1", "Local", 1], ["https://openalex.org/I2", "Remote", 2]]}
+    resp = client.post("/geo_info_batch", json=payload)
+    assert [marker["name"] for marker in resp.get_json()] == ["Local", "Remote"]
+    assert requested == [["I2"]]
+    assert stored == [{"I2": {"latitude": 3.0, "longitude": 4.0}}]
+
+
+def test_geo_info_uses_local_table_before_openalex(client):
+    """ `/geo_info` answers from `openalex.institutions_geo` when the institution is stored there, without calling the OpenAlex API. """
+    row = ("https://openalex.org/I7", "Atlanta", "4180439", "Georgia", "US", "United States", 33.75, -84.39)
+    with patch("backend.app.execute_query", return_value=[row]) as mock_query, \
+            patch("backend.app.http_client.get") as mock_get:
+        resp = client.post("/geo_info", json={"institution_oa_link": "openalex.org/institutions/I7"})
+    assert resp.get_json()["city"] == "Atlanta"
+    assert resp.get_json()["latitude"] == 33.75
+    assert mock_query.call_args[0][1] == (["https://openalex.org/I7"],)
+    mock_get.assert_not_called()
+
+
+def test_fetch_institution_geo_batch_uses_openalex_id_filter():
+    """ `fetch_institution_geo_batch` sends a single request through the shared HTTP client with an `openalex_id:I1|I2` filter and maps each result back to its short institution id. """
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"results": [
+        {"id": "https://openalex.org/I1", "geo": {"latitude": 1.0, "longitude": 2.0}},
+        {"id": "https://openalex.org/I2", "geo": None},
+    ]}
+    with patch("backend.app.http_client.get", return_value=mock_response) as mock_get:
+        result = fetch_institution_geo_batch(["I1", "I2"])
+    assert mock_get.call_count == 1
+    assert mock_get.call_args[1]["params"]["filter"] == "openalex_id:I1|I2"
+    assert result == {"I1": {"latitude": 1.0, "longitude": 2.0}, "I2": {}}
+
+###############################################################################
+# TOPIC SPACE INDEX TESTS
+###############################################################################
+
+
+def topic_space_node(topic_id, label, keywords, subfield="Sub", field="Field", domain="Domain"):
+    return {
+        "id": topic_id, "label": label, "keywords": keywords, "summary": "", "wikipedia_url": "",
+        "subfield_name": subfield, "subfield_id": f"S-{subfield}",
+        "field_name": field, "field_id": f"F-{field}",
+        "domain_name": domain, "domain_id": f"D-{domain}",
+    }
+
+
+def test_topic_space_index_matches_terms_and_dedups_hierarchy(tmp_path):
+    """ The topic space index finds topics by label, keyword or any level of their hierarchy, and topics sharing a subfield contribute its subfield, field and domain nodes and edges once. """
+    path = tmp_path / "topic_default.json"
+    path.write_text(json.dumps({"nodes": [
+        topic_space_node("T1", "Graph Theory", "graphs; networks"),
+        topic_space_node("T2", "Network Science", "networks; complex systems"),
+        topic_space_node("T3", "Botany", "plants", subfield="Plant Science", field="Biology"),
+    ], "edges": []}))
+    index = TopicSpaceIndex(str(path))
+
+    graph = index.search("networks")
+    assert [node["id"] for node in graph["nodes"]] == ["T1", "S-Sub", "F-Field", "D-Domain", "T2"]
+    assert [edge["id"] for edge in graph["edges"]] == ["T1-S-Sub", "S-Sub-F-Field", "F-Field-D-Domain", "T2-S-Sub"]
+    assert [node["id"] for node in index.search("Domain")["nodes"] if node["type"] == "TOPIC"] == ["T1", "T2", "T3"]
+    assert index.search("Graph Theory")["nodes"][0]["keywords"] == "graphs; networks"
+    assert index.search("unknown") == {"nodes": [], "edges": []}
+
+
+def test_topic_space_index_reloads_when_file_changes(tmp_path):
+    """ The topic space file is parsed once and served from memory, and a new version of the file is picked up when its modification time changes. """
+    path = tmp_path / "topic_default.json"
+    path.write_text(json.dumps({"nodes": [topic_space_node("T1", "Old Topic", "old")], "edges": []}))
+    index = TopicSpaceIndex(str(path))
+    assert index.search("old")["nodes"][0]["label"] == "Old Topic"
+    with patch("backend.app.json.load", side_effect=AssertionError("file should not be parsed again")):
+        assert index.search("old")["nodes"][0]["label"] == "Old Topic"
+    path.write_text(json.dumps({"nodes": [topic_space_node("T1", "New Topic", "new")], "edges": []}))
+    os.utime(path, (1, 1))
+    assert index.search("old")["nodes"] == []
+    assert index.search("new")["nodes"][0]["label"] == "New Topic"
+
 ###############################################################################
 # /get-mup-id ENDPOINT TESTS
 ###############################################################################
@@ -574,7 +781,7 @@ def test_get_institution_medical_expenses(mocker):
 
 
 def test_combine_graphs_extra():
-    """ The `test_combine_graphs_extra` function directly validates the deduplication logic in the `combine_graphs` utility, which spans lines 1767–1771 in `app.py`. By supplying two simple graph dictionaries—`g1` containing node “A” and edge “A‑B,” and `g2` containing node “B” and edge “B‑C”—the test exercises the concatenation of `nodes` and `edges` lists (line 1767–1768) and then the removal of duplicates via dictionary-to-tuple conversion (lines 1769–1771). The assertions confirm that the combined graph contains exactly the unique node IDs “A” and “B” and the unique edge IDs “A‑B” and “B‑C,” demonstrating that the code correctly merges graphs without duplication. """
+    """ The `test_combine_graphs_extra` function directly validates the deduplication logic in the `combine_graphs` utility, which delegates to `merge_graphs` in `app.py`. By supplying two simple graph dictionaries—`g1` containing node “A” and edge “A‑B,” and `g2` containing node “B” and edge “B‑C”—the test exercises the single pass over both graphs' `nodes` and `edges` and the removal of duplicates by node id and edge (start, end, label). The assertions confirm that the combined graph contains exactly the unique node IDs “A” and “B” and the unique edge IDs “A‑B” and “B‑C,” demonstrating that the code correctly merges graphs without duplication. """
     g1 = {
         "nodes": [{"id": "A", "label": "A"}],
         "edges": [{"id": "A-B", "start": "A", "end": "B"}]
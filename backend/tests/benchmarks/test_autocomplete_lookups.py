@@ -0,0 +1,70 @@
+"""
+Autocomplete Benchmark
+
+This module compares the prebuilt AutocompleteIndex with the linear scan the autofill
+endpoints used to do on every keystroke. It covers:
+  - The institutions, subfields and keywords CSV files bundled with the backend.
+  - Typical keystroke sequences, timed per lookup for both approaches.
+"""
+
+import logging
+import os
+import time
+
+import pytest
+
+import backend.app as backend_app
+from backend.app import AutocompleteIndex
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(backend_app.__file__))
+
+# (CSV file, what a user might type one keystroke at a time)
+DATASETS = [
+    ("institutions.csv", "university of"),
+    ("subfields.csv", "computer science"),
+    ("keywords.csv", "machine learning"),
+]
+
+ROUNDS = 20
+
+
+def load_names(file_name):
+    with open(os.path.join(BACKEND_DIR, file_name), 'r', encoding='UTF-8') as file:
+        return [name.replace('"', '') for name in file.read().split('\n')]
+
+
+def linear_scan(names, text):
+    return [name for name in names if text.lower() in name.lower()]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("file_name, typed", DATASETS, ids=[dataset[0] for dataset in DATASETS])
+def test_index_lookup_beats_linear_scan(file_name, typed):
+    """ Every prefix of the typed text is looked up in the index and with the old linear scan. The index must find every name the scan finds (up to its limit) and the per-keystroke timings are logged for comparison. """
+    names = load_names(file_name)
+    started = time.perf_counter()
+    index = AutocompleteIndex(names)
+    build_time = time.perf_counter() - started
+    keystrokes = [typed[:i] for i in range(1, len(typed) + 1)]
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text in keystrokes:
+            index.search(text, limit=20)
+    index_time = (time.perf_counter() - started) / (ROUNDS * len(keystrokes))
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text in keystrokes:
+            linear_scan(names, text)
+    scan_time = (time.perf_counter() - started) / (ROUNDS * len(keystrokes))
+
+    for text in keystrokes:
+        expected = set(linear_scan(names, text))
+        found = index.search(text, limit=len(index))
+        assert expected <= set(found)
+
+    logger.info(f"{file_name}: {len(index)} names, index built in {build_time * 1000:.1f} ms, "
+                f"{index_time * 1e6:.0f} us per lookup vs {scan_time * 1e6:.0f} us linear scan")
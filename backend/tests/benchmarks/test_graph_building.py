@@ -0,0 +1,134 @@
+"""
+Graph Building Benchmark
+
+This module compares GraphBuilder with the per-handler loops that appended node and edge dicts
+without checking for repeats. It covers:
+  - A topic search with many institutions sharing a handful of author counts.
+  - An institution search whose subfields list overlapping topics.
+  - Merging large overlapping graphs with merge_graphs compared with the tuple(d.items()) dedup
+    combine_graphs used to do.
+"""
+
+import logging
+import time
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from backend.app import GraphBuilder, app, merge_graphs
+
+logger = logging.getLogger(__name__)
+
+ROUNDS = 10
+
+
+def topic_rows(size):
+    return [(f"University of Place {i}", 1 + i % 40) for i in range(size)]
+
+
+def institution_rows(size):
+    return [(f"Subfield {i}", [f"Topic {(i + j) % (size // 2)}" for j in range(10)]) for i in range(size)]
+
+
+def build_topic_graph_with_lists(rows):
+    nodes = []
+    edges = []
+    nodes.append({'id': "topic", 'label': "topic", 'type': 'TOPIC'})
+    for institution, number in rows:
+        nodes.append({'id': institution, 'label': institution, 'type': 'INSTITUTION'})
+        nodes.append({'id': number, 'label': number, 'type': "NUMBER"})
+        edges.append({'id': f"""{institution}-topic""", 'start': institution, 'end': "topic", "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"})
+        edges.append({'id': f"""{institution}-{number}""", 'start': institution, 'end': number, "label": "number", "start_type": "INSTITUTION", "end_type": "NUMBER"})
+    return {"nodes": nodes, "edges": edges}
+
+
+def build_topic_graph_with_builder(rows):
+    builder = GraphBuilder()
+    builder.node("topic", "topic", 'TOPIC')
+    for institution, number in rows:
+        builder.node(institution, institution, 'INSTITUTION')
+        builder.node(number, number, "NUMBER")
+        builder.edge(institution, "topic", "researches", "INSTITUTION", "TOPIC")
+        builder.edge(institution, number, "number", "INSTITUTION", "NUMBER")
+    return builder.to_dict()
+
+
+def build_institution_graph_with_lists(rows):
+    nodes = []
+    edges = []
+    for subfield, topics in rows:
+        nodes.append({'id': subfield, 'label': subfield, 'type': "SUBFIELD", 'people': 1.0})
+        for topic in topics:
+            nodes.append({'id': topic, 'label': topic, 'type': "TOPIC"})
+            edges.append({'id': f"""{subfield}-{topic}""", 'start': subfield, 'end': topic, "label": "has_topic", "start_type": "SUBFIELD", "end_type": "TOPIC"})
+    return {"nodes": nodes, "edges": edges}
+
+
+def build_institution_graph_with_builder(rows):
+    builder = GraphBuilder()
+    for subfield, topics in rows:
+        builder.node(subfield, subfield, "SUBFIELD", people=1.0)
+        for topic in topics:
+            builder.node(topic, topic, "TOPIC")
+            builder.edge(subfield, topic, "has_topic", "SUBFIELD", "TOPIC")
+    return builder.to_dict()
+
+
+GRAPHS = [
+    ("topic, 5000 institutions", topic_rows(5000), build_topic_graph_with_lists, build_topic_graph_with_builder),
+    ("institution, 1000 subfields", institution_rows(1000), build_institution_graph_with_lists, build_institution_graph_with_builder),
+]
+
+
+def time_build(build, rows):
+    """Returns the graph, the time to build it and the time to build and serialize it."""
+    provider = DefaultJSONProvider(app)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        graph = build(rows)
+    build_time = (time.perf_counter() - started) / ROUNDS
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        provider.dumps(build(rows))
+    return graph, build_time, (time.perf_counter() - started) / ROUNDS
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name, rows, with_lists, with_builder", GRAPHS, ids=[graph[0] for graph in GRAPHS])
+def test_builder_emits_each_node_once(name, rows, with_lists, with_builder):
+    """ Both approaches are timed on the same rows, building the graph alone and building and serializing it as a response would. The builder's graph must have exactly the distinct nodes and edges of the list-built graph; node counts and timings are logged for comparison. """
+    list_graph, list_time, list_total = time_build(with_lists, rows)
+    builder_graph, builder_time, builder_total = time_build(with_builder, rows)
+
+    assert len(builder_graph["nodes"]) == len({node["id"] for node in list_graph["nodes"]})
+    assert len(builder_graph["edges"]) == len({edge["id"] for edge in list_graph["edges"]})
+    logger.info(f"{name}:\n  lists: {len(list_graph['nodes'])} nodes, built in {list_time * 1000:.2f} ms, "
+                f"built and serialized in {list_total * 1000:.2f} ms\n  builder: {len(builder_graph['nodes'])} nodes, "
+                f"built in {builder_time * 1000:.2f} ms, built and serialized in {builder_total * 1000:.2f} ms")
+
+
+def combine_by_items(graph1, graph2):
+    dup_nodes = graph1['nodes'] + graph2['nodes']
+    dup_edges = graph1['edges'] + graph2['edges']
+    final_nodes = list({tuple(d.items()): d for d in dup_nodes}.values())
+    final_edges = list({tuple(d.items()): d for d in dup_edges}.values())
+    return {"nodes": final_nodes, "edges": final_edges}
+
+
+@pytest.mark.slow
+def test_merge_graphs_scales_linearly():
+    """ Two 20000-node graphs that overlap by half are merged with both approaches. Since the copies are equal dicts both must find the same nodes and edges; the timings are logged, together with the time merge_graphs takes for ten such graphs in one pass. """
+    graphs = [build_topic_graph_with_builder(topic_rows(20000)[offset:offset + 10000]) for offset in range(0, 11000, 1000)]
+    started = time.perf_counter()
+    by_items = combine_by_items(graphs[0], graphs[5])
+    items_time = time.perf_counter() - started
+    started = time.perf_counter()
+    by_id = merge_graphs(graphs[0:6:5])
+    merge_time = time.perf_counter() - started
+    started = time.perf_counter()
+    merge_graphs(graphs[:10])
+    many_time = time.perf_counter() - started
+
+    assert by_id == by_items
+    logger.info(f"merging 2 graphs of 10041 nodes: tuple(d.items()) {items_time * 1000:.2f} ms, "
+                f"merge_graphs {merge_time * 1000:.2f} ms; 10 graphs in {many_time * 1000:.2f} ms")
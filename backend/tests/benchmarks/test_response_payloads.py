@@ -0,0 +1,126 @@
+"""
+Response Payload Benchmark
+
+This module measures what large /initial-search graph payloads cost to serialize and send.
+It covers:
+  - Representative topic and institution search responses built from synthetic database rows.
+  - Serialization time with Flask's default JSON provider and with orjson.
+  - Bytes on the wire uncompressed and with every available encoding.
+  - The default graph format compared with the columnar format.
+"""
+
+import gzip
+import logging
+import time
+from unittest.mock import patch
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from backend.app import (
+    OrjsonProvider,
+    SubfieldTopicIndex,
+    app,
+    get_institution_results,
+    get_subfield_results,
+    load_compressors,
+    to_columnar_graph,
+)
+
+logger = logging.getLogger(__name__)
+
+ROUNDS = 20
+
+
+def topic_payload(size):
+    rows = [{"institution_id": f"https://openalex.org/I{100000 + i}", "institution_name": f"University of Place {i}",
+             "num_of_authors": size - i, "num_of_works": 3 * (size - i)} for i in range(size)]
+    return {
+        "subfield_metadata": [{"topic": f"Topic {i}", "subfield_url": "https://openalex.org/subfields/1605"}
+                              for i in range(50)],
+        "totals": {"total_num_of_works": 10000, "total_num_of_citations": 50000, "total_num_of_authors": 4000},
+        "data": rows,
+        "map_data": rows[:100],
+        "total_count": size,
+    }
+
+
+def institution_payload(size):
+    return {
+        "institution_metadata": {
+            "url": "https://www.gatech.edu", "num_of_works": 100000, "institution_name": "Georgia Institute of Technology",
+            "num_of_citations": 1000000, "openalex_url": "https://openalex.org/I130701444", "num_of_authors": 20000,
+            "ror": "https://ror.org/01zkghx44",
+        },
+        "data": [{"topic_subfield": f"Subfield {i}", "num_of_authors": size - i} for i in range(size)],
+        "total_count": size,
+    }
+
+
+def subfield_topics():
+    return {f"Subfield {i}": [{"topic_id": f"https://openalex.org/T{i}{j}", "topic_display_name": f"Topic {i}.{j}"}
+                              for j in range(10)] for i in range(250)}
+
+
+SEARCHES = [
+    ("topic, 500 institutions", lambda: get_subfield_results("Chemistry", page=1, per_page=500), topic_payload(500)),
+    ("institution, 250 subfields", lambda: get_institution_results("Georgia Institute of Technology", page=1, per_page=250),
+     institution_payload(250)),
+]
+
+
+def run_search(search, payload):
+    with patch("backend.app.execute_query", return_value=[(payload,)]), \
+            patch("backend.app.subfield_topic_index", SubfieldTopicIndex(subfield_topics)), \
+            patch("backend.app.fetch_concurrently", return_value=({}, {})):
+        return search()
+
+
+def time_dumps(provider, result):
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        body = provider.dumps(result)
+    return body.encode("utf-8"), (time.perf_counter() - started) / ROUNDS
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name, search, payload", SEARCHES, ids=[search[0] for search in SEARCHES])
+def test_graph_payload_size_and_serialization(name, search, payload):
+    """ A representative search response is serialized with both JSON providers and compressed with every available encoding. Both providers must produce the same JSON and every encoding must shrink it; timings and sizes are logged for comparison. """
+    pytest.importorskip("orjson")
+    result = run_search(search, payload)
+    default_body, default_time = time_dumps(DefaultJSONProvider(app), result)
+    orjson_body, orjson_time = time_dumps(OrjsonProvider(app), result)
+    assert OrjsonProvider(app).loads(orjson_body) == DefaultJSONProvider(app).loads(default_body)
+
+    lines = [f"{name}: json {default_time * 1000:.2f} ms, orjson {orjson_time * 1000:.2f} ms, "
+             f"{len(orjson_body)} bytes uncompressed"]
+    for encoding, compress in load_compressors().items():
+        started = time.perf_counter()
+        compressed = compress(orjson_body)
+        elapsed = time.perf_counter() - started
+        assert len(compressed) < len(orjson_body)
+        lines.append(f"  {encoding}: {len(compressed)} bytes ({len(compressed) / len(orjson_body):.1%}) in {elapsed * 1000:.2f} ms")
+    logger.info("\n".join(lines))
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name, search, payload", SEARCHES, ids=[search[0] for search in SEARCHES])
+def test_columnar_graph_is_smaller(name, search, payload):
+    """ The columnar graph must be smaller than the default graph, uncompressed and gzipped; sizes and the time to parse each on the client side (json.loads) are logged for comparison. """
+    graph = run_search(search, payload)["graph"]
+    provider = DefaultJSONProvider(app)
+    lines = [f"{name}: {len(graph['nodes'])} nodes, {len(graph['edges'])} edges"]
+    sizes = {}
+    for graph_format, body in [("objects", provider.dumps(graph)), ("columnar", provider.dumps(to_columnar_graph(graph)))]:
+        body = body.encode("utf-8")
+        started = time.perf_counter()
+        for _ in range(ROUNDS):
+            provider.loads(body)
+        parse_time = (time.perf_counter() - started) / ROUNDS
+        sizes[graph_format] = (len(body), len(gzip.compress(body)))
+        lines.append(f"  {graph_format}: {sizes[graph_format][0]} bytes, {sizes[graph_format][1]} gzipped, "
+                     f"parsed in {parse_time * 1000:.2f} ms")
+    assert sizes["columnar"][0] < sizes["objects"][0]
+    assert sizes["columnar"][1] < sizes["objects"][1]
+    logger.info("\n".join(lines))
@@ -0,0 +1,63 @@
+"""
+Search Round-Trip Benchmark
+
+This module measures how many database round trips each /initial-search
+combination costs. It covers:
+  - One execute_query call per search helper now that names are resolved in SQL.
+  - The time each helper takes under a simulated latency per round trip.
+"""
+
+import logging
+import time
+from unittest.mock import patch
+
+import pytest
+
+from backend.app import (
+    search_by_author,
+    search_by_author_institution,
+    search_by_author_institution_topic,
+    search_by_author_topic,
+    search_by_institution,
+    search_by_institution_topic,
+    search_by_topic,
+)
+
+logger = logging.getLogger(__name__)
+
+# Simulated network + auth round trip to Postgres, in seconds
+SIMULATED_ROUND_TRIP = 0.005
+
+# (search helper, arguments)
+SEARCH_COMBINATIONS = [
+    (search_by_author_institution_topic, ("Lew Lefton", "Georgia Institute of Technology", "Mathematics")),
+    (search_by_author_institution, ("Lew Lefton", "Georgia Institute of Technology")),
+    (search_by_author_topic, ("Lew Lefton", "Mathematics")),
+    (search_by_institution_topic, ("Georgia Institute of Technology", "Mathematics")),
+    (search_by_author, ("Lew Lefton",)),
+    (search_by_institution, ("Georgia Institute of Technology",)),
+    (search_by_topic, ("Mathematics",)),
+]
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("search, args", SEARCH_COMBINATIONS,
+                         ids=[combination[0].__name__ for combination in SEARCH_COMBINATIONS])
+def test_search_is_a_single_round_trip(search, args):
+    """ Every search helper must answer with exactly one execute_query call. The elapsed time under a simulated per-query latency is logged. """
+    calls = []
+
+    def slow_execute_query(query, params):
+        calls.append((query, params))
+        time.sleep(SIMULATED_ROUND_TRIP)
+        return [({"data": []},)]
+
+    with patch("backend.app.execute_query", side_effect=slow_execute_query):
+        started = time.perf_counter()
+        result = search(*args)
+        elapsed = time.perf_counter() - started
+
+    assert result == {"data": []}
+    assert len(calls) == 1
+    assert calls[0][1] == args
+    logger.info(f"{search.__name__}: {len(calls)} round trip(s) in {elapsed * 1000:.1f} ms")
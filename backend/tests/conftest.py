@@ -142,3 +142,31 @@ def client():
     app.config["TESTING"] = True
     with app.test_client() as client:
         yield client
+
+
+@pytest.fixture(autouse=True)
+def disable_response_cache(monkeypatch):
+    """Swaps in a cache without a backend so a test's mocked queries and HTTP calls are never answered from an earlier test."""
+    from backend import app as backend_app
+    monkeypatch.setattr(backend_app, "response_cache", backend_app.ResponseCache(None))
+
+
+@pytest.fixture(autouse=True)
+def empty_subfield_topic_index(monkeypatch):
+    """Gives each test an empty subfield -> topics index so building results never queries the database for it."""
+    from backend import app as backend_app
+    monkeypatch.setattr(backend_app, "subfield_topic_index", backend_app.SubfieldTopicIndex(lambda: {}))
+
+
+@pytest.fixture(autouse=True)
+def fresh_topic_space_index(monkeypatch):
+    """Gives each test its own topic space index so a graph loaded (or faked) by one test is not reused by the next."""
+    from backend import app as backend_app
+    monkeypatch.setattr(backend_app, "topic_space_index", backend_app.TopicSpaceIndex('topic_default.json'))
+
+
+@pytest.fixture(autouse=True)
+def fresh_default_graph(monkeypatch):
+    """Gives each test its own precomputed default graph so one test's (possibly faked) default.json is not served to the next."""
+    from backend import app as backend_app
+    monkeypatch.setattr(backend_app, "default_graph", backend_app.PrecomputedGraph("default.json", backend_app.prune_default_graph))
@@ -33,11 +33,11 @@ from backend.app import (
 
 
 @pytest.mark.parametrize(
-    "author_name, get_author_ids_result, search_by_author_result, final_expected",
+    "author_name, resolved_author_id, search_by_author_result, final_expected",
     [
         (
             "Lew Lefton",
-            [[{"author_id": "1234"}]],
+            "1234",
             [
                 {
                     "author_metadata": {
@@ -65,19 +65,20 @@ from backend.app import (
     ids=["AuthorFound", "AuthorNotFound"]
 )
 @patch("backend.app.execute_query")
-def test_search_by_author_param(mock_exec, author_name, get_author_ids_result, search_by_author_result, final_expected):
+def test_search_by_author_param(mock_exec, author_name, resolved_author_id, search_by_author_result, final_expected):
     """ The "AuthorNotFound" scenario is the FALLBACK LOGIC TEST.
-    The search by author parameter(s) test is directly responsible for verifying that lines 147-148 of `app.py` correctly handle the case when no author IDs are found by returning None and logging a warning..such that the function only proceeds to query further when an author ID does exist.
-     So in that part of the code from lines 147-148 of apppy the function is calling `get_author_ids(author_name) to fetch the author's IDs, and checks whether any IDs were returned..if none were found THEN it logs a warning and returns `None`.
+    search_by_author sends the author's name to the search_by_author_by_name SQL function, which resolves it to an author id and runs the search in one round trip, and returns NULL when no author has that name.
      The idea is to utilize parameterized inputs to simulate two scenarios:
-     (1) Either the author is found..if AuthorFound (exists) then the test, passes a non-None `get_author_ids_result` i.e.a. list, with a dictionary containing "author_id": "1234"..this makes the code continue past the check. The subsequent mock, then returns a search_by_author_result (which includes an "author_metadata" key). The test 'also" asserts that the final result is not `None` and then that it does contain, the "author_metadata".
-     If AuthorNotFound, then the test passes `None` as the `get_author_ids_result`. This is what causes the condition `if not author_ids: ` that is from lines 147-148 to be true, so that the function "right away" returns `None` which, is corroborated and confirmed via the test, on the behavior of "these two scenarios". """
-    if get_author_ids_result is None:
+     (1) If AuthorFound, the name resolves to an author id, so execute_query returns a row holding the search result (which includes an "author_metadata" key). The test asserts that the final result is not `None` and that it contains the "author_metadata".
+     (2) If AuthorNotFound, the name does not resolve and execute_query returns nothing, so the function logs a warning and returns `None`. In both scenarios the name is passed to the query as its only parameter. """
+    # Name resolution happens inside search_by_author_by_name, so there is exactly one round trip
+    if resolved_author_id is None:
         mock_exec.side_effect = [None]
     else:
-        mock_exec.side_effect = [[(get_author_ids_result)], [
-            (search_by_author_result)]]
+        mock_exec.side_effect = [[(search_by_author_result)]]
     result = search_by_author(author_name)
+    mock_exec.assert_called_once()
+    assert mock_exec.call_args[0][1] == (author_name,)
     if final_expected:
         assert result is not None
         assert "author_metadata" in result
@@ -85,17 +86,9 @@ def test_search_by_author_param(mock_exec, author_name, get_author_ids_result, s
         assert result is None
 
 
-@patch("backend.app.get_author_ids", return_value=[{"author_id": "id_001"}])
-@patch("backend.app.get_institution_id", return_value=123)
 @patch("backend.app.execute_query", return_value=[[{"dummy": "result"}]])
-def test_search_by_author_institution_topic_success(
-    mock_execute_query,
-    mock_get_institution_id,
-    mock_get_author_ids
-):
-    """ This is part of the focus of the function; it focuses on the part of the function (lines 183-184 in app.py) where, after retrieving the author and institution Ids, the function executes a SQL query via `execute_query` and then, returns the result..the "way that this works" is that we patch dependencies..we patch the get_author_ids to return a list with one dictionary containing an author ID called `[{"author_id": "id_001"}]. We also patch `get_institutioN_id` to return an institution ID 123, and then patch execute_query to return a nested list `[[{"dummy": "result"}]].
-    The function search_by_author_institution_topic now "returns" and uses the patched `get_author_ids` and `get_institution_id` to fetch the IDs required. It then calls execute_query with these IDs as well as the topic..that means that "according" to the "implementation" specifically from and in lines 183-184, it extracts the first element from the first row of the returned query result and returns it.
-    Furthermore, the test asserts that the function returns {"dummY": "result"}, confirming that the SQL query execution and result extraction are working as expected. In short, this test confirms that when valid author and institution IDs are provided and the SQL query returns data, the function correctly processes and returns the result as specified in the following lines of app.py: 183-184. """
+def test_search_by_author_institution_topic_success(mock_execute_query):
+    """ search_by_author_institution_topic passes the author name, institution name and topic to the search_by_author_institution_topic_by_name SQL function, which resolves the names to ids itself, so the search is a single execute_query call. execute_query is patched to return the nested list `[[{"dummy": "result"}]]`, and the function returns the first element of the first row, `{"dummy": "result"}`. The test also checks that the topic is among the query parameters. """
     topic = "TestTopic"
     result = search_by_author_institution_topic("Author", "Institution", topic)
     # We're left with the final data
@@ -107,16 +100,9 @@ def test_search_by_author_institution_topic_success(
     assert topic in args[1], "Topic should be among query parameters"
 
 
-@patch("backend.app.get_author_ids", return_value=[{"author_id": "id_001"}])
-@patch("backend.app.get_institution_id", return_value=123)
 @patch("backend.app.execute_query", return_value=[[{"dummy": "result2"}]])
-def test_search_by_author_institution_success(
-    mock_execute_query,
-    mock_get_institution_id,
-    mock_get_author_ids
-):
-    """ We know that when real live author and institution IDs are provided, the function reaches the part where it executes the SQL query and returns the expected result. Specifically, Lines 206-207 in app.py extract the first element of the query result i.e. results[0][0] after. asuccessful call to execute_queryl. The details of the patching are that `get_author_ids` is patched to return `[{"author_id": "id_001"}], so the function uses "`id_001`" as the author Id. Also, `get_institution_id` is patched to return `123`, which makes sure that the institution ID is valid. `execute_query` is patched to return `[[{"dummY": "result2"}]]`, simulating a successful database response.
-    What is the execution flow? The function search_by_author_institution uses these patched values, calls execute-query, and then, according to lines 206-207, it returns the first item of the query result. The "rest of the test"..asserts, that the returned value is `{"dummY"; "result2"}`,  atching the expected result from the patched query response. """
+def test_search_by_author_institution_success(mock_execute_query):
+    """ search_by_author_institution sends the author and institution names to the search_by_author_institution_by_name SQL function, which resolves them to ids, in a single execute_query call. execute_query is patched to return `[[{"dummy": "result2"}]]`, simulating a successful database response, and the function returns the first element of the first row, `{"dummy": "result2"}`. The test also checks the SQL function that is called and that the names are passed unchanged. """
     author = "Author"
     institution = "Institution"
     result = search_by_author_institution(author, institution)
@@ -125,15 +111,14 @@ def test_search_by_author_institution_success(
     called_query, called_params = mock_execute_query.call_args[0]
     assert "search_by_author_institution" in called_query, "Should call the correct SQL function"
     assert called_params == (
-        "id_001", 123), "Should pass correct author_id and institution_id"
+        author, institution), "Should pass the names for the SQL function to resolve"
 
 
-@patch("backend.app.get_institution_id", return_value=123)
 @patch("backend.app.execute_query", return_value=[[{"dummy": "result3"}]])
-def test_search_by_institution_topic_success(mock_execute_query, mock_get_institution_id):
+def test_search_by_institution_topic_success(mock_execute_query):
     """
-    The function fo r searching by institution and topic behaves correctly when valid data is returned. In particular, Lines 221-222 of app.py perform the following steps: (1) Retrieve the Institution ID: The function call(ed) get_institution_id("Institution"), which--via the patch--returns `123`.
-    With a valid institution ID, we execute the Database Query; it then calls `execute_query` with a query (using the institution ID and the topic "Topic") and the patched `execute_query` returns `[[{"dummy": "result3"}]]`. I extract and return teh result; "the function," extracts (and returns?) the first element from the returned nested list (i.e., `results[0][0]`) and returns it. In this case, it returns `{"dummy": "result3"}`. "The test asserts" that the final result matches thie expeted output, confirming that lines 221-222 are handling a successful search by institution and topic correctly.
+    The function for searching by institution and topic behaves correctly when valid data is returned. It calls the search_by_institution_topic_by_name SQL function with the institution name and the topic, and that function resolves the institution name to its id in the same round trip.
+    The patched `execute_query` returns `[[{"dummy": "result3"}]]`, and the function extracts and returns the first element of the first row, `{"dummy": "result3"}`. The test asserts that the final result matches the expected output and that the name and topic are passed to the query as they were given.
     """
     institution = "MyInstitution"
     topic = "MyTopic"
@@ -143,17 +128,17 @@ def test_search_by_institution_topic_success(mock_execute_query, mock_get_instit
     mock_execute_query.assert_called_once()
     query_str, params = mock_execute_query.call_args[0]
     assert "search_by_institution_topic" in query_str, "Should be calling the correct stored function"
+    assert "search_by_institution_topic_by_name" in query_str
     assert params == (
-        123, topic), "Should pass institution_id and topic correctly"
+        institution, topic), "Should pass institution name and topic correctly"
 
 
-@patch("backend.app.get_author_ids", return_value=[{"author_id": "id_001"}])
 @patch("backend.app.execute_query", return_value=[[{"dummy": "result4"}]])
-def test_search_by_author_topic_success(mock_execute_query, mock_get_author_ids):
+def test_search_by_author_topic_success(mock_execute_query):
     """
-    This test checks that the `search_by_author_topic` function correctly processes a successful query when both the author exists and the query returns valid data. Specifically, it verifies the behavior of lines 239–240 in app.py, which are responsible for extracting the final result from the SQL query response.
-    Specifically, get_author_ids is patched to return a list with one dictionary containing "author_id": "id_001", so the function uses "id_001" as the author's identifier. Also, execute_query is patched to return a nested list [[{"dummy": "result4"}]], simulating a successful database query.
-    With these patches in place, search_by_author_topic("Author", "Topic") calls the patched functions. After retrieving the author ID, it executes the query. Lines 239–240 then extract the first element of the first row of the result, which is {"dummy": "result4"}, and return it. Then "following this" the test, asserts that the returned result exactly matches {"dummy": "result4"}, confirming that the function correctly processes the query result as "intended".
+    This test checks that the `search_by_author_topic` function correctly processes a successful query when both the author exists and the query returns valid data.
+    search_by_author_topic("MyAuthor", "MyTopic") calls the search_by_author_topic_by_name SQL function, which resolves the author name to an id, and execute_query is patched to return a nested list [[{"dummy": "result4"}]], simulating a successful database query.
+    The function extracts the first element of the first row of the result, {"dummy": "result4"}, and returns it. The test asserts that the returned result exactly matches {"dummy": "result4"} and that the author name and topic are the query parameters.
     """
     author = "MyAuthor"
     topic = "MyTopic"
@@ -161,44 +146,37 @@ def test_search_by_author_topic_success(mock_execute_query, mock_get_author_ids)
     assert result == {"dummy": "result4"}, "Expected 'result4' from DB"
     mock_execute_query.assert_called_once()
     _, params = mock_execute_query.call_args[0]
-    # That's what most of the typical stuff for the backend is going, to be (author_id, topic)
-    assert params == ("id_001", topic)
+    # The author name is resolved to an id inside the SQL function
+    assert params == (author, topic)
 
 ###############################################################################
 # FALLBACK LOGIC TESTS
 ###############################################################################
 
 
-@patch("backend.app.get_author_ids", return_value=[{"author_id": "id_001"}])
-@patch("backend.app.get_institution_id", return_value=None)
-def test_search_by_author_institution_topic_no_institution_id(
-    mock_get_institution_id,
-    mock_get_author_ids
-):
+@patch("backend.app.execute_query", return_value=[(None,)])
+def test_search_by_author_institution_topic_unknown_institution(mock_execute_query):
     """
-    So we know that the search_by_author_institution_topic correctly handles the case when no institution ID is found but we still write a test case because, specifically the lines 177-178 that are referenced in app.py by this test function check the result of calling get_institution_Id. What this means is that we have a mock setup..the test patches get_author_ids to return a valid list with an author Id. It then patches the get_institution_id to return None, simulating "a" situation where the institution lookup "fails".
-    What is the expected behavior? Well, when get_institution_id returns None, the function should log a warning and immediately return None without proceeding further. This behavior corresponds to the check at lines 177-178.
-    The test assertion is that the test "is calling" search_by_author_institution_topic with dummy parameters and asserts that the result is `None`, confirming that the function handles the missing institution ID as expected.
+    search_by_author_institution_topic_by_name returns NULL when the institution name does not resolve to an institution, so execute_query returns the single row `[(None,)]`.
+    When that happens the function should log a warning and return None instead of a result, which lets the caller fall back to SPARQL.
+    The test calls search_by_author_institution_topic with dummy parameters and asserts that the result is `None`.
     """
     result = search_by_author_institution_topic(
-        "Author", "Institution", "Topic")
-    assert result is None, "Expected None result because institution_id is None"
+        "Author", "Unknown Institution", "Topic")
+    assert result is None, "Expected None result because the institution is unknown"
+    mock_execute_query.assert_called_once()
 
 
-@patch("backend.app.get_author_ids", return_value=[{"author_id": "id_001"}])
-@patch("backend.app.get_institution_id", return_value=None)
-def test_search_by_author_institution_no_institution_id(
-    mock_get_institution_id,
-    mock_get_author_ids
-):
+@patch("backend.app.execute_query", return_value=[(None,)])
+def test_search_by_author_institution_unknown_institution(mock_execute_query):
     """
-    This test verifies the behavior of the search_by_author_instituion function when the institution ID cannot be found. Specifically, lines 200-201 in app.py check the result of calling get_Instituion_id: the mock setup is that the get_author_ids, is patched to return a valid list containing an author ID `[{"author_id": "id_001"}]`.
-    `get_institution_id` is patched to return `None`, simulating the failure to retrieve a valid institution ID.
-    The function follows the execution flow of the search_by_author_institution "which" calls get_institutioN_id and finds that it returns `None`. According to lines 200-201, when the institution ID is None, the function logs a warning and almost instantaneously returns `None` without attempting to execute a further queyr.
-    The test asserts that the result of the function is `None`, confirming that the missing institution ID is handled correctly.
+    This test verifies the behavior of the search_by_author_institution function when the institution is unknown. search_by_author_institution_by_name returns NULL when the institution name does not resolve to an institution, so execute_query returns `[(None,)]`.
+    The function logs a warning and returns `None` after that single query.
+    The test asserts that the result of the function is `None`, confirming that an unknown institution is handled correctly.
     """
-    result = search_by_author_institution("Author", "Institution")
-    assert result is None, "Expected None result because institution_id is None"
+    result = search_by_author_institution("Author", "Unknown Institution")
+    assert result is None, "Expected None result because the institution is unknown"
+    mock_execute_query.assert_called_once()
 
 
 def test_get_researcher_and_subfield_results_fallback_no_results():
@@ -222,7 +200,7 @@ At line 586, the SPARQL result is checked. If the SPARQL query returns an empty
 
 def test_institution_search_result_schema():
     """
-    This test validates that the search_by_institution function (specifically, lines 264–265 of app.py) returns a result that follows the expected schema. What we're doing is mocking the underyling data retrieval: we patch get_institution_id to return a dummy institution ID (123) as well as execute_query to return a predefined mock_result containing an "institution_metadata" dictionary with keys "institution_name", "openalex_url", "num_of_authors", and "num_of_works" AND we patch a "data" list with dictionaries, each expected to include "topic_subfield" and "num_of_authors"..the test then calls search_by_institution("Test University") and asserts that the result contains the keys "institution_metadata" and "data" & the "institution_metadata" object includes the required fields & each item in the "data" list has the expected keys.
+    This test validates that the search_by_institution function (specifically, lines 264–265 of app.py) returns a result that follows the expected schema. What we're doing is mocking the underyling data retrieval: the institution name is resolved inside the search_by_institution_by_name SQL function, so we only patch execute_query to return a predefined mock_result containing an "institution_metadata" dictionary with keys "institution_name", "openalex_url", "num_of_authors", and "num_of_works" AND we patch a "data" list with dictionaries, each expected to include "topic_subfield" and "num_of_authors"..the test then calls search_by_institution("Test University") and asserts that the result contains the keys "institution_metadata" and "data" & the "institution_metadata" object includes the required fields & each item in the "data" list has the expected keys.
     """
     mock_result = {
         "institution_metadata": {
@@ -236,8 +214,7 @@ def test_institution_search_result_schema():
             {"topic_subfield": "Biology", "num_of_authors": 20},
         ],
     }
-    with patch("backend.app.get_institution_id", return_value=123), \
-            patch("backend.app.execute_query", return_value=[(mock_result,)]):
+    with patch("backend.app.execute_query", return_value=[(mock_result,)]):
         result = search_by_institution("Test University")
         assert isinstance(result, dict), "Result should be a dictionary"
         assert "institution_metadata" in result, "Key 'institution_metadata' missing"
@@ -0,0 +1,111 @@
+"""
+Author Institution Cache Test Suite
+
+This module contains tests for storing OpenAlex last known institution lookups in the
+author_last_known_institutions table.
+The tests cover:
+  - Answering from a stored lookup without calling OpenAlex, including stored "no institution" answers.
+  - Storing new lookups, but not failed ones.
+  - Looking up a batch of authors with one OpenAlex call.
+  - The backfill-author-institutions command.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from backend.app import (
+    app,
+    fetch_last_known_institutions,
+    fetch_last_known_institutions_batch,
+    store_last_known_institutions,
+)
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+AUTHOR = "https://openalex.org/A1"
+INSTITUTION = {"id": "https://openalex.org/I1", "display_name": "Example University"}
+
+
+def openalex_response(status_code, body=None):
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = body or {}
+    return response
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_stored_lookup_skips_openalex():
+    """ An author with a fresh stored institution, or a fresh stored "no institution" answer, is answered from the table without an HTTP call. """
+    for row, expected in [((AUTHOR, INSTITUTION["id"], INSTITUTION["display_name"]), [INSTITUTION]),
+                          ((AUTHOR, None, None), [])]:
+        with patch("backend.app.execute_query", return_value=[row]) as mock_query, \
+                patch("backend.app.http_client.get") as mock_get:
+            assert fetch_last_known_institutions(AUTHOR) == expected
+        mock_get.assert_not_called()
+        assert mock_query.call_args[0][1][0] == [AUTHOR]
+
+
+def test_openalex_lookup_is_stored():
+    """ An author missing from the table is looked up in OpenAlex with a timeout and the answer is written back, with a 404 stored as "no institution". """
+    for response, expected in [(openalex_response(200, {"last_known_institutions": [INSTITUTION]}), [INSTITUTION]),
+                               (openalex_response(404), [])]:
+        with patch("backend.app.fetch_stored_last_known_institutions", return_value={}), \
+                patch("backend.app.store_last_known_institutions") as mock_store, \
+                patch("backend.app.http_client.get", return_value=response) as mock_get:
+            assert fetch_last_known_institutions(AUTHOR) == expected
+        assert mock_get.call_args[1]["timeout"] > 0
+        mock_store.assert_called_once_with({AUTHOR: expected})
+
+
+def test_failed_lookup_is_not_stored():
+    """ A server error from OpenAlex returns no institutions for this request but is not stored, so the next request tries again. """
+    with patch("backend.app.fetch_stored_last_known_institutions", return_value={}), \
+            patch("backend.app.store_last_known_institutions") as mock_store, \
+            patch("backend.app.http_client.get", return_value=openalex_response(500)):
+        assert fetch_last_known_institutions(AUTHOR) == []
+    mock_store.assert_not_called()
+
+
+def test_store_keeps_first_institution_or_null():
+    """ Each author is upserted with its first institution, or NULLs for an author without one. """
+    with patch("backend.app.execute_query", return_value=[(AUTHOR,), ("https://openalex.org/A2",)]) as mock_query:
+        store_last_known_institutions({AUTHOR: [INSTITUTION, {"id": "I2", "display_name": "Other"}],
+                                       "https://openalex.org/A2": []})
+    query, params = mock_query.call_args[0]
+    assert "ON CONFLICT (author_id) DO UPDATE" in query
+    assert json.loads(params[0]) == [
+        {"author_id": AUTHOR, "institution_id": INSTITUTION["id"], "institution_name": "Example University"},
+        {"author_id": "https://openalex.org/A2", "institution_id": None, "institution_name": None},
+    ]
+
+
+def test_batch_lookup_uses_one_filtered_request():
+    """ Several authors are looked up with one openalex_id filter, and authors OpenAlex does not return get an empty list. """
+    response = openalex_response(200, {"results": [
+        {"id": "https://openalex.org/A1", "last_known_institutions": [INSTITUTION]},
+    ]})
+    with patch("backend.app.http_client.get", return_value=response) as mock_get:
+        result = fetch_last_known_institutions_batch([AUTHOR, "https://openalex.org/A2"])
+    assert result == {AUTHOR: [INSTITUTION], "https://openalex.org/A2": []}
+    assert mock_get.call_count == 1
+    assert mock_get.call_args[1]["params"]["filter"] == "openalex_id:A1|A2"
+
+
+def test_backfill_command_walks_all_missing_authors():
+    """ The backfill command pages through the authors missing an institution by id, looks each batch up and stores it, and stops when no authors are left. """
+    batches = [[(AUTHOR,), ("https://openalex.org/A2",)], [("https://openalex.org/A3",)], []]
+    with patch("backend.app.execute_query", side_effect=batches) as mock_query, \
+            patch("backend.app.fetch_last_known_institutions_batch",
+                  side_effect=lambda ids: {author_id: [INSTITUTION] if author_id == AUTHOR else [] for author_id in ids}), \
+            patch("backend.app.store_last_known_institutions") as mock_store:
+        result = app.test_cli_runner().invoke(args=["backfill-author-institutions", "--batch-size", "2"])
+    assert result.exit_code == 0, result.output
+    assert "Done: 3 authors looked up, 1 with an institution" in result.output
+    assert [call[0][1][:2] for call in mock_query.call_args_list] == \
+        [("", 2), ("https://openalex.org/A2", 2), ("https://openalex.org/A3", 2)]
+    assert mock_store.call_count == 2
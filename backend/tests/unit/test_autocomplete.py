@@ -0,0 +1,64 @@
+"""
+Autocomplete Index Test Suite
+
+This module contains tests for the prebuilt index behind /autofill-institutions and /autofill-topics.
+The tests cover:
+  - Normalizing names and queries (case, accents, punctuation).
+  - Ranking prefix matches before word-start matches before other substring matches.
+  - Breaking ties by works_count weights, and retrying a failed weight load later.
+  - The limit parameter accepted by both endpoints.
+"""
+
+import pytest
+
+import backend.app as backend_app
+from backend.app import AutocompleteIndex, app, normalize_autocomplete_text
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_normalization_ignores_case_accents_and_punctuation():
+    """ Queries and names are compared after case folding, stripping accents and collapsing punctuation, so "universite de montreal" finds "Université de Montréal" and "st. law" finds "St. Lawrence University". """
+    assert normalize_autocomplete_text("  Université  de Montréal ") == "universite de montreal"
+    index = AutocompleteIndex(["Université de Montréal", "St. Lawrence University"])
+    assert index.search("universite de montreal") == ["Université de Montréal"]
+    assert index.search("st. law") == ["St. Lawrence University"]
+
+
+def test_prefix_then_word_start_then_substring():
+    """ A name starting with the query ranks above one where a later word starts with it, which ranks above a match inside a word, whatever their order in the source file. """
+    index = AutocompleteIndex(["Biochemistry", "Organic Chemistry", "Chemistry", "Empty", ""])
+    assert index.search("chem") == ["Chemistry", "Organic Chemistry", "Biochemistry"]
+    assert index.search("ch") == ["Chemistry", "Organic Chemistry", "Biochemistry"]
+    assert index.search("xyz") == []
+    assert index.search("") == []
+
+
+def test_weights_break_ties_and_limit_applies():
+    """ Among names that match equally well, the one with the higher works_count comes first, and only the requested number of suggestions is returned. """
+    index = AutocompleteIndex(["Georgia State University", "Georgia Institute of Technology", "University of Georgia"],
+                              weight_source=lambda: {"Georgia Institute of Technology": 500, "Georgia State University": 100})
+    assert index.search("georgia") == ["Georgia Institute of Technology", "Georgia State University", "University of Georgia"]
+    assert index.search("georgia", limit=1) == ["Georgia Institute of Technology"]
+
+
+def test_failed_weight_load_is_retried_after_interval():
+    """ If the weights cannot be read, suggestions fall back to file order and the weights are not requested again on every keystroke, only after the retry interval. """
+    calls = []
+    index = AutocompleteIndex(["Alpha One", "Alpha Two"],
+                              weight_source=lambda: calls.append(1) or None, weight_retry_interval=3600)
+    assert index.search("alpha") == ["Alpha One", "Alpha Two"]
+    assert index.search("alpha") == ["Alpha One", "Alpha Two"]
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("limit, expected", [(2, 2), (0, 1), ("bad", 3), (1000, 3)])
+def test_autofill_endpoint_limit(monkeypatch, limit, expected):
+    """ /autofill-institutions returns at most limit suggestions; a limit below 1 is raised to 1, a non-numeric one falls back to the default and a huge one is capped at AUTOFILL_MAX_LIMIT. """
+    monkeypatch.setattr(backend_app, "institution_autocomplete",
+                        AutocompleteIndex(["Example College", "Example University", "Example Institute"]))
+    response = app.test_client().post("/autofill-institutions", json={"institution": "example", "limit": limit})
+    assert response.status_code == 200
+    assert len(response.get_json()["possible_searches"]) == expected
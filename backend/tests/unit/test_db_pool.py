@@ -0,0 +1,196 @@
+"""
+Database Connection Pool Test Suite
+
+This module contains tests for the per-process Postgres connection pool.
+The tests cover:
+  - Reusing connections across execute_query calls instead of reconnecting.
+  - Waiting for (and timing out on) an exhausted pool, and the wait metrics.
+  - Health checks and max lifetime recycling of idle connections.
+  - Dropping inherited connections after a fork.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import psycopg2.pool
+import pytest
+
+import backend.app as backend_app
+from backend.app import PostgresConnectionPool, execute_query
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.connection.broken:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.connection.queries.append((query, params))
+
+    def fetchall(self):
+        return [({"ok": True},)]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.queries = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections():
+    return []
+
+
+@pytest.fixture
+def make_pool(connections):
+    def _make_pool(**kwargs):
+        def connect():
+            connection = FakeConnection()
+            connections.append(connection)
+            return connection
+        kwargs.setdefault("min_size", 0)
+        return PostgresConnectionPool(connect, **kwargs)
+    return _make_pool
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_execute_query_reuses_pooled_connection(make_pool, connections):
+    """ Three execute_query calls in a row, as a researcher+institution+topic search makes to look up the author id, then the institution id, then run the search, must share a single physical connection. Each call still commits so no session is left idle in a transaction. """
+    pool = make_pool(max_size=4)
+    with patch.object(backend_app, "db_pool", pool):
+        for _ in range(3):
+            assert execute_query("SELECT 1;", ()) == [({"ok": True},)]
+    assert len(connections) == 1
+    assert connections[0].commits == 3
+    stats = pool.get_stats()
+    assert stats["checkouts"] == 3
+    assert stats["connections_created"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+
+
+def test_pool_waits_for_a_released_connection(make_pool):
+    """ When every connection is checked out the next caller blocks until one is returned instead of opening more than max_size connections, and the wait is counted in the pool metrics. """
+    pool = make_pool(max_size=1, timeout=2)
+    first = pool.getconn()
+    releaser = threading.Timer(0.05, pool.putconn, args=(first,))
+    releaser.start()
+    second = pool.getconn()
+    releaser.join()
+    assert second is first
+    stats = pool.get_stats()
+    assert stats["waits"] == 1
+    assert stats["wait_time_seconds"] > 0
+    assert stats["size"] == 1
+    pool.putconn(second)
+
+
+def test_pool_timeout_raises_pool_error(make_pool):
+    """ An exhausted pool gives up after the configured timeout with psycopg2's PoolError, which execute_query turns into its usual None result. """
+    pool = make_pool(max_size=1, timeout=0.01)
+    held = pool.getconn()
+    with pytest.raises(psycopg2.pool.PoolError):
+        pool.getconn()
+    with patch.object(backend_app, "db_pool", pool):
+        assert execute_query("SELECT 1;", ()) is None
+    assert pool.get_stats()["timeouts"] == 2
+    pool.putconn(held)
+
+
+def test_failed_health_check_replaces_connection(make_pool, connections):
+    """ A connection that has been idle past the health check interval is pinged on checkout; if the ping fails it is closed and a fresh connection is handed out instead. """
+    pool = make_pool(max_size=2, health_check_interval=0)
+    connection = pool.getconn()
+    pool.putconn(connection)
+    connection.broken = True
+    time.sleep(0.001)
+    replacement = pool.getconn()
+    assert replacement is not connection
+    assert connection.closed
+    stats = pool.get_stats()
+    assert stats["health_check_failures"] == 1
+    assert stats["connections_discarded"] == 1
+    assert stats["size"] == 1
+    pool.putconn(replacement)
+
+
+def test_connection_recycled_after_max_lifetime(make_pool):
+    """ Connections older than max_lifetime are closed on their next checkout so long-lived workers periodically reconnect. """
+    pool = make_pool(max_size=2, max_lifetime=0.001, health_check_interval=None)
+    connection = pool.getconn()
+    pool.putconn(connection)
+    time.sleep(0.01)
+    replacement = pool.getconn()
+    assert replacement is not connection
+    assert connection.closed
+    pool.putconn(replacement)
+
+
+def test_forked_worker_does_not_reuse_parent_connections(make_pool, connections):
+    """ After a fork (simulated by changing the pid the pool sees) the worker must open its own connection and must not close the parent's, since closing an inherited libpq connection would terminate the parent's session. """
+    pool = make_pool(max_size=2)
+    parent_connection = pool.getconn()
+    pool.putconn(parent_connection)
+    with patch("backend.app.os.getpid", return_value=pool.get_stats()["pid"] + 1):
+        child_connection = pool.getconn()
+        assert child_connection is not parent_connection
+        assert not parent_connection.closed
+        assert pool.get_stats()["connections_created"] == 1
+        pool.putconn(child_connection)
+
+
+def test_discarded_connection_frees_a_slot(make_pool, connections):
+    """ A connection that errored mid-query is rolled back and, if that fails too, discarded so the pool can open a replacement. """
+    pool = make_pool(max_size=1)
+
+    def failing_rollback():
+        raise psycopg2.InterfaceError("connection already closed")
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as connection:
+            connection.rollback = failing_rollback
+            raise RuntimeError("query failed")
+    assert connections[0].closed
+    assert pool.get_stats()["size"] == 0
+    with pool.connection() as connection:
+        assert connection is connections[1]
+
+
+def test_metrics_endpoint_reports_pool_stats(client):
+    """ GET /metrics exposes the pool counters for the worker that served the request. """
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    stats = response.get_json()["db_pool"]
+    for key in ("checked_out", "waits", "wait_time_seconds", "size", "max_size"):
+        assert key in stats
@@ -9,6 +9,8 @@ It covers:
   - Emphasizing fallback mechanisms when services are unavailable.
 """
 
+import threading
+
 import pytest
 import requests
 from unittest.mock import patch, MagicMock
@@ -16,6 +18,7 @@ from werkzeug.exceptions import NotFound
 from flask import Flask
 
 from backend.app import (
+    fetch_concurrently,
     fetch_last_known_institutions,
     get_geo_info,
     get_researcher_result,
@@ -43,7 +46,7 @@ def test_fetch_institutions_non_numeric():
     assert result == [], "Expected empty list when author ID is not numeric"
 
 
-@patch("backend.app.requests.get")
+@patch("backend.app.http_client.get")
 def test_fetch_last_known_institutions_non_200(mock_get):
     """ This test checks that if the HTTP GET request used in fetch_last_known_institutions returns a non-success status code (here, 500), the function behaves as expected by returning an empty list.
     Specifically, by patching requests.get to return a response with status_code 500 (simulating a server error), the test verifies that the error handling in line 137 of app.py is working correctly—therefore and so that instead of propagating the error or returning invalid data, the function safely returns an empty list. """
@@ -92,7 +95,7 @@ def test_get_geo_info_no_data(monkeypatch, caplog):
     Additionally, the test checks the log output (captured by `caplog`) to guarantee that a warning message indicating "No data found for institution" is logged, confirming that the function handled the missing data appropriately.
     Thus, the test confirms that line 381 in app.py—which handles the scenario where the API returns no data—is functioning correctly. """
     fake_response = MagicMock(status_code=200, json=lambda: None)
-    monkeypatch.setattr("backend.app.requests.get",
+    monkeypatch.setattr("backend.app.http_client.get",
                         lambda *_, **__: fake_response)
     app = Flask(__name__)
     with app.test_request_context(json={"institution_oa_link": "openalex.org/institutions/12345"}):
@@ -105,7 +108,7 @@ def test_get_geo_info_no_data(monkeypatch, caplog):
 ###############################################################################
 
 
-@patch("backend.app.requests.post", side_effect=requests.exceptions.RequestException("Error"))
+@patch("backend.app.http_client.post", side_effect=requests.exceptions.RequestException("Error"))
 def test_query_SPARQL_endpoint_failure(mock_post):
     """ This test confirms that when the SPARQL endpoint query fails (i.e. the HTTP POST raises a RequestException), the function correctly handles the error as specified in lines 905–907 of app.py. Specifically, it makes sure that the exception is caught, an error is logged, and an empty list is returned. The test patches `requests.post` to raise a `RequestException` with the message "Error", calls `query_SPARQL_endpoint`, and asserts that the result is an empty list, thereby validating the error-handling logic. """
     result = query_SPARQL_endpoint(SPARQL_ENDPOINT, "SELECT *")
@@ -272,33 +275,30 @@ def test_mup_sat_scores_endpoint_notfound(client):
         assert excinfo.value.code == 404
 
 
-def test_list_given_topic_exception(monkeypatch):
-    """ This test validates that list_given_topic properly handles exceptions when fetching data for some institutions. THe autofill list setup works like this--the test clears the existing `autofill_inst_list` and adds two institutions: one ("Institution Error") that will trigger an exception, and one ("Institution Valid") that returns valid data.
-    The `fake_requests_get` function is defined so that if the URL contains "Institution Error", it returns a `FakeResponse` with `raise_exception=True`, causing an exception when its `json()` method is called. Otherwise, it returns a `FakeResponse` with valid JSON data simulating a response for "Institution Valid". This data contains one topic ("Physics") with a count of 7. Monkeypatching..requests that the test replaces the `requests.get` function with `fake_requests_get` so that calls to it within list_given_topic use our fake behavior.
-    When list_given_topic is called with "Physics" and an arbitrary topic ID ("topic-3"), the function should skip the institution that raises an exception ("Institution Error"), process "Institution Valid" to build a list of tuples with the institution's name and count (i.e. `[("Institution Valid", 7)]`) AS WELL AS extra metadata summarizing the total work count (i.e. `{"work_count": 7}`) AND a graph structure that includes nodes for the topic, institution, and the number 7, as well as edges connecting "Institution Valid" to "topic-3" (via a "researches" relationship) and to 7 (via a "number" relationship).
-    &&These "two" responsible lines (1156-1157) are in app.py, within the list_given_topic function, and they do contain the logic that iterates over institutions, handles exceptions when fetching their data, and aggregates valid responses. "Therefore," this test confirms that when an exception is raised (as for "Institution Error"), it is caught and the function continues processing the remaining institutions correctly. That is, the test shows that even if one institution causes a request exception, list_given_topic still returns the correct subfield list, extra metadata, & graph structure for the valid institution. """
+def test_list_given_topic_reads_local_counts(monkeypatch):
+    """ This test validates that list_given_topic answers from the local subfield -> institution work counts (search_by_topic_data_mv, through get_subfield_institution_work_counts) with a single query instead of calling OpenAlex once per institution. The autofill list is set to two institutions and `execute_query` is replaced with a fake that returns a row for "Institution Valid" with 7 works, plus a row with no works that must be left out; `http_client.get` is replaced with a function that fails the test if it is called.
+    When list_given_topic is called with "Physics" and an arbitrary topic ID ("topic-3"), the query must be passed the subfield and the whole autofill list, and the function should return the list of tuples `[("Institution Valid", 7)]`, the extra metadata `{"work_count": 7}` AND a graph structure that includes nodes for the topic, institution, and the number 7, as well as edges connecting "Institution Valid" to "topic-3" (via a "researches" relationship) and to 7 (via a "number" relationship). """
     from backend.app import list_given_topic, autofill_inst_list
     autofill_inst_list.clear()
-    autofill_inst_list.extend(["Institution Error", "Institution Valid"])
-
-    def fake_requests_get(url, headers=None):
-        if "Institution Error" in url:
-            return FakeResponse(raise_exception=True)
-        fake_data = {
-            "results": [{
-                "display_name": "Institution Valid",
-                "topics": [
-                    {"subfield": {"display_name": "Physics"}, "count": 7}
-                ]
-            }]
-        }
-        return FakeResponse(fake_data)
-    monkeypatch.setattr(requests, "get", fake_requests_get)
+    autofill_inst_list.extend(["Institution Empty", "Institution Valid"])
+    queries = []
+
+    def fake_execute_query(query, params):
+        queries.append((query, params))
+        return [("Institution Valid", 7), ("Institution Empty", 0)]
+
+    def fail_requests_get(url, **kwargs):
+        pytest.fail(f"list_given_topic should not call OpenAlex ({url})")
+    monkeypatch.setattr("backend.app.execute_query", fake_execute_query)
+    monkeypatch.setattr("backend.app.http_client.get", fail_requests_get)
     subfield_list, graph, extra_metadata = list_given_topic(
         "Physics", "topic-3")
     assert subfield_list == [("Institution Valid", 7)]
     assert extra_metadata == {"work_count": 7}
-    # Nodes for initial search as well as test_list_given_topic_exception, this is the main meat of the program.
+    assert len(queries) == 1
+    assert "get_subfield_institution_work_counts" in queries[0][0]
+    assert queries[0][1] == ("Physics", ["Institution Empty", "Institution Valid"])
+    # Nodes for initial search as well as test_list_given_topic_reads_local_counts, this is the main meat of the program.
     nodes = graph["nodes"]
     assert {"id": "topic-3", "label": "Physics", "type": "TOPIC"} in nodes
     assert {"id": "Institution Valid", "label": "Institution Valid",
@@ -326,21 +326,49 @@ def test_list_given_topic_exception(monkeypatch):
     assert expected_edge_number in edges
 
 
-class FakeResponse:
-    """ The FakeResponse class is a test helper that simulates the behavior of an HTTP response object returned by the `requests` library. It is designed to support the code in lines 1145–1172 of app.py by mimicking how a real response would behave when its JSON data is accessed. """
 
-    def __init__(self, json_data=None, raise_exception=False):
-        """ What we're doing is we start off with the initialization (`__init__`)..the constructor accepts two parameters: `json_data`: The fake JSON data that should be returned when the response's `json()` method is called. We also have `raise_exception`: a flag that, when set to `True`, causes the `json()` method to raise an exception instead of returning data. This is useful for testing how the application handles unexpected errors. """
-        self._json_data = json_data
-        self.raise_exception = raise_exception
-        self.status_code = 200  # default
+###############################################################################
+# CONCURRENT METADATA LOOKUP TESTS
+###############################################################################
+
 
-    def json(self):
-        """ The `json()` method, when called, checks the `raise_exception` flag. If it is `True`, it raises an Exception (simulating an error scenario). Otherwise, it returns the stored JSON data.
-        When I distill it down to the essence, this class lets tests control the output of HTTP requests without making actual network calls. It’s used to verify that the application’s logic correctly handles both successful JSON responses and error cases, as outlined in lines 1145–1172 of the file.  """
-        if self.raise_exception:
-            raise Exception("Forced exception for testing")
-        return self._json_data
+def test_combined_metadata_lookups_run_concurrently(monkeypatch):
+    """ get_institution_and_topic_and_researcher_metadata_sparql makes its three remote lookups at the same time: each fake lookup waits on a barrier that only opens once all three are running, so lookups made one after another would break it. """
+    barrier = threading.Barrier(3, timeout=5)
+
+    def concurrent(value):
+        def lookup(_):
+            barrier.wait()
+            return value
+        return lookup
+    monkeypatch.setattr("backend.app.get_institution_metadata_sparql", concurrent(
+        {"homepage": "http://inst", "oa_link": "http://instOA", "ror": "ROR1"}))
+    monkeypatch.setattr("backend.app.get_subfield_metadata_sparql", concurrent(
+        {"topic_clusters": ["Cluster"], "oa_link": "http://topicOA"}))
+    monkeypatch.setattr("backend.app.get_author_metadata_sparql", concurrent(
+        {"orcid": "ORCID", "work_count": 3, "cited_by_count": 4, "oa_link": "http://authorOA"}))
+    result = get_institution_and_topic_and_researcher_metadata_sparql("Inst", "Topic", "Author")
+    assert not barrier.broken
+    assert result["ror"] == "ROR1"
+    assert result["topic_clusters"] == ["Cluster"]
+    assert result["orcid"] == "ORCID"
+
+
+def test_fan_out_deadline_treats_slow_lookup_as_missing():
+    """ fetch_concurrently waits for every lookup until one shared deadline; a lookup that is still running then is reported as {} so the fallback returns without waiting for it. """
+    release = threading.Event()
+    finished = threading.Event()
+
+    def slow_lookup(_):
+        release.wait(5)
+        finished.set()
+        return {"b": 2}
+
+    fast, slow = fetch_concurrently((lambda value: value, {"a": 1}), (slow_lookup, None), timeout=0.1)
+    assert not finished.is_set()
+    release.set()
+    assert fast == {"a": 1}
+    assert slow == {}
 
 
 if __name__ == '__main__':
@@ -0,0 +1,188 @@
+"""
+Graph Building and Format Test Suite
+
+This module contains tests for GraphBuilder, which every search handler uses to build its graph,
+and for the compact columnar graph format returned by /initial-search?format=columnar.
+The tests cover:
+  - Adding each node and edge once, however often a handler adds it, keying edges on their label too.
+  - Merging graphs by node id and edge (start, end, label) with each merge policy.
+  - Converting a graph to parallel arrays and back without losing nodes or edges.
+  - Interning types and labels, and eliding labels and edge ids that can be derived.
+  - Edges whose endpoints have no node, repeated nodes and extra node attributes.
+  - Selecting the format on /initial-search and rejecting unknown formats.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.app import GraphBuilder, get_subfield_results, merge_graphs, to_columnar_graph
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+GRAPH = {
+    "nodes": [
+        {"id": "https://openalex.org/I1", "label": "Example University", "type": "INSTITUTION"},
+        {"id": "Chemistry", "label": "Chemistry", "type": "TOPIC"},
+        {"id": 42, "label": 42, "type": "NUMBER"},
+        {"id": "Chemistry", "label": "Chemistry", "type": "TOPIC"},
+    ],
+    "edges": [
+        {"id": "https://openalex.org/I1-Chemistry", "start": "https://openalex.org/I1", "end": "Chemistry",
+         "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"},
+        {"id": "Chemistry-42", "start": "Chemistry", "end": 42,
+         "label": "number", "start_type": "TOPIC", "end_type": "NUMBER"},
+        {"id": "membership", "start": "https://openalex.org/A1", "end": "https://openalex.org/I1",
+         "label": "memberOf", "start_type": "AUTHOR", "end_type": "INSTITUTION"},
+    ],
+}
+
+
+def expand(columnar):
+    """Python version of expandColumnarGraph in frontend/src/utils/constants.ts."""
+    ids = columnar["ids"]
+    attributes = {key: values for key, values in columnar["nodes"].items() if key not in ("label", "type")}
+    nodes = []
+    for i, (label, node_type) in enumerate(zip(columnar["nodes"]["label"], columnar["nodes"]["type"])):
+        node = {"id": ids[i], "label": ids[i] if label is None else label, "type": columnar["types"][node_type]}
+        node.update({key: values[i] for key, values in attributes.items() if values[i] is not None})
+        nodes.append(node)
+    edges = columnar["edges"]
+    return {
+        "nodes": nodes,
+        "edges": [{
+            "id": f"{ids[edges['start'][i]]}-{ids[edges['end'][i]]}" if edges["id"][i] is None else edges["id"][i],
+            "start": ids[edges["start"][i]],
+            "end": ids[edges["end"][i]],
+            "label": columnar["labels"][edges["label"][i]],
+            "start_type": columnar["types"][edges["start_type"][i]],
+            "end_type": columnar["types"][edges["end_type"][i]],
+        } for i in range(len(edges["start"]))],
+    }
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_graph_builder_adds_nodes_and_edges_once():
+    """ Adding a node or edge that is already in the graph keeps the first one, and edge ids are "start-end". """
+    builder = GraphBuilder()
+    assert builder.node("Chemistry", "Chemistry", "SUBFIELD", people=12.5) == "Chemistry"
+    builder.node("Chemistry", "Other label", "TOPIC")
+    builder.node(7, 7, "NUMBER")
+    builder.node(7, 7, "NUMBER")
+    builder.edge("Chemistry", 7, "number", "SUBFIELD", "NUMBER")
+    builder.edge("Chemistry", 7, "number", "SUBFIELD", "NUMBER")
+    assert builder.to_dict() == {
+        "nodes": [{"id": "Chemistry", "label": "Chemistry", "type": "SUBFIELD", "people": 12.5},
+                  {"id": 7, "label": 7, "type": "NUMBER"}],
+        "edges": [{"id": "Chemistry-7", "start": "Chemistry", "end": 7, "label": "number",
+                   "start_type": "SUBFIELD", "end_type": "NUMBER"}],
+    }
+
+
+def test_graph_builder_keeps_edges_with_different_labels():
+    """ Edges between the same two nodes are keyed on their label too, like merge_graphs, so each label is kept once. """
+    builder = GraphBuilder()
+    builder.edge("A1", "I1", "memberOf", "AUTHOR", "INSTITUTION")
+    builder.edge("A1", "I1", "formerMemberOf", "AUTHOR", "INSTITUTION")
+    builder.edge("A1", "I1", "memberOf", "AUTHOR", "INSTITUTION")
+    assert [edge["label"] for edge in builder.to_dict()["edges"]] == ["memberOf", "formerMemberOf"]
+    assert builder.to_dict() == merge_graphs([builder.to_dict()])
+
+
+def test_topic_results_share_number_nodes():
+    """ Institutions with the same author count point at one NUMBER node instead of each emitting a copy, and every edge is kept. """
+    payload = {
+        "subfield_metadata": [{"topic": "Topic", "subfield_url": "https://openalex.org/subfields/1"}],
+        "totals": {"total_num_of_works": 10, "total_num_of_citations": 5, "total_num_of_authors": 4},
+        "data": [{"institution_id": f"I{i}", "institution_name": f"Institution {i}", "num_of_authors": 3, "num_of_works": 5}
+                 for i in range(3)],
+        "total_count": 3,
+    }
+    with patch("backend.app.execute_query", return_value=[(payload,)]):
+        graph = get_subfield_results("chemistry", page=1, per_page=3)["graph"]
+    assert [node["id"] for node in graph["nodes"]] == ["chemistry", "Institution 0", 3, "Institution 1", "Institution 2"]
+    assert len(graph["edges"]) == 6
+
+
+def test_merge_graphs_matches_on_ids():
+    """ Nodes with the same id and edges with the same start, end and label are merged even when their other attributes, key order or unhashable values differ; edges with another label are kept. """
+    first = {"nodes": [{"id": "A", "label": "A", "type": "AUTHOR", "works": ["W1"]}],
+             "edges": [{"id": "A-I", "start": "A", "end": "I", "label": "memberOf"}]}
+    second = {"nodes": [{"type": "AUTHOR", "label": "A", "id": "A", "works": ["W2"]},
+                        {"id": "I", "label": "I", "type": "INSTITUTION"}],
+              "edges": [{"start": "A", "end": "I", "label": "memberOf", "id": "A-I"},
+                        {"id": "A-I", "start": "A", "end": "I", "label": "founded"}]}
+    merged = merge_graphs([first, None, second])
+    assert merged["nodes"] == [first["nodes"][0], second["nodes"][1]]
+    assert merged["edges"] == [first["edges"][0], second["edges"][1]]
+
+
+@pytest.mark.parametrize("policy, expected", [
+    ("first", {"id": "A", "label": "A", "people": None}),
+    ("last", {"id": "A", "label": "Author A", "people": 3}),
+    ("fill", {"id": "A", "label": "A", "people": 3}),
+    (lambda existing, new: {**existing, "people": (existing["people"] or 0) + new["people"]},
+     {"id": "A", "label": "A", "people": 3}),
+], ids=["first", "last", "fill", "function"])
+def test_merge_graphs_policies(policy, expected):
+    """ The merge policy decides which attributes a repeated node keeps, without modifying the input graphs, and the merged node keeps its first position. """
+    first = {"nodes": [{"id": "A", "label": "A", "people": None}, {"id": "B", "label": "B"}], "edges": []}
+    second = {"nodes": [{"id": "A", "label": "Author A", "people": 3}], "edges": []}
+    merged = merge_graphs(iter([first, second]), policy=policy)
+    assert merged["nodes"] == [expected, {"id": "B", "label": "B"}]
+    assert first["nodes"][0] == {"id": "A", "label": "A", "people": None}
+
+
+def test_columnar_graph_round_trips():
+    """ Expanding the columnar graph gives back every edge and every distinct node, in order; the repeated Chemistry node is sent once. """
+    assert expand(to_columnar_graph(GRAPH)) == {"nodes": GRAPH["nodes"][:3], "edges": GRAPH["edges"]}
+
+
+def test_columnar_graph_interns_and_elides_values():
+    """ Types and labels are sent once and referenced by index, NUMBER node labels and "start-end" edge ids are null, and an endpoint without a node is appended to ids after the nodes. """
+    columnar = to_columnar_graph(GRAPH)
+    assert columnar["ids"] == ["https://openalex.org/I1", "Chemistry", 42, "https://openalex.org/A1"]
+    assert columnar["types"] == ["INSTITUTION", "TOPIC", "NUMBER", "AUTHOR"]
+    assert columnar["labels"] == ["researches", "number", "memberOf"]
+    assert columnar["nodes"] == {"label": ["Example University", None, None], "type": [0, 1, 2]}
+    assert columnar["edges"]["id"] == [None, None, "membership"]
+    assert columnar["edges"]["start"] == [0, 1, 3]
+    assert columnar["edges"]["end_type"] == [1, 2, 0]
+
+
+def test_columnar_graph_keeps_node_attributes():
+    """ Attributes beyond id, label and type, such as a subfield's people, get their own node column. """
+    builder = GraphBuilder()
+    builder.node("Chemistry", "Chemistry", "SUBFIELD", people=12.5)
+    builder.node("Catalysis", "Catalysis", "TOPIC")
+    builder.edge("Chemistry", "Catalysis", "has_topic", "SUBFIELD", "TOPIC")
+    columnar = to_columnar_graph(builder.to_dict())
+    assert columnar["nodes"]["people"] == [12.5, None]
+    assert expand(columnar) == builder.to_dict()
+
+
+def test_initial_search_returns_requested_format(client):
+    """ The graph is only converted when format=columnar is asked for, either in the query string or the body, and other fields are left alone. """
+    results = {"metadata": {"name": "Chemistry"}, "graph": GRAPH, "list": []}
+    with patch("backend.app.get_subfield_results", return_value=results):
+        default = client.post("/initial-search", json={"topic": "Chemistry"}).get_json()
+        by_query = client.post("/initial-search?format=columnar", json={"topic": "Chemistry"}).get_json()
+        by_body = client.post("/initial-search", json={"topic": "Chemistry", "format": "columnar"}).get_json()
+    assert default["graph"] == GRAPH
+    assert by_query["graph"] == by_body["graph"] == to_columnar_graph(GRAPH)
+    assert by_query["metadata"] == {"name": "Chemistry"}
+
+
+def test_initial_search_rejects_unknown_format(client):
+    """ An unknown format is answered with a 400 before any search runs. """
+    with patch("backend.app.get_subfield_results") as mock_search:
+        response = client.post("/initial-search?format=xml", json={"topic": "Chemistry"})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Unsupported format"}
+    mock_search.assert_not_called()
@@ -0,0 +1,241 @@
+"""
+HTTP Client Test Suite
+
+This module contains tests for HttpClient, the shared client every OpenAlex and SemOpenAlex call
+goes through, its per-host circuit breakers and the request deadline.
+The tests cover:
+  - Applying the default (connect, read) timeout unless the caller passes one.
+  - Retrying GETs on 429, 5xx and connection errors, honouring Retry-After, and giving up after max_retries.
+  - Not retrying POSTs unless the caller asks for it.
+  - Rejecting requests when a host has no free slot.
+  - Counting requests, errors, retries and latency per host.
+  - Opening, half-opening and closing a circuit, and short-circuiting calls while it is open.
+  - Backing off from 429s and passing on client errors without counting them as circuit failures.
+  - Cutting timeouts to the request deadline, failing fast once it has passed and carrying it to the fan-out pool.
+  - Reporting the hosts that could not answer on /initial-search.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from backend.app import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    HttpClient,
+    RequestBudget,
+    UpstreamBusyError,
+    fetch_concurrently,
+    remaining_request_time,
+    request_budget,
+)
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+def response(status_code, headers=None):
+    return MagicMock(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture
+def http():
+    http = HttpClient(connect_timeout=1, read_timeout=2, max_retries=2, backoff=0, queue_timeout=0.05,
+                        failure_threshold=100)
+    http._session = MagicMock()
+    return http
+
+
+@pytest.fixture
+def budget():
+    budget = RequestBudget(10)
+    token = request_budget.set(budget)
+    yield budget
+    request_budget.reset(token)
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_default_timeout_is_applied(http):
+    """ Every request gets the client's (connect, read) timeout, and a timeout passed by the caller wins. """
+    http._session.request.return_value = response(200)
+    http.get("https://api.openalex.org/authors/A1")
+    assert http._session.request.call_args[1]["timeout"] == (1, 2)
+    http.get("https://api.openalex.org/authors/A1", timeout=5)
+    assert http._session.request.call_args[1]["timeout"] == 5
+
+
+def test_get_is_retried_until_success(http):
+    """ A GET that gets a 503 and then a connection error is retried and returns the final 200 response. """
+    ok = response(200)
+    http._session.request.side_effect = [response(503), requests.exceptions.ConnectionError(), ok]
+    with patch("backend.app.time.sleep") as mock_sleep:
+        assert http.get("https://api.openalex.org/works") is ok
+    assert mock_sleep.call_count == 2
+    stats = http.get_stats()["api.openalex.org"]
+    assert (stats["requests"], stats["errors"], stats["retries"], stats["in_flight"]) == (3, 2, 2, 0)
+
+
+def test_retries_give_up_after_max_retries(http):
+    """ After max_retries the last 429 response is returned to the caller, and a last connection error is raised. """
+    http._session.request.return_value = response(429)
+    with patch("backend.app.time.sleep"):
+        assert http.get("https://api.openalex.org/works").status_code == 429
+    assert http._session.request.call_count == 3
+    http._session.request.side_effect = requests.exceptions.Timeout()
+    with patch("backend.app.time.sleep"), pytest.raises(requests.exceptions.Timeout):
+        http.get("https://api.openalex.org/works")
+
+
+def test_retry_after_is_honoured_and_capped(http):
+    """ A numeric Retry-After header sets the delay before the next attempt, capped at max_backoff. """
+    http.max_backoff = 8
+    http._session.request.side_effect = [response(429, {"Retry-After": "3"}), response(429, {"Retry-After": "120"}),
+                                            response(200)]
+    with patch("backend.app.time.sleep") as mock_sleep:
+        http.get("https://api.openalex.org/works")
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [3.0, 8]
+
+
+def test_post_is_only_retried_when_asked(http):
+    """ A POST that fails is returned as is, unless the caller passes retry=True because the request is safe to repeat. """
+    http._session.request.side_effect = [response(502), response(502), response(200)]
+    with patch("backend.app.time.sleep"):
+        assert http.post("https://semopenalex.org/sparql").status_code == 502
+        assert http.post("https://semopenalex.org/sparql", retry=True).status_code == 200
+
+
+def test_busy_host_rejects_requests(http):
+    """ When max_per_host requests to a host are in flight, another request to it waits queue_timeout and then raises UpstreamBusyError, while other hosts are unaffected. """
+    http.max_per_host = 1
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_request(method, url, **kwargs):
+        if "api.openalex.org" in url:
+            started.set()
+            release.wait(1)
+        return response(200)
+
+    http._session.request.side_effect = slow_request
+    worker = threading.Thread(target=http.get, args=("https://api.openalex.org/works",))
+    worker.start()
+    started.wait(1)
+    with pytest.raises(UpstreamBusyError):
+        http.get("https://api.openalex.org/authors")
+    assert http.get("https://semopenalex.org/sparql").status_code == 200
+    release.set()
+    worker.join()
+    assert http.get_stats()["api.openalex.org"]["rejected"] == 1
+
+
+def test_circuit_opens_half_opens_and_closes():
+    """ The circuit opens after failure_threshold consecutive failures, lets one trial call through after reset_timeout, reopens if the trial fails and closes if it succeeds. """
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    with patch("backend.app.time.monotonic", return_value=breaker._opened_at + 31):
+        assert breaker.allow()
+        assert breaker.state == CircuitBreaker.HALF_OPEN and not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+    with patch("backend.app.time.monotonic", return_value=breaker._opened_at + 31):
+        assert breaker.allow()
+        breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+    assert breaker.get_stats() == {"state": "closed", "consecutive_failures": 0, "times_opened": 2}
+
+
+def test_open_circuit_short_circuits_requests(http, budget):
+    """ Once a host's failures open its circuit, requests to it raise CircuitOpenError without touching the network, the host is recorded as degraded, and other hosts still get through. """
+    http.failure_threshold = 3
+    http._session.request.return_value = response(503)
+    with patch("backend.app.time.sleep"):
+        assert http.get("https://semopenalex.org/sparql").status_code == 503
+        with pytest.raises(CircuitOpenError):
+            http.get("https://semopenalex.org/sparql")
+    assert http._session.request.call_count == 3
+    http._session.request.return_value = response(200)
+    assert http.get("https://api.openalex.org/works").status_code == 200
+    stats = http.get_stats()
+    assert stats["semopenalex.org"]["short_circuited"] == 1
+    assert stats["semopenalex.org"]["circuit"]["state"] == "open"
+    assert stats["api.openalex.org"]["circuit"]["state"] == "closed"
+    assert budget.degraded == {"semopenalex.org"}
+
+
+def test_rate_limits_and_client_errors_do_not_open_circuit(http):
+    """ 429 responses are backed off from and errors raised before a request is sent are passed on, without either counting as a circuit failure. """
+    http.failure_threshold = 2
+    http._session.request.return_value = response(429)
+    with patch("backend.app.time.sleep") as mock_sleep:
+        assert http.get("https://api.openalex.org/works").status_code == 429
+    assert mock_sleep.call_count == 2
+    http._session.request.side_effect = requests.exceptions.InvalidURL()
+    with pytest.raises(requests.exceptions.InvalidURL):
+        http.get("https://api.openalex.org/works")
+    assert http.get_stats()["api.openalex.org"]["circuit"] == {"state": "closed", "consecutive_failures": 0,
+                                                                "times_opened": 0}
+
+
+def test_half_open_trial_is_released_on_rate_limit():
+    """ A half-open trial call answered with a 429 neither closes nor reopens the circuit but lets the next trial through. """
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    with patch("backend.app.time.monotonic", return_value=breaker._opened_at + 31):
+        assert breaker.allow() and not breaker.allow()
+        breaker.release()
+        assert breaker.state == CircuitBreaker.HALF_OPEN and breaker.allow()
+
+
+def test_request_deadline_caps_timeouts_and_fails_fast(http, budget):
+    """ Inside a request, connect and read timeouts are cut to the time left, a retry that would outlast the deadline is not made, and once the deadline has passed requests raise DeadlineExceededError at once. """
+    budget.deadline = budget.deadline - 8.5
+    http._session.request.return_value = response(429, {"Retry-After": "5"})
+    assert http.get("https://api.openalex.org/works").status_code == 429
+    connect, read = http._session.request.call_args[1]["timeout"]
+    assert connect == 1 and read <= 1.5
+    assert http._session.request.call_count == 1
+    budget.deadline = 0
+    with pytest.raises(DeadlineExceededError):
+        http.get("https://api.openalex.org/works")
+    assert http._session.request.call_count == 1
+    assert budget.degraded == {"api.openalex.org"}
+
+
+def test_fan_out_keeps_request_deadline(budget):
+    """ Lookups run on the metadata pool see the caller's request deadline, and the fan-out wait is cut to it. """
+    budget.deadline = budget.deadline - 9
+    [remaining] = fetch_concurrently((remaining_request_time,), timeout=20)
+    assert 0 < remaining <= 1
+    assert remaining_request_time() is not None
+
+
+def test_initial_search_reports_degraded_upstreams(client):
+    """ A search whose fallback could not reach an upstream is returned with partial set and the host in X-Degraded-Upstreams, and one that failed fast returns an empty result with the same header. """
+    def partial_search(institution, page, per_page):
+        request_budget.get().degraded.add("semopenalex.org")
+        return {"metadata": {"name": institution}, "graph": {"nodes": [], "edges": []}, "list": []}
+
+    def failed_search(institution, page, per_page):
+        request_budget.get().degraded.add("api.openalex.org")
+        raise CircuitOpenError("Circuit open for api.openalex.org", "api.openalex.org")
+
+    with patch("backend.app.get_institution_results", side_effect=partial_search):
+        partial = client.post("/initial-search", json={"organization": "Example University"})
+    with patch("backend.app.get_institution_results", side_effect=failed_search):
+        failed = client.post("/initial-search", json={"organization": "Example University"})
+    assert partial.get_json()["partial"] is True
+    assert partial.get_json()["degraded_upstreams"] == ["semopenalex.org"]
+    assert partial.headers["X-Degraded-Upstreams"] == "semopenalex.org"
+    assert failed.status_code == 200 and failed.get_json() == {}
+    assert failed.headers["X-Degraded-Upstreams"] == "api.openalex.org"
+    assert request_budget.get() is None
@@ -0,0 +1,166 @@
+"""
+Institution Subfield Harvest Test Suite
+
+This module contains tests for harvesting the subfields of an institution's authors from OpenAlex
+into institution_author_subfields, and for list_given_institution reading them.
+The tests cover:
+  - Answering from harvested counts without calling OpenAlex.
+  - Queuing an institution that has not been harvested and counting a capped number of live pages meanwhile.
+  - Requesting the next cursor page while the current one is processed.
+  - Full and incremental (from_updated_date) harvests.
+  - The harvest-institution-subfields command, which harvests in full without an API key.
+"""
+
+import datetime
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.app import (
+    app,
+    harvest_institution_subfields,
+    iter_openalex_pages,
+    list_given_institution,
+)
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+ROR = "https://ror.org/01zkghx44"
+
+
+def author(author_id, *subfields, rors=(ROR,)):
+    return {
+        "id": author_id,
+        "topics": [{"subfield": {"display_name": subfield}} for subfield in subfields],
+        "last_known_institutions": [{"ror": ror} for ror in rors],
+    }
+
+
+def page(results, next_cursor=None):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"results": results, "meta": {"next_cursor": next_cursor}}
+    return response
+
+
+def paged_get(pages):
+    """Fake http_client.get answering each cursor with the matching page: cursor * is page 0, cursor "1" page 1, ..."""
+    def get(url, params=None, **kwargs):
+        index = 0 if params["cursor"] == "*" else int(params["cursor"])
+        next_cursor = str(index + 1) if index + 1 < len(pages) else None
+        return page(pages[index], next_cursor)
+    return get
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield executor
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_harvested_counts_skip_openalex():
+    """ An institution that has been harvested is answered from its stored counts, keeping subfields with more than 5 authors, without an HTTP call. """
+    with patch("backend.app.fetch_institution_subfield_counts", return_value=[("Chemistry", 12), ("Physics", 3)]), \
+            patch("backend.app.http_client.get") as mock_get:
+        subfields, graph = list_given_institution(ROR, "Example University", "https://openalex.org/I1")
+    mock_get.assert_not_called()
+    assert subfields == [("Chemistry", 12)]
+    assert {"id": "Chemistry:12", "label": 12, "type": "NUMBER"} in graph["nodes"]
+
+
+def test_unharvested_institution_is_queued_and_read_live(monkeypatch):
+    """ An institution without a harvest is queued for the next one and counted from the first INSTITUTION_SUBFIELDS_LIVE_PAGES pages of its authors. """
+    monkeypatch.setattr("backend.app.INSTITUTION_SUBFIELDS_LIVE_PAGES", 2)
+    pages = [[author(f"A{i}", "Chemistry", "Chemistry") for i in range(3)]] * 3
+    with patch("backend.app.fetch_institution_subfield_counts", return_value=None), \
+            patch("backend.app.request_institution_harvest") as mock_request, \
+            patch("backend.app.http_client.get", side_effect=paged_get(pages)) as mock_get:
+        subfields, _ = list_given_institution(ROR, "Example University", "https://openalex.org/I1")
+    mock_request.assert_called_once_with(ROR)
+    assert mock_get.call_count == 2
+    assert subfields == [("Chemistry", 12)]
+
+
+def test_next_page_is_requested_while_current_page_is_processed(executor):
+    """ The request for the next cursor page is sent before the caller has finished with the current page, and every page is still yielded in order. """
+    second_requested = threading.Event()
+    get = paged_get([["first"], ["second"], ["third"]])
+
+    def tracking_get(url, params=None, **kwargs):
+        if params["cursor"] == "1":
+            second_requested.set()
+        return get(url, params=params, **kwargs)
+
+    with patch("backend.app.http_client.get", side_effect=tracking_get):
+        pages = iter_openalex_pages("https://api.openalex.org/authors", {"filter": "x"}, executor)
+        assert next(pages) == ["first"]
+        assert second_requested.wait(1)
+        assert list(pages) == [["second"], ["third"]]
+
+
+def test_full_harvest_stores_pages_and_drops_leavers(executor):
+    """ A first harvest reads every author, stores each page with the author's current institutions and subfield counts, and passes every author read so authors who left are dropped. """
+    pages = [[author("A1", "Chemistry", "Physics", "Chemistry")], [author("A2", "Physics", rors=(ROR, "https://ror.org/other"))]]
+    with patch("backend.app.http_client.get", side_effect=paged_get(pages)) as mock_get, \
+            patch("backend.app.execute_query", return_value=[(1,)]) as mock_query:
+        assert harvest_institution_subfields("01zkghx44", None, executor) == 2
+    assert mock_get.call_args_list[0][1]["params"]["filter"] == f"last_known_institutions.ror:{ROR}"
+    store_calls = [call[0][1] for call in mock_query.call_args_list if "store_institution_author_subfields" in call[0][0]]
+    assert [json.loads(params[1]) for params in store_calls] == [
+        [{"author_id": "A1", "rors": [ROR], "subfields": {"Chemistry": 2, "Physics": 1}}],
+        [{"author_id": "A2", "rors": [ROR, "https://ror.org/other"], "subfields": {"Physics": 1}}],
+    ]
+    finish_query, finish_params = mock_query.call_args_list[-1][0]
+    assert "finish_institution_harvest" in finish_query
+    assert finish_params[0] == ROR and finish_params[2] == ["A1", "A2"]
+
+
+def test_incremental_harvest_filters_on_updated_date(executor):
+    """ An institution harvested before only reads authors OpenAlex updated since that day, and keeps the authors it did not see. """
+    since = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+    with patch("backend.app.http_client.get", side_effect=paged_get([[author("A1", "Chemistry")]])) as mock_get, \
+            patch("backend.app.execute_query", return_value=[(1,)]) as mock_query:
+        harvest_institution_subfields(ROR, since, executor)
+    assert mock_get.call_args[1]["params"]["filter"] == f"last_known_institutions.ror:{ROR},from_updated_date:2024-05-01"
+    assert mock_query.call_args_list[-1][0][1][2] is None
+
+
+def test_harvest_command_reports_failures():
+    """ The command harvests every due institution, incrementally when it has been harvested before, keeps going past a failed institution and exits with an error at the end. """
+    due = [(ROR, None), ("https://ror.org/other", datetime.datetime(2024, 5, 1))]
+
+    def harvest(ror, since, executor):
+        if ror == ROR:
+            return 40
+        raise RuntimeError("OpenAlex returned 503")
+
+    with patch("backend.app.OPENALEX_API_KEY", "key"), \
+            patch("backend.app.execute_query", return_value=due) as mock_query, \
+            patch("backend.app.harvest_institution_subfields", side_effect=harvest) as mock_harvest:
+        result = app.test_cli_runner().invoke(args=["harvest-institution-subfields"])
+    assert result.exit_code == 1
+    assert f"{ROR}: 40 authors read" in result.output
+    assert "https://ror.org/other: failed: OpenAlex returned 503" in result.output
+    assert [call[0][1] for call in mock_harvest.call_args_list] == [None, datetime.datetime(2024, 5, 1)]
+    assert mock_query.call_args[0][1][0] is None
+
+
+def test_harvest_command_without_api_key_is_full():
+    """ Without OPENALEX_API_KEY the command cannot use from_updated_date, so institutions harvested before are read in full. """
+    due = [("https://ror.org/other", datetime.datetime(2024, 5, 1))]
+    with patch("backend.app.OPENALEX_API_KEY", None), \
+            patch("backend.app.execute_query", return_value=due), \
+            patch("backend.app.harvest_institution_subfields", return_value=7) as mock_harvest:
+        result = app.test_cli_runner().invoke(args=["harvest-institution-subfields"])
+    assert result.exit_code == 0
+    assert mock_harvest.call_args[0][1] is None
+    assert "https://ror.org/other: 7 authors read" in result.output
@@ -0,0 +1,83 @@
+"""
+Name Resolution Test Suite
+
+This module contains tests for resolving misspelled researcher and institution names locally
+instead of falling back to the SPARQL/OpenAlex lookups.
+The tests cover:
+  - Keeping researcher names typed in mixed case as typed.
+  - Correcting institution typos in process, without matching names that only share words.
+  - Retrying a database miss with the corrected institution name before any remote call.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+import backend.app as backend_app
+from backend.app import (
+    AutocompleteIndex,
+    edit_distance,
+    get_institution_results,
+    normalize_researcher_name,
+)
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+@pytest.fixture
+def known_institutions(monkeypatch):
+    index = AutocompleteIndex(["Harvard University", "Temple University", "Georgia Institute of Technology",
+                               "Spelman College"])
+    monkeypatch.setattr(backend_app, "institution_autocomplete", index)
+    return index
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+@pytest.mark.parametrize("typed, expected", [
+    ("lew lefton", "Lew Lefton"),
+    ("LEW LEFTON", "Lew Lefton"),
+    ("Ronald McDonald", "Ronald McDonald"),
+    ("Anne van der Berg", "Anne van der Berg"),
+])
+def test_researcher_names_are_only_title_cased_when_typed_in_one_case(typed, expected):
+    """ Input typed all lower or upper case is title-cased as before, while names the user typed with deliberate capitalization are passed to the search unchanged. """
+    assert normalize_researcher_name(typed) == expected
+
+
+def test_edit_distance_counts_swaps_as_one_edit():
+    """ Swapped neighbouring letters, a common typo, cost one edit like an insertion or deletion does. """
+    assert edit_distance("havrard", "harvard") == 1
+    assert edit_distance("colege", "college") == 1
+    assert edit_distance("kitten", "sitting") == 3
+
+
+def test_closest_match_corrects_typos_only(known_institutions):
+    """ Small typos and case differences resolve to the listed institution, while a different institution that merely ends in "University" is not treated as a typo. """
+    assert known_institutions.closest_match("Havard University") == "Harvard University"
+    assert known_institutions.closest_match("georgia insitute of technology") == "Georgia Institute of Technology"
+    assert known_institutions.closest_match("spelman college") == "Spelman College"
+    assert known_institutions.closest_match("Example University") is None
+
+
+def test_database_miss_is_retried_with_corrected_name(known_institutions):
+    """ When the database has no institution named as typed, get_institution_results retries the database with the corrected name and never calls the SPARQL fallback. """
+    payload = {
+        "institution_metadata": {
+            "url": "https://www.harvard.edu", "num_of_works": 10, "institution_name": "Harvard University",
+            "num_of_citations": 5, "openalex_url": "https://openalex.org/I1", "num_of_authors": 2,
+            "ror": "https://ror.org/1",
+        },
+        "data": [],
+        "total_count": 0,
+    }
+    with patch("backend.app.execute_query", side_effect=[[(None,)], [(payload,)]]) as mock_query, \
+            patch("backend.app.get_institution_metadata_sparql") as mock_sparql:
+        result = get_institution_results("Havard University", page=1, per_page=10)
+    assert [call[0][1][0] for call in mock_query.call_args_list] == ["Havard University", "Harvard University"]
+    assert result["metadata"]["name"] == "Harvard University"
+    mock_sparql.assert_not_called()
@@ -0,0 +1,176 @@
+"""
+Search Pagination Test Suite
+
+This module contains tests for pushing /initial-search pagination into the search SQL functions.
+The tests cover:
+  - Calling the paged SQL overloads with the page window the handler renders.
+  - Using total_count from paged payloads and slicing full payloads.
+  - Building the topic map from map_data instead of the full institution list.
+  - Embedding map coordinates in topic results on request.
+  - Opaque keyset cursors for topic and institution + topic result lists.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.app import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    get_institution_and_subfield_results,
+    get_subfield_results,
+    page_rows,
+    search_by_author_institution_topic,
+    search_query,
+)
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_search_query_uses_paged_overload_only_with_a_limit():
+    """ Without a page_limit the search SQL function is called with just the names; with one, the page window is appended so Postgres returns only that page. """
+    assert search_query("search_by_institution_by_name", ("MIT",)) == \
+        ("SELECT search_by_institution_by_name(%s);", ("MIT",))
+    assert search_query("search_by_institution_by_name", ("MIT",), 20, 40) == \
+        ("SELECT search_by_institution_by_name(%s, %s, %s);", ("MIT", 20, 40))
+
+
+def test_page_rows_handles_paged_and_full_payloads():
+    """ A paged payload is rendered as-is with its total_count, while a full payload (such as one built by hand in a test or an older cached entry) is sliced in Python. """
+    assert page_rows({"data": [3, 4], "total_count": 10}, page=2, per_page=2) == ([3, 4], 10)
+    assert page_rows({"data": [1, 2, 3, 4, 5]}, page=2, per_page=2) == ([3, 4], 5)
+
+
+def test_handler_requests_only_the_rendered_page():
+    """ get_institution_and_subfield_results asks for the page it renders (offset 40 for page 3 of 20) and reports the page count from total_count rather than from the rows it received. """
+    payload = {
+        "institution_metadata": {"url": "https://example.edu", "openalex_url": "https://openalex.org/I1", "ror": "ror"},
+        "subfield_metadata": [{"topic": "Topic", "subfield_url": "https://openalex.org/subfields/1"}],
+        "totals": {"total_num_of_works": 100, "total_num_of_citations": 50, "total_num_of_authors": 45},
+        "data": [{"author_id": "A1", "author_name": "Author One", "num_of_works": 3}],
+        "total_count": 45,
+    }
+    with patch("backend.app.execute_query", return_value=[(payload,)]) as mock_query:
+        result = get_institution_and_subfield_results("Example University", "Chemistry", page=3, per_page=20)
+    query, params = mock_query.call_args[0]
+    assert "search_by_institution_topic_by_name(%s, %s, %s, %s)" in query
+    assert params == ("Example University", "Chemistry", 20, 40)
+    assert result["list"] == [("Author One", 3)]
+    assert result["metadata_pagination"] == {"total_pages": 3, "current_page": 3, "total_topics": 45, "next_cursor": None}
+
+
+def test_subfield_results_use_map_data_for_coordinates():
+    """ The topic search gets the map's top institutions from map_data, so the page of institutions and the map markers are both served without fetching every institution. """
+    payload = {
+        "subfield_metadata": [{"topic": "Topic", "subfield_url": "https://openalex.org/subfields/1"}],
+        "totals": {"total_num_of_works": 10, "total_num_of_citations": 5, "total_num_of_authors": 4},
+        "data": [{"institution_id": "I2", "institution_name": "Second", "num_of_authors": 2}],
+        "map_data": [{"institution_id": "I1", "institution_name": "First", "num_of_authors": 3},
+                     {"institution_id": "I2", "institution_name": "Second", "num_of_authors": 2}],
+        "total_count": 2,
+    }
+    with patch("backend.app.execute_query", return_value=[(payload,)]) as mock_query:
+        result = get_subfield_results("chemistry", page=2, per_page=1, map_limit=2)
+    assert mock_query.call_args[0][1] == ("chemistry", 1, 1, 2)
+    assert result["list"] == [("Second", 2)]
+    assert result["coordinates"] == [("I2", "Second", 2), ("I1", "First", 3), ("I2", "Second", 2)]
+    assert result["metadata_pagination"]["total_pages"] == 2
+
+
+def test_subfield_results_embed_map_points_on_request():
+    """ With include_coordinates the topic search turns the latitude/longitude joined onto map_data into ready-to-plot markers, skipping institutions that have no stored coordinates; without it the response is unchanged. """
+    payload = {
+        "subfield_metadata": [{"topic": "Topic", "subfield_url": "https://openalex.org/subfields/1"}],
+        "totals": {"total_num_of_works": 10, "total_num_of_citations": 5, "total_num_of_authors": 4},
+        "data": [{"institution_id": "I1", "institution_name": "First", "num_of_authors": 3, "num_of_works": 7}],
+        "map_data": [{"institution_id": "I1", "institution_name": "First", "num_of_authors": 3, "latitude": 1.5, "longitude": -2.5},
+                     {"institution_id": "I2", "institution_name": "Second", "num_of_authors": 2, "latitude": None, "longitude": None}],
+        "total_count": 2,
+    }
+    with patch("backend.app.execute_query", return_value=[(payload,)]):
+        with_points = get_subfield_results("chemistry", page=1, per_page=1, map_limit=2, include_coordinates=True)
+        without_points = get_subfield_results("chemistry", page=1, per_page=1, map_limit=2)
+    assert with_points["map_points"] == [{"institution_id": "I1", "lat": 1.5, "lng": -2.5, "name": "First", "authors": 3}]
+    assert "map_points" not in without_points
+
+
+def test_paged_name_search_passes_page_window():
+    """ The three-name search forwards the page window after the names to its by-name SQL function. """
+    with patch("backend.app.execute_query", return_value=[({"data": [], "total_count": 0},)]) as mock_query:
+        search_by_author_institution_topic("Author", "Institution", "Topic", page_limit=10, page_offset=0)
+    query, params = mock_query.call_args[0]
+    assert query == "SELECT search_by_author_institution_topic_by_name(%s, %s, %s, %s, %s);"
+    assert params == ("Author", "Institution", "Topic", 10, 0)
+
+
+def test_cursor_round_trip_and_validation():
+    """ A cursor encodes the sort key of the last row for one kind of search and its search terms; decoding it for another kind or other search terms, decoding a sort key with the wrong types, or decoding garbage, raises InvalidCursorError. """
+    columns = ("num_of_authors", "num_of_works", "institution_id")
+    cursor = encode_cursor("topic", [12, 40, "https://openalex.org/I1"], ["chemistry"])
+    assert decode_cursor(cursor, "topic", columns, ["chemistry"]) == [12, 40, "https://openalex.org/I1"]
+    for bad_cursor, kind, search in [
+        (cursor, "institution_topic", ["chemistry"]),
+        (cursor, "topic", ["physics"]),
+        (encode_cursor("topic", ["x", "y", "z"], ["chemistry"]), "topic", ["chemistry"]),
+        (encode_cursor("topic", [12, True, 3], ["chemistry"]), "topic", ["chemistry"]),
+        ("not a cursor", "topic", ["chemistry"]),
+    ]:
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(bad_cursor, kind, columns, search)
+
+
+def test_topic_search_follows_cursor_with_keyset_query():
+    """ The first page of a topic search returns a next_cursor built from its last row, and sending that cursor back runs the keyset query starting after that row rather than an offset query. """
+    def payload(rows):
+        return {
+            "subfield_metadata": [{"topic": "Topic", "subfield_url": "https://openalex.org/subfields/1"}],
+            "totals": {"total_num_of_works": 10, "total_num_of_citations": 5, "total_num_of_authors": 4},
+            "data": rows,
+            "map_data": [],
+            "total_count": 3,
+        }
+    first_page = [{"institution_id": "I9", "institution_name": "Nine", "num_of_authors": 9, "num_of_works": 20},
+                  {"institution_id": "I8", "institution_name": "Eight", "num_of_authors": 5, "num_of_works": 11}]
+    second_page = [{"institution_id": "I7", "institution_name": "Seven", "num_of_authors": 1, "num_of_works": 2}]
+
+    with patch("backend.app.execute_query", side_effect=[[(payload(first_page),)], [(payload(second_page),)]]) as mock_query:
+        first = get_subfield_results("chemistry", page=1, per_page=2, map_limit=5)
+        cursor = first["metadata_pagination"]["next_cursor"]
+        second = get_subfield_results("chemistry", page=2, per_page=2, map_limit=5, cursor=cursor)
+    query, params = mock_query.call_args[0]
+    assert query == "SELECT search_by_topic_after(%s, %s, %s, %s, %s, %s);"
+    assert params == ("chemistry", 2, 5, 11, "I8", 5)
+    assert second["list"] == [("Seven", 1)]
+    assert second["metadata_pagination"]["next_cursor"] is None
+
+
+def test_institution_topic_cursor_uses_keyset_query():
+    """ An institution + topic search with a cursor asks the by-name keyset function for the authors after the (num_of_works, author_id) stored in the cursor. """
+    cursor = encode_cursor("institution_topic", [7, "https://openalex.org/A5"], ["Example University", "Chemistry"])
+    with patch("backend.app.execute_query", return_value=[(None,)]) as mock_query, \
+            patch("backend.app.get_institution_and_topic_metadata_sparql", return_value={}):
+        get_institution_and_subfield_results("Example University", "Chemistry", page=2, per_page=20, cursor=cursor)
+    query, params = mock_query.call_args[0]
+    assert query == "SELECT search_by_institution_topic_by_name_after(%s, %s, %s, %s, %s);"
+    assert params == ("Example University", "Chemistry", 20, 7, "https://openalex.org/A5")
+
+
+def test_initial_search_rejects_invalid_cursor(client):
+    """ /initial-search answers a malformed cursor with a 400 instead of the generic error payload. """
+    response = client.post("/initial-search", json={"topic": "Chemistry", "researcher": "", "cursor": "bogus"})
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid cursor"}
+
+
+def test_initial_search_rejects_mistyped_cursor(client):
+    """ A well-formed cursor whose sort key has the wrong types, or that was made for another search, gets the same 400 before any query runs rather than falling back to another search. """
+    for cursor in [encode_cursor("institution_topic", ["x", "y"], ["Example University", "Chemistry"]),
+                   encode_cursor("institution_topic", [7, "https://openalex.org/A5"], ["Other University", "Chemistry"])]:
+        with patch("backend.app.execute_query") as mock_query:
+            response = client.post("/initial-search", json={"organization": "Example University", "topic": "Chemistry", "cursor": cursor})
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Invalid cursor"}
+        mock_query.assert_not_called()
@@ -0,0 +1,237 @@
+"""
+Response Cache Test Suite
+
+This module contains tests for the namespaced cache in front of the database searches and
+the OpenAlex/SemOpenAlex calls.
+The tests cover:
+  - Serving a page of search results that was already fetched from the cache.
+  - Normalizing the search inputs used as cache keys.
+  - Caching OpenAlex author, geo and SPARQL responses, but not failures.
+  - The memory, SQLite and Redis-protocol backends, per-namespace TTLs and counters.
+  - Missing cached search results once the search data version changes.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import backend.app as backend_app
+from backend.app import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+    app,
+    fetch_last_known_institutions,
+    get_geo_info,
+    get_institution_results,
+    query_SPARQL_endpoint,
+    search_by_institution,
+)
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+INSTITUTION_PAYLOAD = {
+    "institution_metadata": {
+        "url": "https://www.example.edu",
+        "num_of_works": 100,
+        "institution_name": "Example University",
+        "num_of_citations": 1000,
+        "openalex_url": "https://openalex.org/I1",
+        "num_of_authors": 10,
+        "ror": "https://ror.org/example",
+    },
+    "data": [{"topic_subfield": f"Subfield {i}", "num_of_authors": 1} for i in range(4)],
+    "subfield_metadata": {f"Subfield {i}": [] for i in range(4)},
+}
+
+
+class FakeRedis:
+    """Minimal stand-in for a Redis-protocol client."""
+
+    def __init__(self):
+        self.store = {}
+        self.expiries = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode()
+        self.expiries[key] = ex
+
+    def scan_iter(self, match="*"):
+        prefix = match.rstrip("*")
+        return [key for key in list(self.store) if key.startswith(prefix)]
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    cache = ResponseCache(MemoryCacheBackend(max_entries=8))
+    monkeypatch.setattr(backend_app, "response_cache", cache)
+    return cache
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_revisiting_a_page_is_served_from_cache(memory_cache):
+    """ Each page of an institution search is fetched from Postgres once; going back to a page already seen is answered from the cache, and the cached metadata is not modified by building a response. """
+    def paged_payload(query, params):
+        offset = params[2]
+        return [(dict(INSTITUTION_PAYLOAD, data=INSTITUTION_PAYLOAD["data"][offset:offset + 2], total_count=4),)]
+
+    with patch("backend.app.execute_query", side_effect=paged_payload) as mock_query:
+        first = get_institution_results("Example University", page=1, per_page=2)
+        second = get_institution_results("Example University", page=2, per_page=2)
+        again = get_institution_results("Example University", page=1, per_page=2)
+    assert mock_query.call_count == 2
+    assert first["list"] == again["list"] == [("Subfield 0", 1), ("Subfield 1", 1)]
+    assert second["list"] == [("Subfield 2", 1), ("Subfield 3", 1)]
+    assert "homepage" not in INSTITUTION_PAYLOAD["institution_metadata"]
+    assert memory_cache.get_stats()["namespaces"]["search"] == {"hits": 1, "misses": 2, "errors": 0}
+
+
+def test_cache_key_uses_normalized_input(memory_cache):
+    """ Extra whitespace in the search box maps to the same cache entry, and the normalized name is what is sent to Postgres. """
+    with patch("backend.app.execute_query", return_value=[(INSTITUTION_PAYLOAD,)]) as mock_query:
+        search_by_institution("Example University")
+        search_by_institution("  Example   University ")
+    assert mock_query.call_count == 1
+    assert mock_query.call_args[0][1] == ("Example University",)
+
+
+def test_missing_results_are_not_cached(memory_cache):
+    """ A search that finds nothing (or fails) is retried on the next request instead of caching the miss. """
+    with patch("backend.app.execute_query", return_value=[(None,)]) as mock_query:
+        assert search_by_institution("Nowhere") is None
+        assert search_by_institution("Nowhere") is None
+    assert mock_query.call_count == 2
+
+
+def test_openalex_and_sparql_responses_are_cached(memory_cache):
+    """ fetch_last_known_institutions, get_geo_info and query_SPARQL_endpoint each make one HTTP call for repeated lookups, using their own namespaces. """
+    author_response = MagicMock(status_code=200)
+    author_response.json.return_value = {"last_known_institutions": [{"display_name": "Example University"}]}
+    geo_response = MagicMock(status_code=200)
+    geo_response.json.return_value = {"geo": {"latitude": 1.0, "longitude": 2.0}}
+    sparql_response = MagicMock(status_code=200)
+    sparql_response.json.return_value = {"results": {"bindings": [{"name": {"value": "Example"}}]}}
+
+    with patch("backend.app.http_client.get", side_effect=[author_response, geo_response]) as mock_get, \
+            patch("backend.app.http_client.post", return_value=sparql_response) as mock_post:
+        for _ in range(2):
+            assert fetch_last_known_institutions("https://openalex.org/authors/A1")[0]["display_name"] == "Example University"
+            with app.test_request_context(json={"institution_oa_link": "openalex.org/institutions/I1"}):
+                assert get_geo_info() == {"latitude": 1.0, "longitude": 2.0}
+            assert query_SPARQL_endpoint("https://semopenalex.org/sparql", "SELECT ?name") == [{"name": "Example"}]
+    assert mock_get.call_count == 2
+    assert mock_post.call_count == 1
+    namespaces = memory_cache.get_stats()["namespaces"]
+    for namespace in ("openalex", "geo", "sparql"):
+        assert namespaces[namespace]["hits"] == 1
+
+
+@pytest.mark.parametrize("status_code, body", [(404, None), (429, {"error": "Too many requests"}), (503, {"error": "Unavailable"})],
+                         ids=["not-found", "rate-limited", "server-error"])
+def test_failed_geo_lookup_is_not_cached(memory_cache, status_code, body):
+    """ A 404 or an error response from OpenAlex is not stored, so the institution is looked up again on the next request instead of failing for the whole geo TTL. """
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = body
+    with patch("backend.app.http_client.get", return_value=response) as mock_get:
+        for _ in range(2):
+            with app.test_request_context(json={"institution_oa_link": "openalex.org/institutions/I404"}):
+                assert get_geo_info() is None
+    assert mock_get.call_count == 2
+
+
+def test_empty_sparql_result_is_not_cached(memory_cache):
+    """ A SPARQL query without bindings returns [] but is not stored, so it is sent again next time. """
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"results": {"bindings": []}}
+    with patch("backend.app.http_client.post", return_value=response) as mock_post:
+        for _ in range(2):
+            assert query_SPARQL_endpoint("https://semopenalex.org/sparql", "SELECT ?name") == []
+    assert mock_post.call_count == 2
+
+
+def test_memory_backend_lru_and_ttl():
+    """ The least recently used entry is evicted at max_entries, and entries older than their TTL are treated as misses. """
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", 1, 60)
+    backend.set("b", 2, 60)
+    assert backend.get("a") == (True, 1)
+    backend.set("c", 3, 60)
+    assert backend.get("b") == (False, None)
+    assert backend.get("a") == (True, 1)
+    backend.set("d", 4, 0.001)
+    time.sleep(0.01)
+    assert backend.get("d") == (False, None)
+    stats = backend.get_stats()
+    assert stats["evictions"] == 2
+    assert stats["expirations"] == 1
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    """ Two SQLite backends on the same file (as two gunicorn workers would have) see each other's entries, honour expiry and clear by prefix. """
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteCacheBackend(path)
+    reader = SQLiteCacheBackend(path)
+    writer.set("collabnext:geo:[\"I1\"]", {"geo": {"latitude": 1.0}}, 60)
+    writer.set("collabnext:sparql:[\"q\"]", [{"name": "x"}], 0)
+    assert reader.get("collabnext:geo:[\"I1\"]") == (True, {"geo": {"latitude": 1.0}})
+    assert reader.get("collabnext:sparql:[\"q\"]") == (False, None)
+    reader.clear("collabnext:geo:")
+    assert writer.get("collabnext:geo:[\"I1\"]") == (False, None)
+
+
+def test_redis_backend_uses_namespaced_keys_and_ttls():
+    """ With a Redis-protocol client the cache stores JSON under prefixed, namespaced keys with the namespace's TTL, and invalidating a namespace leaves the others alone. """
+    client = FakeRedis()
+    cache = ResponseCache(RedisCacheBackend(client=client), ttls={"geo": 600, "sparql": 60}, key_prefix="test")
+    assert cache.get_or_compute("geo", ["I1"], lambda: {"geo": {}}) == {"geo": {}}
+    assert cache.get_or_compute("geo", ["I1"], lambda: pytest.fail("should be cached")) == {"geo": {}}
+    cache.get_or_compute("sparql", ["q"], lambda: [])
+    assert client.expiries == {'test:geo:["I1"]': 600, 'test:sparql:["q"]': 60}
+    cache.invalidate("geo")
+    assert list(client.store) == ['test:sparql:["q"]']
+
+
+def test_backend_errors_fall_back_to_computing():
+    """ A cache server that is down must not break searches: errors are counted and the value is computed directly. """
+    client = MagicMock()
+    client.get.side_effect = ConnectionError("connection refused")
+    client.set.side_effect = ConnectionError("connection refused")
+    cache = ResponseCache(RedisCacheBackend(client=client))
+    assert cache.get_or_compute("search", ["key"], lambda: "value") == "value"
+    assert cache.get_stats()["namespaces"]["search"]["errors"] == 2
+
+
+def test_data_version_change_misses_old_entries():
+    """ When refresh_search_materialized_views() bumps the data version, versioned namespaces stop serving entries cached under the previous version while other namespaces are unaffected. """
+    versions = iter([1, 1, 2])
+    cache = ResponseCache(MemoryCacheBackend(), versioned_namespaces=("search",),
+                          version_source=lambda: next(versions), version_check_interval=0)
+    assert cache.get_or_compute("search", ["key"], lambda: "old") == "old"
+    assert cache.get_or_compute("geo", ["key"], lambda: "geo") == "geo"
+    assert cache.get_or_compute("search", ["key"], lambda: "stale") == "old"
+    assert cache.get_or_compute("search", ["key"], lambda: "new") == "new"
+    assert cache.get_or_compute("geo", ["key"], lambda: "changed") == "geo"
+    assert cache.get_stats()["data_version"] == 2
+
+
+def test_cache_without_backend_always_computes():
+    """ A ResponseCache with no backend (CACHE_BACKEND=none, and the test suite's default) calls through every time. """
+    cache = ResponseCache(None)
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute("search", ["key"], lambda: calls.append(1) or "value")
+    assert len(calls) == 2
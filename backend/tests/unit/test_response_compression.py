@@ -0,0 +1,112 @@
+"""
+Response Compression Test Suite
+
+This module contains tests for compressing large JSON responses and for the orjson JSON provider.
+The tests cover:
+  - Negotiating the Content-Encoding from Accept-Encoding above the size threshold.
+  - Passing small, non-JSON and already encoded responses through unchanged.
+  - Reporting bytes on the wire per encoding.
+  - Producing the same JSON with orjson as with Flask's default provider.
+"""
+
+import datetime
+import decimal
+import gzip
+import json
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+import backend.app as backend_app
+from backend.app import OrjsonProvider, ResponseCompressor, app
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+GRAPH = {
+    "graph": {
+        "nodes": [{"id": f"https://openalex.org/I{i}", "label": f"Institution {i}", "type": "INSTITUTION"}
+                  for i in range(200)],
+        "edges": [{"id": f"https://openalex.org/I{i}-Chemistry", "start": f"https://openalex.org/I{i}",
+                   "end": "Chemistry", "label": "researches", "start_type": "INSTITUTION", "end_type": "TOPIC"}
+                  for i in range(200)],
+    }
+}
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    compressor = ResponseCompressor(min_size=1024, compressors={"gzip": gzip.compress})
+    monkeypatch.setattr(backend_app, "response_compressor", compressor)
+    return compressor
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_large_json_is_compressed_when_accepted(gzip_only):
+    """ A JSON response above min_size is gzipped for a client that accepts gzip, with Content-Encoding and Vary set, and the saving is counted for /metrics. """
+    with app.test_request_context(headers={"Accept-Encoding": "gzip, deflate"}):
+        response = backend_app.compress_response(app.json.response(GRAPH))
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.get_data())) == GRAPH
+    stats = gzip_only.get_stats()["encodings"]["gzip"]
+    assert stats["responses"] == 1
+    assert stats["bytes_out"] < stats["bytes_in"] / 5
+
+
+@pytest.mark.parametrize("headers, payload", [
+    ({}, GRAPH),
+    ({"Accept-Encoding": "gzip"}, {"error": "Failed to load default graph"}),
+    ({"Accept-Encoding": "identity"}, GRAPH),
+], ids=["not-accepted", "below-threshold", "identity-only"])
+def test_response_is_left_uncompressed(gzip_only, headers, payload):
+    """ Clients that do not accept a supported encoding, and bodies smaller than min_size, get the plain JSON body. """
+    with app.test_request_context(headers=headers):
+        response = backend_app.compress_response(app.json.response(payload))
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(response.get_data()) == payload
+    assert gzip_only.get_stats()["uncompressed"] == 1
+
+
+def test_encoded_and_non_json_responses_pass_through(gzip_only):
+    """ A response that already carries a Content-Encoding (the precomputed default graph) or is not JSON is never touched. """
+    body = gzip.compress(b"{}" * 1000)
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        encoded = app.response_class(body, mimetype="application/json", headers={"Content-Encoding": "gzip"})
+        html = app.response_class("<p>" * 1000, mimetype="text/html")
+        assert backend_app.compress_response(encoded).get_data() == body
+        assert "Content-Encoding" not in backend_app.compress_response(html).headers
+    assert gzip_only.get_stats()["encodings"] == {}
+
+
+def test_client_preference_picks_encoding():
+    """ Among the available encodings the one the client weights highest is used, and the server's order breaks ties. """
+    compressor = ResponseCompressor(min_size=0, compressors={"br": lambda body: b"br", "gzip": lambda body: b"gz"})
+    for accept, expected in [("gzip, br", "br"), ("br;q=0.5, gzip", "gzip"), ("*", "br")]:
+        with app.test_request_context(headers={"Accept-Encoding": accept}):
+            response = compressor.compress(app.json.response(GRAPH), backend_app.request.accept_encodings)
+        assert response.headers["Content-Encoding"] == expected
+
+
+def test_orjson_provider_matches_default_provider():
+    """ The orjson provider's output parses to the same value as Flask's default provider's, including sorted keys, tuples, non-string keys, dates and decimals, and falls back to the json module for integers orjson cannot encode. """
+    pytest.importorskip("orjson")
+    payload = {
+        "b": (1, "two"),
+        "a": {2: "int key"},
+        "when": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "amount": decimal.Decimal("1.50"),
+        "text": "Université",
+    }
+    orjson_provider = OrjsonProvider(app)
+    default_provider = DefaultJSONProvider(app)
+    assert json.loads(orjson_provider.dumps(payload)) == json.loads(default_provider.dumps(payload))
+    assert list(json.loads(orjson_provider.dumps(payload))) == ["a", "amount", "b", "text", "when"]
+    assert orjson_provider.dumps({"big": 2 ** 70}) == default_provider.dumps({"big": 2 ** 70})
+    with app.app_context():
+        assert orjson_provider.response(GRAPH).get_json() == GRAPH
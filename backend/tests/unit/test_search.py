@@ -141,7 +141,7 @@ def test_metadata_no_last_known_institution(monkeypatch, caplog):
     fake_api_response = [{"display_name": "Fetched Institution",
                           "id": "http://institutionurl"}]
     monkeypatch.setattr("backend.app.search_by_author_topic",
-                        lambda a, t: fake_data)
+                        lambda a, t, **kwargs: fake_data)
     monkeypatch.setattr("backend.app.fetch_last_known_institutions",
                         lambda x: fake_api_response)
     result = get_researcher_and_subfield_results("Emily Brown", "Biology")
@@ -150,7 +150,7 @@ def test_metadata_no_last_known_institution(monkeypatch, caplog):
 
 
 def test_metadata_no_institution_found(monkeypatch, caplog):
-    """ This test is verifying what happens when the code tries to fetch a last known institution for an author but finds none. Specifically, at line 612 in app.py, the code attempts to access the first "element" of the list returned by fetch_last_known_institutions (i.e. something like institution_object = institution_object[0]). In the test, the fake data sets "last_known_institution": None and the monkeypatched fetch_last_known_institutions returns an empty list. This situation triggers an attempt to access an element in an empty list, causing an IndexError. The test confirms that the error is "thrown and raise" and also checks that the log message "Fetching last known institutions from OpenAlex" was emitted. """
+    """ This test is verifying what happens when the code tries to fetch a last known institution for an author but finds none. The fake data sets "last_known_institution": None and the monkeypatched fetch_last_known_institutions returns an empty list, which is also what a cached "no institution" answer looks like. Like get_researcher_result, the function logs a warning and uses an empty current_institution instead of failing, so the search still returns its result. """
     fake_data = {
         "author_metadata": {
             "orcid": None,
@@ -162,12 +162,13 @@ def test_metadata_no_institution_found(monkeypatch, caplog):
         "data": []
     }
     monkeypatch.setattr("backend.app.search_by_author_topic",
-                        lambda a, t: fake_data)
+                        lambda a, t, **kwargs: fake_data)
     monkeypatch.setattr("backend.app.fetch_last_known_institutions",
                         lambda x: [])
-    with pytest.raises(IndexError):
-        get_researcher_and_subfield_results("No Institution Author", "Geology")
+    result = get_researcher_and_subfield_results("No Institution Author", "Geology")
+    assert result["metadata"]["current_institution"] == ""
     assert "Fetching last known institutions from OpenAlex" in caplog.text
+    assert "No last known institution found" in caplog.text
 
 
 class TestSearchFunctions:
@@ -182,7 +183,7 @@ class TestSearchFunctions:
             "data": [{"institution_name": "InstTest", "num_of_authors": 3}]
         }
         monkeypatch.setattr("backend.app.search_by_topic",
-                            lambda topic: fake_data)
+                            lambda topic, **kwargs: fake_data)
         result = backend_app.get_subfield_results(
             "SubfieldX", page=1, per_page=10)
         metadata = result["metadata"]
@@ -283,7 +284,7 @@ def test_get_researcher_result_with_last(monkeypatch):
         "data": [{"topic": "Topic1", "num_of_works": 3}]
     }
     monkeypatch.setattr("backend.app.search_by_author",
-                        lambda author: fake_data)
+                        lambda author, **kwargs: fake_data)
     with pytest.raises(UnboundLocalError, match=r"institution_url.*before assignment"):
         get_researcher_result("Test Author", page=1, per_page=10)
 
@@ -306,7 +307,7 @@ def test_get_researcher_result_without_last(monkeypatch, caplog):
         "data": [{"topic": "Topic2", "num_of_works": 2}]
     }
     monkeypatch.setattr("backend.app.search_by_author",
-                        lambda author: fake_data)
+                        lambda author, **kwargs: fake_data)
     monkeypatch.setattr(
         "backend.app.fetch_last_known_institutions", lambda x: [])
     with pytest.raises(UnboundLocalError, match=r"institution_url.*before assignment"):
@@ -325,7 +326,7 @@ def test_get_researcher_and_subfield_results_fallback(monkeypatch, caplog):
         "institution_oa_link": "http://instD"
     }
     monkeypatch.setattr(
-        "backend.app.search_by_author_topic", lambda a, t: None)
+        "backend.app.search_by_author_topic", lambda a, t, **kwargs: None)
     monkeypatch.setattr(
         "backend.app.get_topic_and_researcher_metadata_sparql",
         lambda t, a: fake_sparql_metadata
@@ -375,7 +376,7 @@ def test_get_researcher_and_subfield_results_processing(monkeypatch, caplog):
         "data": [{"work_name": "WorkTest", "num_of_citations": 5}]
     }
     monkeypatch.setattr("backend.app.search_by_author_topic",
-                        lambda a, t: fake_data)
+                        lambda a, t, **kwargs: fake_data)
     result = get_researcher_and_subfield_results(
         "TestAuthor", "TestTopic", page=1, per_page=10)
     metadata = result.get("metadata", {})
@@ -402,7 +403,7 @@ def test_get_institution_results_homepage(monkeypatch):
         "data": [{"topic_subfield": "SubHomepage", "num_of_authors": 2}]
     }
     monkeypatch.setattr("backend.app.search_by_institution",
-                        lambda inst: fake_data)
+                        lambda inst, **kwargs: fake_data)
     result = get_institution_results("InstHomepage", page=1, per_page=10)
     metadata = result["metadata"]
     assert metadata["homepage"] == "http://homepage_test"
@@ -505,7 +506,7 @@ def test_get_institution_and_researcher_results_graph(monkeypatch, caplog):
         }
     }
     monkeypatch.setattr("backend.app.search_by_author_institution",
-                        lambda researcher, institution: dummy_data)
+                        lambda researcher, institution, **kwargs: dummy_data)
     result = get_institution_and_researcher_results(
         "FakeInstitution", "FakeResearcher", page=1, per_page=20)
     result["metadata"].setdefault(
@@ -740,7 +741,7 @@ def test_institution_researcher_results_sparql_success(monkeypatch, caplog):
     The test then asserts that the final result matches the expected dictionary containing the fake metadata, graph, and list, and it confirms that the success log message is present. This confirms that lines 748–751 operate correctly in the SPARQL fallback path. """
     monkeypatch.setattr(
         "backend.app.search_by_author_institution",
-        lambda researcher, institution: None
+        lambda researcher, institution, **kwargs: None
     )
     fake_sparql_data = {
         "institution_metadata": {
@@ -811,7 +812,7 @@ def test_institution_researcher_results_database(monkeypatch, caplog):
     }
     monkeypatch.setattr(
         "backend.app.search_by_author_institution",
-        lambda researcher, institution: fake_db_data
+        lambda researcher, institution, **kwargs: fake_db_data
     )
     institution = "DB Institution"
     researcher = "DB Researcher"
@@ -963,7 +964,7 @@ def test_sparql_branch_empty(monkeypatch, fake_sparql_empty):
     """ In the test, `monkeypatch` is used to "override" `search_by_author_institution_topic` to return `None` so that the SPARQL branch is taken, AND `get_institution_and_topic_and_researcher_metadata_sparql` to return the empty dictionary from `fake_sparql_empty`. When `get_institution_researcher_subfield_results` is called, it detects no results from the database and then falls back to the SPARQL query. Since the SPARQL function returns an empty dictionary, the function logs a warning and returns `{}`. Thus, the test asserts that in this scenario the function correctly returns an empty result (`{}`).  """
     monkeypatch.setattr(
         "backend.app.search_by_author_institution_topic",
-        lambda r, i, t: None
+        lambda r, i, t, **kwargs: None
     )
     monkeypatch.setattr(
         "backend.app.get_institution_and_topic_and_researcher_metadata_sparql",
@@ -1213,9 +1214,8 @@ def test_entrypoint_invokes_app_run():
 
 
 def test_autofill_topics_filters_matches_case_insensitively(monkeypatch):
-    """ This test checks that the topic autofill endpoint correctly filters suggestions in a case-insensitive manner. Specifically, it verifies the functionality implemented in Lines 1414–1415 of app.py where the code iterates over the list of topics (or autofill_topics_list when SUBFIELDS is False) and appends a topic to the suggestions if the lowercased input is a substring of the lowercased topic name. In the test the flag `SUBFIELDS` is set to False so that the code uses `autofill_topics_list`, the list is set to `["Cat", "Dog", "Caterpillar"]`, a POST request is made with the topic `"cat"` (all lowercase), and..the test asserts that `"Cat"` and `"Caterpillar"` are included (because "cat" appears in both when case is ignored) and that `"Dog"` is excluded. This confirms that the filtering on lines 1414–1415 works as intended. """
-    backend_app.SUBFIELDS = False
-    backend_app.autofill_topics_list = ["Cat", "Dog", "Caterpillar"]
+    """ This test checks that the topic autofill endpoint correctly filters suggestions in a case-insensitive manner. Specifically, it verifies that `topic_autocomplete` matches the normalized (case-folded) input anywhere in a topic name. In the test `topic_autocomplete` is replaced by an `AutocompleteIndex` over `["Cat", "Dog", "Caterpillar"]`, a POST request is made with the topic `"cat"` (all lowercase), and..the test asserts that `"Cat"` and `"Caterpillar"` are included (because "cat" appears in both when case is ignored) and that `"Dog"` is excluded. This confirms that the matching works as intended. """
+    monkeypatch.setattr(backend_app, "topic_autocomplete", backend_app.AutocompleteIndex(["Cat", "Dog", "Caterpillar"]))
     client = app.test_client()
     response = client.post("/autofill-topics", json={"topic": "cat"})
     assert response.status_code == 200
@@ -1347,7 +1347,7 @@ def test_database_branch_orcid_none(monkeypatch, fake_db_data_orcid_none):
     """ This test verifies the database branch for researcher‑topic‑institution searches when the author's ORCID is missing (i.e. it is `None`), which is handled on line 834 of app.py. In this test--the `search_by_author_institution_topic` function is monkeypatched to return the fake database data (`fake_db_data_orcid_none`) where the `orcid` field in `author_metadata` is `None`, & when `get_institution_researcher_subfield_results` is called, the code checks the returned metadata. Since the ORCID is `None`, the code sets it to an empty string, & then the test then asserts that various metadata fields (homepage, institution OpenAlex URL, ROR, institution name, researcher name and OpenAlex URL, topic name, topic clusters, work count, citation count, and topic OpenAlex URL) are set correctly. It ALSO verifies that the pagination metadata is correctly calculated based on the number of works in the fake data. Finally, the test inspects the graph structure to ensure that nodes representing the institution, researcher, topic, and each work are present. In totality, this test demonstrates that when the ORCID is missing, the application processes the data correctly by setting the ORCID to an empty string and "builds" the metadata and graph as expected. """
     monkeypatch.setattr(
         "backend.app.search_by_author_institution_topic",
-        lambda r, i, t: fake_db_data_orcid_none
+        lambda r, i, t, **kwargs: fake_db_data_orcid_none
     )
     result = get_institution_researcher_subfield_results(
         "Institution Test", "Researcher Test", "Topic Test", page=1, per_page=10)
@@ -1392,7 +1392,7 @@ def test_database_branch_orcid_present(monkeypatch, fake_db_data_orcid_present):
     The test constructs, an expected list of tuples (each containing a work name and its corresponding cited-by count) from the fake data and confirms that the `list` returned by the function matches this expected list. Now, this test coincides witht he fact that when the ORCID is provided, the function correctly processes and preserves it in the metadata, along with accurately constructing the pagination and list data. """
     monkeypatch.setattr(
         "backend.app.search_by_author_institution_topic",
-        lambda r, i, t: fake_db_data_orcid_present
+        lambda r, i, t, **kwargs: fake_db_data_orcid_present
     )
     result = get_institution_researcher_subfield_results(
         "Institution Test", "Researcher Test", "Topic Test", page=1, per_page=10)
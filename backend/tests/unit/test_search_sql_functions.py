@@ -0,0 +1,56 @@
+"""
+Search SQL Functions Test Suite
+
+This module contains tests for backend/search_sql_functions.sql that can run without a database.
+The tests cover:
+  - Keeping the copy in database/sql-functions identical.
+  - Building author_name_lookup_mv from the same authors as the fallback query in get_author_ids.
+"""
+
+import re
+from pathlib import Path
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+ROOT = Path(__file__).resolve().parents[3]
+SQL = (ROOT / "backend" / "search_sql_functions.sql").read_text()
+
+AUTHOR_PREDICATE = """EXISTS (
+            SELECT 1 FROM openalex.works_authorships AS w_a
+            WHERE w_a.author_id = a.id
+        )"""
+
+
+def statement(start):
+    """Returns the SQL from start to the end of that view definition or function body."""
+    begin = SQL.index(start)
+    end = SQL.index("WITH NO DATA;", begin) if "MATERIALIZED VIEW" in start else SQL.index("$$ LANGUAGE", begin)
+    return SQL[begin:end]
+
+
+def normalize(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_database_copy_is_identical():
+    """ database/sql-functions/search_sql_functions.sql is the same file as the backend copy. """
+    assert (ROOT / "database" / "sql-functions" / "search_sql_functions.sql").read_text() == SQL
+
+
+def test_author_lookup_view_matches_fallback_author_set():
+    """ The view and the fallback in get_author_ids both keep every named author with an authorship, with no institution join, so the answer does not depend on whether the view is populated. """
+    view = normalize(statement("CREATE MATERIALIZED VIEW IF NOT EXISTS author_name_lookup_mv"))
+    get_author_ids = statement("CREATE OR REPLACE FUNCTION get_author_ids")
+    fallback = normalize(get_author_ids[get_author_ids.index("ELSE"):get_author_ids.index("END IF;")])
+    predicate = normalize(AUTHOR_PREDICATE)
+    assert view.endswith("FROM openalex.authors AS a WHERE a.display_name IS NOT NULL AND " + predicate)
+    assert fallback.endswith("FROM openalex.authors AS a WHERE a.display_name = author_name AND " + predicate + ";")
+    assert "JOIN" not in view and "JOIN" not in fallback
+    assert "institutions" not in normalize(get_author_ids).replace("last_known_institution", "")
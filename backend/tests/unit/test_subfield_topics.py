@@ -0,0 +1,98 @@
+"""
+Subfield Topic Index Test Suite
+
+This module contains tests for the in-process subfield -> topics index that replaced the
+subfield_metadata object in author and institution search payloads.
+The tests cover:
+  - Loading the index once and serving every lookup from memory.
+  - Retrying a failed load and reloading after the search data version changes.
+  - Building topic nodes for author and institution results from the index.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+import backend.app as backend_app
+from backend.app import SubfieldTopicIndex, get_institution_results
+
+###############################################################################
+# FIXTURES
+###############################################################################
+
+
+TOPICS = {
+    "Artificial Intelligence": [
+        {"topic_id": "https://openalex.org/T1", "topic_display_name": "Machine Learning"},
+        {"topic_id": "https://openalex.org/T2", "topic_display_name": "Computer Vision"},
+    ],
+    "Organic Chemistry": [
+        {"topic_id": "https://openalex.org/T3", "topic_display_name": "Catalysis"},
+    ],
+}
+
+###############################################################################
+# TEST CASES
+###############################################################################
+
+
+def test_index_is_loaded_once():
+    """ Any number of lookups, including unknown subfields, trigger a single load of the mapping. """
+    calls = []
+    index = SubfieldTopicIndex(lambda: calls.append(1) or TOPICS)
+    for _ in range(3):
+        assert [t["topic_display_name"] for t in index.get("Artificial Intelligence")] == \
+            ["Machine Learning", "Computer Vision"]
+    assert index.get("Unknown Subfield") == ()
+    assert len(calls) == 1
+
+
+def test_index_is_read_only():
+    """ The index is shared by every request in the worker, so neither the mapping nor its topic entries can be modified. """
+    index = SubfieldTopicIndex(lambda: TOPICS)
+    with pytest.raises(TypeError):
+        index.get("Organic Chemistry")[0]["topic_display_name"] = "Changed"
+    assert isinstance(index.get("Organic Chemistry"), tuple)
+
+
+def test_failed_load_is_retried():
+    """ If the database is unavailable the lookup returns no topics and the next lookup tries again. """
+    results = iter([None, TOPICS])
+    index = SubfieldTopicIndex(lambda: next(results))
+    assert index.get("Organic Chemistry") == ()
+    assert index.get("Organic Chemistry")[0]["topic_display_name"] == "Catalysis"
+
+
+def test_index_reloads_when_data_version_changes():
+    """ After refresh_search_materialized_views() bumps the data version the index is fetched again so newly loaded topics appear. """
+    versions = iter([1, 1, 2])
+    loads = iter([{"A": []}, {"A": [{"topic_id": "T", "topic_display_name": "New"}]}])
+    index = SubfieldTopicIndex(lambda: next(loads), version_source=lambda: next(versions))
+    assert index.get("A") == ()
+    assert index.get("A") == ()
+    assert index.get("A")[0]["topic_display_name"] == "New"
+
+
+def test_institution_results_join_topics_from_index(monkeypatch):
+    """ get_institution_results builds topic nodes and has_topic edges from the in-memory index, since the institution payload no longer carries subfield_metadata. """
+    monkeypatch.setattr(backend_app, "subfield_topic_index", SubfieldTopicIndex(lambda: TOPICS))
+    payload = {
+        "institution_metadata": {
+            "url": "https://www.example.edu",
+            "num_of_works": 100,
+            "institution_name": "Example University",
+            "num_of_citations": 1000,
+            "openalex_url": "https://openalex.org/I1",
+            "num_of_authors": 10,
+            "ror": "https://ror.org/example",
+        },
+        "data": [{"topic_subfield": "Artificial Intelligence", "num_of_authors": 5}],
+        "total_count": 1,
+    }
+    with patch("backend.app.execute_query", return_value=[(payload,)]):
+        result = get_institution_results("Example University", page=1, per_page=10)
+    nodes = result["graph"]["nodes"]
+    edges = result["graph"]["edges"]
+    assert {"id": "Machine Learning", "label": "Machine Learning", "type": "TOPIC"} in nodes
+    assert {"id": "Computer Vision", "label": "Computer Vision", "type": "TOPIC"} in nodes
+    assert any(edge["id"] == "Artificial Intelligence-Machine Learning" for edge in edges)
@@ -0,0 +1,1233 @@
+-- Precomputed author name lookup: one row per author with any authorship and a deterministic
+-- best-match rank per display name (most works first, then most citations, then id). Holds the
+-- same authors as the fallback query in get_author_ids. Refresh after loading new OpenAlex data.
+CREATE MATERIALIZED VIEW IF NOT EXISTS author_name_lookup_mv AS
+    SELECT
+        a.display_name,
+        a.id AS author_id,
+        COALESCE(a.works_count, 0) AS works_count,
+        COALESCE(a.cited_by_count, 0) AS cited_by_count,
+        a.last_known_institution,
+        row_number() OVER (
+            PARTITION BY a.display_name
+            ORDER BY a.works_count DESC NULLS LAST, a.cited_by_count DESC NULLS LAST, a.id
+        ) AS name_rank
+    FROM openalex.authors AS a
+    WHERE a.display_name IS NOT NULL
+        AND EXISTS (
+            SELECT 1 FROM openalex.works_authorships AS w_a
+            WHERE w_a.author_id = a.id
+        )
+    WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS author_name_lookup_mv_author_id_idx
+    ON author_name_lookup_mv (author_id);
+CREATE INDEX IF NOT EXISTS author_name_lookup_mv_name_rank_idx
+    ON author_name_lookup_mv (display_name, name_rank);
+
+-- Trigram indexes for typo-tolerant name lookups (find_similar_authors/find_similar_institutions)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS author_name_lookup_mv_display_name_trgm_idx
+    ON author_name_lookup_mv USING gin (display_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS authors_display_name_trgm_idx
+    ON openalex.authors USING gin (display_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS institutions_display_name_trgm_idx
+    ON openalex.institutions USING gin (display_name gin_trgm_ops);
+
+-- Version of the data behind the search functions. The backend caches search results and
+-- drops its cache when this changes, so refresh the views through
+-- refresh_search_materialized_views() rather than with bare REFRESH statements.
+CREATE TABLE IF NOT EXISTS search_data_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+INSERT INTO search_data_version (id) VALUES (TRUE) ON CONFLICT (id) DO NOTHING;
+
+-- Get the current search data version
+CREATE OR REPLACE FUNCTION get_search_data_version()
+RETURNS BIGINT AS $$
+BEGIN
+    RETURN (SELECT version FROM search_data_version);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Refresh every materialized view used by the search functions and bump the data version
+CREATE OR REPLACE FUNCTION refresh_search_materialized_views()
+RETURNS BIGINT AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    REFRESH MATERIALIZED VIEW search_by_authors_mv;
+    REFRESH MATERIALIZED VIEW search_by_institution_mv;
+    REFRESH MATERIALIZED VIEW search_by_institution_topic_data_mv;
+    REFRESH MATERIALIZED VIEW search_by_topic_data_mv;
+    REFRESH MATERIALIZED VIEW search_by_topic_totals_mv;
+    REFRESH MATERIALIZED VIEW author_name_lookup_mv;
+
+    UPDATE search_data_version
+    SET version = version + 1, refreshed_at = now()
+    RETURNING version INTO new_version;
+    RETURN new_version;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Get the ids of every author with the given name, best match first.
+-- Reads author_name_lookup_mv when it has been refreshed and otherwise falls back to
+-- scanning works_authorships, keeping the same ordering.
+CREATE OR REPLACE FUNCTION get_author_ids(author_name TEXT)
+RETURNS JSON AS $$
+DECLARE
+    result JSON;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = current_schema() AND matviewname = 'author_name_lookup_mv' AND ispopulated
+    ) THEN
+        SELECT json_agg(json_build_object(
+            'author_id', l.author_id,
+            'institution_name', l.last_known_institution,
+            'works_count', l.works_count
+        ) ORDER BY l.name_rank)
+        INTO result
+        FROM author_name_lookup_mv AS l
+        WHERE l.display_name = author_name;
+    ELSE
+        SELECT json_agg(json_build_object(
+            'author_id', a.id,
+            'institution_name', a.last_known_institution,
+            'works_count', COALESCE(a.works_count, 0)
+        ) ORDER BY a.works_count DESC NULLS LAST, a.cited_by_count DESC NULLS LAST, a.id)
+        INTO result
+        FROM openalex.authors AS a
+        WHERE a.display_name = author_name
+            AND EXISTS (
+                SELECT 1 FROM openalex.works_authorships AS w_a
+                WHERE w_a.author_id = a.id
+            );
+    END IF;
+
+    RETURN COALESCE(result, '[]'::JSON);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Get up to max_results author names similar to author_name (pg_trgm similarity, which
+-- ignores case), most similar first and then by works count. One candidate per name, using
+-- the same best-match author as get_author_ids.
+CREATE OR REPLACE FUNCTION find_similar_authors(author_name TEXT, max_results INTEGER DEFAULT 5)
+RETURNS JSON AS $$
+DECLARE
+    result JSON;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_matviews
+        WHERE schemaname = current_schema() AND matviewname = 'author_name_lookup_mv' AND ispopulated
+    ) THEN
+        SELECT json_agg(json_build_object(
+            'display_name', c.display_name,
+            'author_id', c.author_id,
+            'similarity', c.similarity
+        ) ORDER BY c.similarity DESC, c.works_count DESC, c.author_id)
+        INTO result
+        FROM (
+            SELECT l.display_name, l.author_id, l.works_count, similarity(l.display_name, author_name) AS similarity
+            FROM author_name_lookup_mv AS l
+            WHERE l.display_name % author_name AND l.name_rank = 1
+            ORDER BY similarity(l.display_name, author_name) DESC, l.works_count DESC, l.author_id
+            LIMIT max_results
+        ) AS c;
+    ELSE
+        SELECT json_agg(json_build_object(
+            'display_name', c.display_name,
+            'author_id', c.author_id,
+            'similarity', c.similarity
+        ) ORDER BY c.similarity DESC, c.works_count DESC, c.author_id)
+        INTO result
+        FROM (
+            SELECT d.*
+            FROM (
+                SELECT DISTINCT ON (a.display_name)
+                    a.display_name, a.id AS author_id, COALESCE(a.works_count, 0) AS works_count,
+                    similarity(a.display_name, author_name) AS similarity
+                FROM openalex.authors AS a
+                WHERE a.display_name % author_name
+                    AND EXISTS (
+                        SELECT 1 FROM openalex.works_authorships AS w_a
+                        WHERE w_a.author_id = a.id
+                    )
+                ORDER BY a.display_name, a.works_count DESC NULLS LAST, a.cited_by_count DESC NULLS LAST, a.id
+            ) AS d
+            ORDER BY d.similarity DESC, d.works_count DESC, d.author_id
+            LIMIT max_results
+        ) AS c;
+    END IF;
+
+    RETURN COALESCE(result, '[]'::JSON);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Get up to max_results institution names similar to institution_name, most similar first
+-- and then by works count
+CREATE OR REPLACE FUNCTION find_similar_institutions(institution_name TEXT, max_results INTEGER DEFAULT 5)
+RETURNS JSON AS $$
+BEGIN
+    RETURN COALESCE((
+        SELECT json_agg(json_build_object(
+            'display_name', c.display_name,
+            'institution_id', c.id,
+            'similarity', c.similarity
+        ) ORDER BY c.similarity DESC, c.works_count DESC, c.id)
+        FROM (
+            SELECT i.display_name, i.id, COALESCE(i.works_count, 0) AS works_count,
+                similarity(i.display_name, institution_name) AS similarity
+            FROM openalex.institutions AS i
+            WHERE i.display_name % institution_name
+            ORDER BY similarity(i.display_name, institution_name) DESC, i.works_count DESC NULLS LAST, i.id
+            LIMIT max_results
+        ) AS c
+    ), '[]'::JSON);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Resolve an author name to the best matching author id. Exact names win; otherwise the most
+-- similar name is used if it is close enough (similarity >= 0.6) to be a typo of it.
+CREATE OR REPLACE FUNCTION resolve_author_id(author_name TEXT)
+RETURNS TEXT AS $$
+DECLARE
+    candidate JSON;
+BEGIN
+    candidate := get_author_ids(author_name) -> 0;
+    IF candidate IS NULL THEN
+        candidate := find_similar_authors(author_name, 1) -> 0;
+        IF candidate IS NULL OR (candidate ->> 'similarity')::REAL < 0.6 THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    RETURN candidate ->> 'author_id';
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Resolve an institution name to its OpenAlex institution id, falling back to the most
+-- similar institution name in the same way as resolve_author_id
+CREATE OR REPLACE FUNCTION resolve_institution_id(institution_name TEXT)
+RETURNS TEXT AS $$
+DECLARE
+    candidate JSON;
+BEGIN
+    candidate := get_institution_id(institution_name);
+    IF candidate ->> 'institution_id' IS NULL THEN
+        candidate := find_similar_institutions(institution_name, 1) -> 0;
+        IF candidate IS NULL OR (candidate ->> 'similarity')::REAL < 0.6 THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    RETURN candidate ->> 'institution_id';
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by author name in a single round trip; NULL when the author is unknown
+CREATE OR REPLACE FUNCTION search_by_author_by_name(author_name TEXT)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+BEGIN
+    IF author_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author(author_id);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by institution name in a single round trip; NULL when the institution is unknown
+CREATE OR REPLACE FUNCTION search_by_institution_by_name(institution_name TEXT)
+RETURNS JSONB AS $$
+DECLARE
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_institution(institution_id);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by author name and subfield name in a single round trip
+CREATE OR REPLACE FUNCTION search_by_author_topic_by_name(
+    author_name TEXT,
+    subfield_name TEXT
+)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+BEGIN
+    IF author_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author_topic(author_id, subfield_name);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by institution name and subfield name in a single round trip
+CREATE OR REPLACE FUNCTION search_by_institution_topic_by_name(
+    institution_name TEXT,
+    subfield_name TEXT
+)
+RETURNS JSONB AS $$
+DECLARE
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_institution_topic(institution_id, subfield_name);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by author name and institution name in a single round trip
+CREATE OR REPLACE FUNCTION search_by_author_institution_by_name(
+    author_name TEXT,
+    institution_name TEXT
+)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF author_id IS NULL OR institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author_institution(author_id, institution_id);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by author, institution and subfield names in a single round trip
+CREATE OR REPLACE FUNCTION search_by_author_institution_topic_by_name(
+    author_name TEXT,
+    institution_name TEXT,
+    subfield_name TEXT
+)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF author_id IS NULL OR institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author_institution_topic(author_id, institution_id, subfield_name);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Paged search functions. These take the same arguments as the functions above plus
+-- page_limit/page_offset (a NULL page_limit returns every row) and return only the requested
+-- page of 'data', in a stable order, with the number of rows across all pages in 'total_count'.
+-- The author and institution searches leave out the topics of each subfield; the backend keeps
+-- that mapping in memory (see get_subfield_topics).
+
+-- Search by author id, returning one page of subfields
+CREATE OR REPLACE FUNCTION search_by_author(author_id TEXT, page_limit INTEGER, page_offset INTEGER)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN (
+        WITH page AS (
+            SELECT
+                authors_mv.subfield_display_name AS topic,
+                authors_mv.num_of_works
+            FROM search_by_authors_mv AS authors_mv
+            WHERE authors_mv.author_id = search_by_author.author_id
+            ORDER BY authors_mv.num_of_works DESC, authors_mv.subfield_display_name
+            LIMIT page_limit OFFSET page_offset
+        )
+        SELECT jsonb_build_object(
+            'author_metadata', (
+                SELECT row_to_json(a)
+                FROM (
+                    SELECT
+                        a.id AS openalex_url,
+                        a.orcid,
+                        a.display_name AS name,
+                        a.last_known_institution,
+                        a.works_count AS num_of_works,
+                        a.cited_by_count AS num_of_citations
+                    FROM openalex.authors AS a
+                    WHERE a.id = search_by_author.author_id
+                ) AS a
+            ),
+            'data', (
+                SELECT COALESCE(jsonb_agg(row_to_json(p) ORDER BY p.num_of_works DESC, p.topic), '[]'::jsonb)
+                FROM page AS p
+            ),
+            'total_count', (
+                SELECT COUNT(*)
+                FROM search_by_authors_mv AS authors_mv
+                WHERE authors_mv.author_id = search_by_author.author_id
+            )
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by institution id, returning one page of subfields
+CREATE OR REPLACE FUNCTION search_by_institution(institution_id TEXT, page_limit INTEGER, page_offset INTEGER)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN (
+        WITH page AS (
+            SELECT
+                institution_mv.topic_subfield,
+                institution_mv.num_of_authors
+            FROM search_by_institution_mv AS institution_mv
+            WHERE institution_mv.id = search_by_institution.institution_id
+            ORDER BY institution_mv.num_of_authors DESC, institution_mv.topic_subfield
+            LIMIT page_limit OFFSET page_offset
+        )
+        SELECT jsonb_build_object(
+            'institution_metadata', (
+                SELECT row_to_json(i)
+                FROM (
+                    SELECT
+                        i.id AS openalex_url,
+                        i.ror AS ror,
+                        i.display_name AS institution_name,
+                        i.homepage_url AS url,
+                        i.works_count AS num_of_works,
+                        i.cited_by_count AS num_of_citations,
+                        i.authors_count AS num_of_authors,
+                        (
+                            SELECT jsonb_agg(i_t.type_id ORDER BY i_t.type_id)
+                            FROM openalex.institutions_types AS i_t
+                            WHERE i_t.institution_id = search_by_institution.institution_id
+                        ) AS types
+                    FROM openalex.institutions AS i
+                    WHERE i.id = search_by_institution.institution_id
+                ) AS i
+            ),
+            'data', (
+                SELECT COALESCE(jsonb_agg(row_to_json(p) ORDER BY p.num_of_authors DESC, p.topic_subfield), '[]'::jsonb)
+                FROM page AS p
+            ),
+            'total_count', (
+                SELECT COUNT(*)
+                FROM search_by_institution_mv AS institution_mv
+                WHERE institution_mv.id = search_by_institution.institution_id
+            )
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by subfield name, returning one page of institutions plus the top map_limit
+-- institutions (by number of authors) for the map view, with their institutions_geo coordinates
+CREATE OR REPLACE FUNCTION search_by_topic(
+    subfield_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER,
+    map_limit INTEGER
+)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN jsonb_build_object(
+        'subfield_metadata', (
+            SELECT jsonb_agg(row_to_json(s))
+            FROM (
+                SELECT
+                    t.subfield_display_name AS subfield,
+                    t.subfield_id AS subfield_url,
+                    t.id AS openalex_url,
+                    t.display_name AS topic
+                FROM openalex.topics AS t
+                WHERE t.subfield_display_name = search_by_topic.subfield_name
+            ) AS s
+        ),
+        'data', (
+            SELECT COALESCE(jsonb_agg(row_to_json(data) ORDER BY data.num_of_authors DESC, data.num_of_works DESC, data.institution_id DESC), '[]'::jsonb)
+            FROM (
+                SELECT
+                    data_mv.institution_id,
+                    data_mv.institution_name,
+                    data_mv.num_of_authors,
+                    data_mv.num_of_works,
+                    (
+                        SELECT jsonb_agg(i_t.type_id ORDER BY i_t.type_id)
+                        FROM openalex.institutions_types AS i_t
+                        WHERE i_t.institution_id = data_mv.institution_id
+                    ) AS types
+                FROM search_by_topic_data_mv AS data_mv
+                WHERE data_mv.subfield_display_name = search_by_topic.subfield_name
+                ORDER BY data_mv.num_of_authors DESC, data_mv.num_of_works DESC, data_mv.institution_id DESC
+                LIMIT page_limit OFFSET page_offset
+            ) AS data
+        ),
+        'map_data', (
+            SELECT COALESCE(jsonb_agg(row_to_json(map) ORDER BY map.num_of_authors DESC, map.num_of_works DESC, map.institution_id DESC), '[]'::jsonb)
+            FROM (
+                SELECT
+                    data_mv.institution_id,
+                    data_mv.institution_name,
+                    data_mv.num_of_authors,
+                    data_mv.num_of_works,
+                    geo.latitude,
+                    geo.longitude
+                FROM search_by_topic_data_mv AS data_mv
+                LEFT JOIN openalex.institutions_geo AS geo ON geo.institution_id = data_mv.institution_id
+                WHERE data_mv.subfield_display_name = search_by_topic.subfield_name
+                ORDER BY data_mv.num_of_authors DESC, data_mv.num_of_works DESC, data_mv.institution_id DESC
+                LIMIT map_limit
+            ) AS map
+        ),
+        'total_count', (
+            SELECT COUNT(*)
+            FROM search_by_topic_data_mv AS data_mv
+            WHERE data_mv.subfield_display_name = search_by_topic.subfield_name
+        ),
+        'totals', (
+            SELECT row_to_json(totals)
+            FROM (
+                SELECT
+                    total_num_of_works,
+                    total_num_of_authors,
+                    total_num_of_citations
+                FROM search_by_topic_totals_mv
+                WHERE subfield_display_name = search_by_topic.subfield_name
+            ) AS totals
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by institution id and subfield name, returning one page of authors
+CREATE OR REPLACE FUNCTION search_by_institution_topic(
+    institution_id TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN jsonb_build_object(
+        'institution_metadata', (
+            SELECT row_to_json(i)
+            FROM (
+                SELECT
+                    i.id AS openalex_url,
+                    i.ror AS ror,
+                    i.display_name AS institution_name,
+                    i.homepage_url AS url,
+                    (
+                    SELECT jsonb_agg(i_t.type_id ORDER BY i_t.type_id)
+                    FROM openalex.institutions_types AS i_t
+                    WHERE i_t.institution_id = search_by_institution_topic.institution_id
+                    ) AS types
+                FROM openalex.institutions AS i
+                WHERE i.id = search_by_institution_topic.institution_id
+            ) i
+        ),
+        'subfield_metadata', (
+            SELECT jsonb_agg(row_to_json(s))
+            FROM (
+                SELECT
+                    t.subfield_display_name AS subfield,
+                    t.subfield_id AS subfield_url,
+                    t.id AS openalex_url,
+                    t.display_name AS topic
+                FROM openalex.topics AS t
+                WHERE t.subfield_display_name = search_by_institution_topic.subfield_name
+            ) s
+        ),
+        'data', (
+            SELECT COALESCE(jsonb_agg(row_to_json(data) ORDER BY data.num_of_works DESC, data.author_id DESC), '[]'::jsonb)
+            FROM (
+                SELECT
+                    data_mv.author_id,
+                    data_mv.author_name,
+                    data_mv.num_of_works
+                FROM search_by_institution_topic_data_mv AS data_mv
+                WHERE
+                    data_mv.institution_id = search_by_institution_topic.institution_id
+                    AND data_mv.subfield_display_name = search_by_institution_topic.subfield_name
+                ORDER BY data_mv.num_of_works DESC, data_mv.author_id DESC
+                LIMIT page_limit OFFSET page_offset
+            ) data
+        ),
+        'total_count', (
+            SELECT COUNT(*)
+            FROM search_by_institution_topic_data_mv AS data_mv
+            WHERE
+                data_mv.institution_id = search_by_institution_topic.institution_id
+                AND data_mv.subfield_display_name = search_by_institution_topic.subfield_name
+        ),
+        'totals', (
+            SELECT row_to_json(totals)
+            FROM (
+                SELECT
+                    SUM(data_mv.num_of_works) AS total_num_of_works,
+                    SUM(data_mv.num_of_citations) AS total_num_of_citations,
+                    COUNT(data_mv.author_name) AS total_num_of_authors
+                FROM search_by_institution_topic_data_mv AS data_mv
+                WHERE data_mv.subfield_display_name = search_by_institution_topic.subfield_name
+                AND data_mv.institution_id = search_by_institution_topic.institution_id
+            ) totals
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by author id and subfield name, returning one page of works
+CREATE OR REPLACE FUNCTION search_by_author_topic(
+    author_id TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN (
+        WITH data_works AS (
+            SELECT DISTINCT
+                w.display_name AS work_name,
+                w.cited_by_count AS num_of_citations
+            FROM openalex.works_authorships AS w_a
+            JOIN openalex.works AS w ON w_a.work_id = w.id
+            JOIN openalex.works_topics AS w_t ON w_t.work_id = w_a.work_id
+            JOIN openalex.topics AS t ON t.id = w_t.topic_id
+            WHERE
+                w_a.author_id = search_by_author_topic.author_id AND
+                t.subfield_display_name = search_by_author_topic.subfield_name
+        )
+        SELECT jsonb_build_object(
+            'author_metadata', (
+                SELECT row_to_json(a)
+                FROM (
+                    SELECT
+                        a.id AS openalex_url,
+                        a.orcid,
+                        a.display_name AS name,
+                        a.last_known_institution
+                    FROM openalex.authors AS a
+                    WHERE a.id = search_by_author_topic.author_id
+                ) AS a
+            ),
+            'subfield_metadata', (
+                SELECT jsonb_agg(row_to_json(s))
+                FROM (
+                    SELECT
+                        t.subfield_display_name AS subfield,
+                        t.subfield_id AS subfield_url,
+                        t.id AS openalex_url,
+                        t.display_name AS topic
+                    FROM openalex.topics AS t
+                    WHERE t.subfield_display_name = search_by_author_topic.subfield_name
+                ) AS s
+            ),
+            'data', (
+                SELECT COALESCE(jsonb_agg(row_to_json(data) ORDER BY data.num_of_citations DESC, data.work_name), '[]'::jsonb)
+                FROM (
+                    SELECT
+                        work_name,
+                        num_of_citations
+                    FROM data_works
+                    ORDER BY num_of_citations DESC, work_name
+                    LIMIT page_limit OFFSET page_offset
+                ) AS data
+            ),
+            'total_count', (SELECT COUNT(*) FROM data_works),
+            'totals', (
+                SELECT row_to_json(totals)
+                FROM (
+                    SELECT
+                        COUNT(work_name) AS total_num_of_works,
+                        SUM(num_of_citations) AS total_num_of_citations
+                    FROM data_works
+                ) AS totals
+            )
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by author id and institution id, returning one page of subfields
+CREATE OR REPLACE FUNCTION search_by_author_institution(
+    author_id TEXT,
+    institution_id TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN (
+        WITH topic_data AS (
+            SELECT
+                t.subfield_display_name AS topic_name,
+                COUNT(DISTINCT w_a.work_id) AS num_of_works
+            FROM openalex.works_authorships AS w_a
+            JOIN openalex.works_topics AS w_t ON w_a.work_id = w_t.work_id
+            JOIN openalex.topics AS t ON w_t.topic_id = t.id
+            WHERE
+                w_a.institution_id = search_by_author_institution.institution_id AND
+                w_a.author_id = search_by_author_institution.author_id
+            GROUP BY t.subfield_display_name
+        ),
+        page AS (
+            SELECT topic_name, num_of_works
+            FROM topic_data
+            ORDER BY num_of_works DESC, topic_name
+            LIMIT page_limit OFFSET page_offset
+        )
+        SELECT jsonb_build_object(
+            'institution_metadata', (
+                SELECT row_to_json(i)
+                FROM (
+                    SELECT
+                        i.id AS openalex_url,
+                        i.ror AS ror,
+                        i.display_name AS institution_name,
+                        i.homepage_url AS url,
+                        (
+                        SELECT jsonb_agg(i_t.type_id ORDER BY i_t.type_id)
+                        FROM openalex.institutions_types AS i_t
+                        WHERE i_t.institution_id = search_by_author_institution.institution_id
+                        ) AS types
+                    FROM openalex.institutions AS i
+                    WHERE i.id = search_by_author_institution.institution_id
+                ) i
+            ),
+            'author_metadata', (
+                SELECT row_to_json(a)
+                FROM (
+                    SELECT
+                        a.id AS openalex_url,
+                        a.orcid,
+                        a.display_name AS name,
+                        a.works_count AS num_of_works,
+                        a.cited_by_count AS num_of_citations
+                    FROM openalex.authors AS a
+                    WHERE a.id = search_by_author_institution.author_id
+                ) a
+            ),
+            'data', (
+                SELECT COALESCE(jsonb_agg(row_to_json(p) ORDER BY p.num_of_works DESC, p.topic_name), '[]'::jsonb)
+                FROM page AS p
+            ),
+            'total_count', (SELECT COUNT(*) FROM topic_data)
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by author id, institution id and subfield name, returning one page of works
+CREATE OR REPLACE FUNCTION search_by_author_institution_topic(
+    author_id TEXT,
+    institution_id TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN (
+        WITH data_works AS (
+            SELECT DISTINCT w.display_name AS work_name, w.cited_by_count FROM openalex.works_authorships AS w_a
+                JOIN openalex.works AS w ON w_a.work_id = w.id
+                JOIN openalex.works_topics AS w_t ON w.id = w_t.work_id
+                JOIN openalex.topics AS t ON w_t.topic_id = t.id
+                WHERE
+                    w_a.institution_id = search_by_author_institution_topic.institution_id AND
+                    w_a.author_id = search_by_author_institution_topic.author_id AND
+                    t.subfield_display_name = search_by_author_institution_topic.subfield_name
+        )
+        SELECT jsonb_build_object(
+        'author_metadata', (
+            SELECT row_to_json(a)
+            FROM (
+                SELECT id AS openalex_url, orcid, display_name AS name
+                FROM openalex.authors
+                WHERE id = search_by_author_institution_topic.author_id
+            ) a
+        ),
+        'institution_metadata', (
+            SELECT row_to_json(i)
+            FROM (
+                SELECT
+                    id AS openalex_url,
+                    ror,
+                    display_name AS institution_name,
+                    homepage_url AS url,
+                    (
+                    SELECT jsonb_agg(i_t.type_id ORDER BY i_t.type_id)
+                    FROM openalex.institutions_types AS i_t
+                    WHERE i_t.institution_id = search_by_author_institution_topic.institution_id
+                    ) AS types
+                FROM openalex.institutions
+                WHERE id = search_by_author_institution_topic.institution_id
+            ) i
+        ),
+        'subfield_metadata', (
+            SELECT jsonb_agg(row_to_json(s))
+            FROM (
+                SELECT
+                    subfield_display_name AS subfield,
+                    subfield_id AS subfield_url,
+                    id AS openalex_url,
+                    display_name AS topic
+                FROM openalex.topics
+                WHERE subfield_display_name = search_by_author_institution_topic.subfield_name
+            ) s
+        ),
+        'totals', (
+            SELECT row_to_json(totals)
+            FROM (
+                SELECT COUNT(*) AS total_num_of_works, COALESCE(SUM(cited_by_count), 0) AS total_num_of_citations FROM data_works
+            ) totals
+        ),
+        'total_count', (SELECT COUNT(*) FROM data_works),
+        'data', (
+            SELECT COALESCE(jsonb_agg(row_to_json(data) ORDER BY data.cited_by_count DESC, data.work_name), '[]'::jsonb)
+            FROM (
+                SELECT d.work_name, d.cited_by_count FROM data_works as d
+                ORDER BY d.cited_by_count DESC, d.work_name
+                LIMIT page_limit OFFSET page_offset
+            ) data
+        )
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Paged search by author name
+CREATE OR REPLACE FUNCTION search_by_author_by_name(author_name TEXT, page_limit INTEGER, page_offset INTEGER)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+BEGIN
+    IF author_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author(author_id, page_limit, page_offset);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Paged search by institution name
+CREATE OR REPLACE FUNCTION search_by_institution_by_name(institution_name TEXT, page_limit INTEGER, page_offset INTEGER)
+RETURNS JSONB AS $$
+DECLARE
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_institution(institution_id, page_limit, page_offset);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Paged search by author name and subfield name
+CREATE OR REPLACE FUNCTION search_by_author_topic_by_name(
+    author_name TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+BEGIN
+    IF author_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author_topic(author_id, subfield_name, page_limit, page_offset);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Paged search by institution name and subfield name
+CREATE OR REPLACE FUNCTION search_by_institution_topic_by_name(
+    institution_name TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+DECLARE
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_institution_topic(institution_id, subfield_name, page_limit, page_offset);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Paged search by author name and institution name
+CREATE OR REPLACE FUNCTION search_by_author_institution_by_name(
+    author_name TEXT,
+    institution_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF author_id IS NULL OR institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author_institution(author_id, institution_id, page_limit, page_offset);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Paged search by author, institution and subfield names
+CREATE OR REPLACE FUNCTION search_by_author_institution_topic_by_name(
+    author_name TEXT,
+    institution_name TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    page_offset INTEGER
+)
+RETURNS JSONB AS $$
+DECLARE
+    author_id TEXT := resolve_author_id(author_name);
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF author_id IS NULL OR institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_author_institution_topic(author_id, institution_id, subfield_name, page_limit, page_offset);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Keyset pagination for the two longest result lists. The ordering columns are all descending so
+-- a page can start right after the last row of the previous one with a row comparison that these
+-- indexes serve directly, however deep the user pages.
+CREATE INDEX IF NOT EXISTS search_by_topic_data_mv_keyset_idx
+    ON search_by_topic_data_mv (subfield_display_name, num_of_authors DESC, num_of_works DESC, institution_id DESC);
+CREATE INDEX IF NOT EXISTS search_by_institution_topic_data_mv_keyset_idx
+    ON search_by_institution_topic_data_mv (institution_id, subfield_display_name, num_of_works DESC, author_id DESC);
+
+-- Search by subfield name, returning the page of institutions after the given sort key
+CREATE OR REPLACE FUNCTION search_by_topic_after(
+    subfield_name TEXT,
+    page_limit INTEGER,
+    after_num_of_authors BIGINT,
+    after_num_of_works BIGINT,
+    after_institution_id TEXT,
+    map_limit INTEGER
+)
+RETURNS JSONB AS $$
+BEGIN
+    -- Metadata, totals and map data come from the offset version with an empty page
+    RETURN search_by_topic(subfield_name, 0, 0, map_limit) || jsonb_build_object(
+        'data', (
+            SELECT COALESCE(jsonb_agg(row_to_json(data) ORDER BY data.num_of_authors DESC, data.num_of_works DESC, data.institution_id DESC), '[]'::jsonb)
+            FROM (
+                SELECT
+                    data_mv.institution_id,
+                    data_mv.institution_name,
+                    data_mv.num_of_authors,
+                    data_mv.num_of_works,
+                    (
+                        SELECT jsonb_agg(i_t.type_id ORDER BY i_t.type_id)
+                        FROM openalex.institutions_types AS i_t
+                        WHERE i_t.institution_id = data_mv.institution_id
+                    ) AS types
+                FROM search_by_topic_data_mv AS data_mv
+                WHERE data_mv.subfield_display_name = search_by_topic_after.subfield_name
+                    AND (data_mv.num_of_authors, data_mv.num_of_works, data_mv.institution_id)
+                        < (after_num_of_authors, after_num_of_works, after_institution_id)
+                ORDER BY data_mv.num_of_authors DESC, data_mv.num_of_works DESC, data_mv.institution_id DESC
+                LIMIT page_limit
+            ) AS data
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Search by institution id and subfield name, returning the page of authors after the given sort key
+CREATE OR REPLACE FUNCTION search_by_institution_topic_after(
+    institution_id TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    after_num_of_works BIGINT,
+    after_author_id TEXT
+)
+RETURNS JSONB AS $$
+BEGIN
+    -- Metadata and totals come from the offset version with an empty page
+    RETURN search_by_institution_topic(institution_id, subfield_name, 0, 0) || jsonb_build_object(
+        'data', (
+            SELECT COALESCE(jsonb_agg(row_to_json(data) ORDER BY data.num_of_works DESC, data.author_id DESC), '[]'::jsonb)
+            FROM (
+                SELECT
+                    data_mv.author_id,
+                    data_mv.author_name,
+                    data_mv.num_of_works
+                FROM search_by_institution_topic_data_mv AS data_mv
+                WHERE
+                    data_mv.institution_id = search_by_institution_topic_after.institution_id
+                    AND data_mv.subfield_display_name = search_by_institution_topic_after.subfield_name
+                    AND (data_mv.num_of_works, data_mv.author_id) < (after_num_of_works, after_author_id)
+                ORDER BY data_mv.num_of_works DESC, data_mv.author_id DESC
+                LIMIT page_limit
+            ) data
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Keyset search by institution name and subfield name
+CREATE OR REPLACE FUNCTION search_by_institution_topic_by_name_after(
+    institution_name TEXT,
+    subfield_name TEXT,
+    page_limit INTEGER,
+    after_num_of_works BIGINT,
+    after_author_id TEXT
+)
+RETURNS JSONB AS $$
+DECLARE
+    institution_id TEXT := resolve_institution_id(institution_name);
+BEGIN
+    IF institution_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN search_by_institution_topic_after(institution_id, subfield_name, page_limit, after_num_of_works, after_author_id);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Map every subfield to its topics. The backend loads this once per process and joins it into
+-- author and institution results instead of rebuilding it in every search.
+CREATE OR REPLACE FUNCTION get_subfield_topics()
+RETURNS JSONB AS $$
+BEGIN
+    RETURN (
+        SELECT COALESCE(jsonb_object_agg(s.subfield_display_name, s.topics), '{}'::jsonb)
+        FROM (
+            SELECT
+                t.subfield_display_name,
+                jsonb_agg(jsonb_build_object(
+                    'topic_id',       t.id,
+                    'topic_display_name', t.display_name
+                ) ORDER BY t.display_name) AS topics
+            FROM openalex.topics AS t
+            WHERE t.subfield_display_name IS NOT NULL
+            GROUP BY t.subfield_display_name
+        ) AS s
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- The unpaged author and institution searches return every row through the paged functions,
+-- so they no longer build subfield_metadata either
+CREATE OR REPLACE FUNCTION search_by_author(author_id TEXT)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN search_by_author(author_id, NULL, 0);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+CREATE OR REPLACE FUNCTION search_by_institution(institution_id TEXT)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN search_by_institution(institution_id, NULL, 0);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+CREATE OR REPLACE FUNCTION search_by_author_institution(author_id TEXT, institution_id TEXT)
+RETURNS JSONB AS $$
+BEGIN
+    RETURN search_by_author_institution(author_id, institution_id, NULL, 0);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Map institution or subfield names ('institutions' or 'subfields') to their works_count.
+-- The autofill endpoints use these weights to rank suggestions that match equally well.
+CREATE OR REPLACE FUNCTION get_autocomplete_weights(kind TEXT)
+RETURNS JSONB AS $$
+BEGIN
+    IF kind = 'institutions' THEN
+        RETURN (
+            SELECT COALESCE(jsonb_object_agg(w.name, w.works_count), '{}'::jsonb)
+            FROM (
+                SELECT i.display_name AS name, MAX(i.works_count) AS works_count
+                FROM openalex.institutions AS i
+                WHERE i.display_name IS NOT NULL
+                GROUP BY i.display_name
+            ) AS w
+        );
+    ELSIF kind = 'subfields' THEN
+        RETURN (
+            SELECT COALESCE(jsonb_object_agg(w.name, w.works_count), '{}'::jsonb)
+            FROM (
+                SELECT t.subfield_display_name AS name, SUM(t.works_count) AS works_count
+                FROM openalex.topics AS t
+                WHERE t.subfield_display_name IS NOT NULL
+                GROUP BY t.subfield_display_name
+            ) AS w
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Last known institution of authors whose openalex.authors.last_known_institution is NULL, as
+-- looked up in OpenAlex by the backend. institution_name is NULL when OpenAlex has no institution
+-- for the author, so that answer is cached too. Filled on request and ahead of time by
+-- `flask backfill-author-institutions`.
+CREATE TABLE IF NOT EXISTS author_last_known_institutions (
+    author_id TEXT PRIMARY KEY,
+    institution_id TEXT,
+    institution_name TEXT,
+    fetched_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS authors_missing_last_known_institution_idx
+    ON openalex.authors (id) WHERE last_known_institution IS NULL;
+
+-- Next batch of authors (by id, after after_id) with no last_known_institution and no fresh stored
+-- lookup (younger than max_age, or negative_max_age for authors without an institution), for the
+-- backfill job
+CREATE OR REPLACE FUNCTION get_authors_missing_institution(after_id TEXT, batch_size INTEGER,
+                                                           max_age INTERVAL, negative_max_age INTERVAL)
+RETURNS SETOF TEXT AS $$
+BEGIN
+    RETURN QUERY
+    SELECT a.id
+    FROM openalex.authors AS a
+    LEFT JOIN author_last_known_institutions AS l ON l.author_id = a.id
+    WHERE
+        a.last_known_institution IS NULL AND
+        a.id > after_id AND
+        (l.author_id IS NULL OR
+         l.fetched_at <= now() - CASE WHEN l.institution_name IS NULL THEN negative_max_age ELSE max_age END)
+    ORDER BY a.id
+    LIMIT batch_size;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Covers the subfield -> institution lookup below, so it is answered from the index alone
+CREATE INDEX IF NOT EXISTS search_by_topic_data_mv_institution_name_idx
+    ON search_by_topic_data_mv (subfield_display_name, institution_name) INCLUDE (num_of_works);
+
+-- Works in one subfield for each of the given institutions (matched by display name), most
+-- works first. Institutions without works in the subfield are left out.
+CREATE OR REPLACE FUNCTION get_subfield_institution_work_counts(subfield_name TEXT, institution_names TEXT[])
+RETURNS TABLE (institution_name TEXT, num_of_works BIGINT) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT data_mv.institution_name::TEXT, SUM(data_mv.num_of_works)::BIGINT
+    FROM search_by_topic_data_mv AS data_mv
+    WHERE data_mv.subfield_display_name = get_subfield_institution_work_counts.subfield_name
+      AND data_mv.institution_name = ANY(get_subfield_institution_work_counts.institution_names)
+    GROUP BY data_mv.institution_name
+    ORDER BY 2 DESC, 1;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Subfield counts per author for institutions harvested from OpenAlex by
+-- `flask harvest-institution-subfields` (one row per institution, author and subfield, counting
+-- the author's topics in that subfield), and the institutions searched for or harvested so far
+CREATE TABLE IF NOT EXISTS institution_author_subfields (
+    ror TEXT NOT NULL,
+    author_id TEXT NOT NULL,
+    subfield TEXT NOT NULL,
+    topic_count INTEGER NOT NULL,
+    PRIMARY KEY (ror, author_id, subfield)
+);
+
+CREATE INDEX IF NOT EXISTS institution_author_subfields_author_id_idx
+    ON institution_author_subfields (author_id);
+
+CREATE TABLE IF NOT EXISTS institution_subfield_harvests (
+    ror TEXT PRIMARY KEY,
+    requested_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    harvested_at TIMESTAMP WITH TIME ZONE,
+    num_of_authors INTEGER NOT NULL DEFAULT 0
+);
+
+-- Subfield counts of a harvested institution as [[subfield, count], ...], most first, or NULL if
+-- the institution has not been harvested yet
+CREATE OR REPLACE FUNCTION get_institution_subfield_counts(institution_ror TEXT)
+RETURNS JSONB AS $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM institution_subfield_harvests AS h
+        WHERE h.ror = institution_ror AND h.harvested_at IS NOT NULL
+    ) THEN
+        RETURN NULL;
+    END IF;
+    RETURN (
+        SELECT COALESCE(jsonb_agg(jsonb_build_array(c.subfield, c.topic_count) ORDER BY c.topic_count DESC, c.subfield), '[]'::jsonb)
+        FROM (
+            SELECT s.subfield, SUM(s.topic_count) AS topic_count
+            FROM institution_author_subfields AS s
+            WHERE s.ror = institution_ror
+            GROUP BY s.subfield
+        ) AS c
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Replace the subfield counts of one page of harvested authors. authors is a JSON array of
+-- {"author_id", "rors", "subfields": {subfield: count}}; rows for institutions an author is no
+-- longer at are dropped as well.
+CREATE OR REPLACE FUNCTION store_institution_author_subfields(institution_ror TEXT, authors JSONB)
+RETURNS INTEGER AS $$
+BEGIN
+    DELETE FROM institution_author_subfields AS s
+    USING jsonb_to_recordset(authors) AS a(author_id TEXT, rors TEXT[])
+    WHERE s.author_id = a.author_id
+      AND (s.ror = institution_ror OR NOT s.ror = ANY(a.rors));
+
+    INSERT INTO institution_author_subfields (ror, author_id, subfield, topic_count)
+    SELECT institution_ror, a.author_id, c.key, c.value::INTEGER
+    FROM jsonb_to_recordset(authors) AS a(author_id TEXT, subfields JSONB)
+    CROSS JOIN LATERAL jsonb_each_text(a.subfields) AS c;
+
+    RETURN jsonb_array_length(authors);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Record a finished harvest that started at started_at. For a full harvest, seen_author_ids lists
+-- every author read, and rows for other authors (who have left the institution) are dropped.
+CREATE OR REPLACE FUNCTION finish_institution_harvest(institution_ror TEXT, started_at TIMESTAMP WITH TIME ZONE,
+                                                      seen_author_ids TEXT[])
+RETURNS INTEGER AS $$
+DECLARE
+    author_count INTEGER;
+BEGIN
+    IF seen_author_ids IS NOT NULL THEN
+        DELETE FROM institution_author_subfields AS s
+        WHERE s.ror = institution_ror AND NOT s.author_id = ANY(seen_author_ids);
+    END IF;
+
+    SELECT COUNT(DISTINCT s.author_id) INTO author_count
+    FROM institution_author_subfields AS s
+    WHERE s.ror = institution_ror;
+
+    INSERT INTO institution_subfield_harvests AS h (ror, harvested_at, num_of_authors)
+    VALUES (institution_ror, started_at, author_count)
+    ON CONFLICT (ror) DO UPDATE SET
+        harvested_at = EXCLUDED.harvested_at,
+        num_of_authors = EXCLUDED.num_of_authors;
+    RETURN author_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Institutions to harvest with the start of their last harvest (NULL if never harvested): the given
+-- ones, or when institution_rors is NULL every queued institution not harvested within max_age
+CREATE OR REPLACE FUNCTION get_institution_harvests_due(institution_rors TEXT[], max_age INTERVAL)
+RETURNS TABLE (ror TEXT, harvested_at TIMESTAMP WITH TIME ZONE) AS $$
+BEGIN
+    IF institution_rors IS NOT NULL THEN
+        RETURN QUERY
+        SELECT r.institution_ror, h.harvested_at
+        FROM unnest(institution_rors) AS r(institution_ror)
+        LEFT JOIN institution_subfield_harvests AS h ON h.ror = r.institution_ror;
+    ELSE
+        RETURN QUERY
+        SELECT h.ror, h.harvested_at
+        FROM institution_subfield_harvests AS h
+        WHERE h.harvested_at IS NULL OR h.harvested_at <= now() - max_age
+        ORDER BY h.harvested_at NULLS FIRST, h.ror;
+    END IF;
+END;
+$$ LANGUAGE plpgsql STABLE;
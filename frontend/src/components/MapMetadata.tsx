@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from "react";
 import { Box, Spinner, Center } from "@chakra-ui/react";
-import { ResearchDataInterface } from "../utils/interfaces";
+import { MapPointInterface, ResearchDataInterface } from "../utils/interfaces";
 import L from "leaflet";
 import "leaflet/dist/leaflet.css";
 import { baseUrl } from "../utils/constants";
@@ -70,27 +70,29 @@ const MapMetadata = ({ data }: { data: ResearchDataInterface }) => {
     const fetchAndRenderMap = async () => {
       setLoading(true);
 
-      const institutions = data.coordinates;
-
-      let coordinates: {
-        lat: number;
-        lng: number;
-        name: string;
-        authors: number;
-      }[] = [];
-
-      try {
-        const res = await fetch(`${baseUrl}/geo_info_batch`, {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ institutions }),
-        });
-
-        coordinates = await res.json();
-      } catch (error) {
-        console.error("Failed to fetch batched geo info", error);
-        setLoading(false);
-        return;
+      let coordinates: MapPointInterface[] = data.map_points ?? [];
+
+      // Institutions without stored coordinates are left out of map_points;
+      // look those up and add them to the markers.
+      const located = new Set(coordinates.map((point) => point.institution_id));
+      const institutions = data.coordinates.filter(
+        ([institutionId]) => !located.has(institutionId)
+      );
+
+      if (institutions.length) {
+        try {
+          const res = await fetch(`${baseUrl}/geo_info_batch`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ institutions }),
+          });
+
+          coordinates = [...coordinates, ...(await res.json())];
+        } catch (error) {
+          console.error("Failed to fetch batched geo info", error);
+          setLoading(false);
+          return;
+        }
       }
 
       if (!coordinates.length) {
@@ -24,7 +24,12 @@ import Suggested from "../components/Suggested";
 import TopicInstitutionMetadata from "../components/TopicInstitutionMetadata";
 import TopicMetadata from "../components/TopicMetadata";
 import TopicResearcherMetadata from "../components/TopicResearcherMetadata";
-import { baseUrl, handleAutofill, initialValue } from "../utils/constants";
+import {
+  baseUrl,
+  expandColumnarGraph,
+  handleAutofill,
+  initialValue,
+} from "../utils/constants";
 import { ResearchDataInterface, SearchType } from "../utils/interfaces";
 
 const Search = () => {
@@ -93,7 +98,7 @@ const Search = () => {
       per_page: number;
     }
   ) => {
-    fetch(`${baseUrl}/initial-search`, {
+    fetch(`${baseUrl}/initial-search?format=columnar`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
@@ -103,10 +108,12 @@ const Search = () => {
         researcher: researcherType,
         page: page,
         per_page: per_page,
+        include_coordinates: true,
       }),
     })
       .then((res) => res.json())
       .then((data) => {
+        data.graph = expandColumnarGraph(data.graph);
         console.log(data);
         setTotalPages(data.metadata_pagination?.total_pages || 1);
         setCurrentPage(data.metadata_pagination?.current_page || 1);
@@ -136,6 +143,7 @@ const Search = () => {
                 open_alex_link: data?.metadata?.oa_link,
                 organizations: data?.list,
                 coordinates: data?.coordinates,
+                map_points: data?.map_points,
                 search,
               }
             : search === "researcher"
@@ -310,11 +318,7 @@ const Search = () => {
       });
     } else {
       // Default graph request
-      fetch(`${baseUrl}/get-default-graph`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: null,
-      })
+      fetch(`${baseUrl}/get-default-graph`)
         .then((res) => res.json())
         .then((data) => {
           setData({ ...initialValue, graph: data?.graph });
@@ -1,3 +1,5 @@
+import { ColumnarGraphInterface } from "./interfaces";
+
 export const baseUrl =
   process.env.REACT_APP_BASE_URL || "http://localhost:5000";
 
@@ -153,3 +155,32 @@ export const handleAutofill = (
       console.log(error);
     });
 };
+
+export const expandColumnarGraph = (graph?: ColumnarGraphInterface) => {
+  if (!graph || graph.format !== "columnar") {
+    return graph;
+  }
+  const { label: nodeLabels, type: nodeTypes, ...attributes } = graph.nodes;
+  const nodes = nodeTypes.map((type, i) => {
+    const node: { [key: string]: any } = {
+      id: graph.ids[i],
+      label: nodeLabels[i] ?? graph.ids[i],
+      type: graph.types[type],
+    };
+    Object.entries(attributes).forEach(([key, values]) => {
+      if (values[i] !== null) {
+        node[key] = values[i];
+      }
+    });
+    return node;
+  });
+  const edges = graph.edges.start.map((start, i) => ({
+    id: graph.edges.id[i] ?? `${graph.ids[start]}-${graph.ids[graph.edges.end[i]]}`,
+    start: graph.ids[start],
+    end: graph.ids[graph.edges.end[i]],
+    label: graph.labels[graph.edges.label[i]],
+    start_type: graph.types[graph.edges.start_type[i]],
+    end_type: graph.types[graph.edges.end_type[i]],
+  }));
+  return { nodes, edges };
+};
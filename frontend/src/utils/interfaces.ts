@@ -7,6 +7,34 @@ export type SearchType =
   | "topic-institution"
   | "all-three-search";
 
+export interface MapPointInterface {
+  institution_id?: string;
+  lat: number;
+  lng: number;
+  name: string;
+  authors: number;
+}
+
+export interface ColumnarGraphInterface {
+  format: "columnar";
+  ids: (string | number)[];
+  types: string[];
+  labels: string[];
+  nodes: {
+    label: (string | number | null)[];
+    type: number[];
+    [attribute: string]: any[];
+  };
+  edges: {
+    id: (string | null)[];
+    start: number[];
+    end: number[];
+    label: number[];
+    start_type: number[];
+    end_type: number[];
+  };
+}
+
 export interface ResearchDataInterface {
   cited_count: string;
   works_count: string;
@@ -29,5 +57,6 @@ export interface ResearchDataInterface {
   researcher_open_alex_link: string;
   topic_open_alex_link: string;
   coordinates: string[][];
+  map_points?: MapPointInterface[];
   search?: SearchType;
 }